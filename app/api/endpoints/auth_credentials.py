@@ -10,6 +10,11 @@ from config.database import get_db
 from app.models.auth_models import User
 from app.schemas.auth_schema import AuthRequest  # seu Pydantic model
 from app.utils.magic import jwt_for_user
+from app.dependencies.auth import AuthPrincipal, get_current_user, invalidate_principal
+from app.utils.deletion import job_progress, start_account_deletion
+from app.utils.subscriptions import has_active_subscription
+from app.utils.outbox import enqueue as enqueue_outbox
+from app.utils.stripe_customers import CREATE_CUSTOMER_TOPIC
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -28,27 +33,17 @@ def signup(data: AuthRequest, db: Session = Depends(get_db)):
             detail="E-mail já cadastrado."
         )
 
-    # 2) Cria o customer no Stripe
-    try:
-        customer = stripe.Customer.create(
-            email=data.email,
-            metadata={"app": "nanafacil", "user_email": data.email}
-        )
-    except stripe.error.StripeError as e:
-        # opcional: logar e retornar erro mais genérico
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail="Não foi possível criar perfil de pagamento."
-        )
-
-    # 3) Cria o usuário no banco local
+    # 2) Cria o usuário no banco local; o customer do Stripe é criado depois
+    #    pelo worker da outbox, gravada na mesma transação
     hashed_password = pwd_context.hash(data.password)
     user = User(
         email=data.email,
         password_hash=hashed_password,
-        stripe_customer_id=customer.id  # grava o ID do Stripe
     )
     db.add(user)
+    db.flush()  # garante user.id para a mensagem da outbox
+
+    enqueue_outbox(db, CREATE_CUSTOMER_TOPIC, {"user_id": user.id})
     db.commit()
     db.refresh(user)
 
@@ -60,18 +55,16 @@ def signup(data: AuthRequest, db: Session = Depends(get_db)):
 
 @router.post("/login")
 def login(data: AuthRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter_by(email=data.email).first()
+    user = db.query(User).filter_by(email=data.email).filter(User.deleted_at.is_(None)).first()
     if not user or not pwd_context.verify(data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Credenciais inválidas")
 
-    # JWT…
-    token = jwt_for_user(email=user.email, role=user.role)
+    # JWT… (login também renova o principal em cache deste usuário)
+    token = jwt_for_user(user_id=user.id, email=user.email, role=user.role)
+    invalidate_principal(user.id)
 
-    # Assinatura ativa?
-    subs = stripe.Subscription.list(
-        customer=user.stripe_customer_id, status="active", limit=1
-    )
-    has_active = len(subs.data) > 0
+    # Assinatura ativa? (estado local mantido pelo webhook do Stripe)
+    has_active = has_active_subscription(db, user.stripe_customer_id)
 
     # Trial de 3 dias
     trial_end_dt = user.created_at + timedelta(days=3)
@@ -88,3 +81,22 @@ def login(data: AuthRequest, db: Session = Depends(get_db)):
         "trial_end": trial_end_dt.isoformat(),
         "role": user.role,
     }
+
+
+@router.delete("/conta", status_code=status.HTTP_202_ACCEPTED)
+def delete_account(
+    db: Session = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_user),
+):
+    """
+    Exclui a conta e todos os dados dela (bebês, eventos, relatórios, planos
+    e o customer no Stripe). O login deixa de funcionar na hora; tokens já
+    emitidos deixam de valer neste worker na hora e nos demais quando o
+    principal sair do cache (até PRINCIPAL_CACHE_TTL_SECONDS). Contas com
+    histórico grande são apagadas em lotes, com o andamento em
+    GET /deletions/{job_id}.
+    """
+    job = start_account_deletion(db, current_user.id)
+    db.commit()
+    invalidate_principal(current_user.id)
+    return job_progress(job)
@@ -1,23 +1,141 @@
-from fastapi import Depends, HTTPException, status
+from dataclasses import dataclass
+from typing import Optional
+
+import jwt
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from config.settings import JWT_SECRET, JWT_ALGORITHM
+from config.settings import PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_SIZE
 from app.models.auth_models import User
-from config.database import get_db
+from app.utils.magic import decode_access_token
+from app.utils.read_routing import READ_METHODS, pin_to_primary
+from app.utils.ttl_cache import TTLCache
+from config.database import get_async_db, get_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+
+@dataclass(frozen=True)
+class AuthPrincipal:
+    """Usuário autenticado, sem vínculo com a sessão do banco."""
+    id: int
+    email: str
+    role: str
+    stripe_customer_id: Optional[str] = None
+
+
+# user_id -> AuthPrincipal
+_principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_principal(user_id: int):
+    """Chamar sempre que role, conta ou dados de cobrança do usuário mudarem."""
+    _principal_cache.pop(user_id)
+
+
+def _principal_select(**filters):
+    # conta em exclusão (deleted_at) já não autentica
+    return (
+        select(User.id, User.email, User.role, User.stripe_customer_id)
+        .filter_by(**filters)
+        .where(User.deleted_at.is_(None))
+    )
+
+
+def _to_principal(row) -> Optional[AuthPrincipal]:
+    if row is None:
+        return None
+    return AuthPrincipal(
+        id=row.id, email=row.email, role=row.role, stripe_customer_id=row.stripe_customer_id
+    )
+
+
+def _load_principal(db: Session, **filters) -> Optional[AuthPrincipal]:
+    return _to_principal(db.execute(_principal_select(**filters)).first())
+
+
+async def _load_principal_async(db: AsyncSession, **filters) -> Optional[AuthPrincipal]:
+    return _to_principal((await db.execute(_principal_select(**filters))).first())
+
+
+def _token_subject(token: str) -> str:
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        email = payload.get("sub")
-        if email is None:
-            raise HTTPException(status_code=401, detail="Token inválido")
-    except JWTError:
+        payload = decode_access_token(token)
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Token inválido")
+
+    sub = payload.get("sub")
+    if not sub:
         raise HTTPException(status_code=401, detail="Token inválido")
+    return sub
+
+
+def _pin_writes(request: Request, response: Response, principal: AuthPrincipal):
+    # escritas fixam as próximas leituras do usuário no primário
+    if request.method not in READ_METHODS:
+        pin_to_primary(principal.id, response)
+
+
+def get_current_user(
+    request: Request,
+    response: Response,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> AuthPrincipal:
+    sub = _token_subject(token)
+
+    if not sub.isdigit():
+        # Tokens antigos traziam o e-mail no sub; expiram em até 3 dias
+        principal = _load_principal(db, email=sub)
+    else:
+        user_id = int(sub)
+        principal = _principal_cache.get(user_id)
+        if principal is None:
+            principal = _load_principal(db, id=user_id)
+            if principal is not None:
+                _principal_cache.set(user_id, principal)
+    # Encerra a transação da consulta e devolve a conexão ao pool. Rotas de
+    # leitura abrem uma segunda sessão (get_async_read_db): sem isto, cada
+    # requisição prende duas conexões e, com o pool saturado, todas esperam
+    # umas pelas outras. A sessão é a mesma da rota (get_db), que só começa
+    # depois: a próxima consulta abre outra transação.
+    db.rollback()
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    if principal is None:
         raise HTTPException(status_code=401, detail="Usuário não encontrado")
-    return user
+    _pin_writes(request, response, principal)
+    return principal
+
+
+async def get_current_user_async(
+    request: Request,
+    response: Response,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> AuthPrincipal:
+    """Mesmo que get_current_user, para rotas async def."""
+    sub = _token_subject(token)
+
+    if not sub.isdigit():
+        principal = await _load_principal_async(db, email=sub)
+    else:
+        user_id = int(sub)
+        principal = _principal_cache.get(user_id)
+        if principal is None:
+            principal = await _load_principal_async(db, id=user_id)
+            if principal is not None:
+                _principal_cache.set(user_id, principal)
+    await db.rollback()  # idem get_current_user
+
+    if principal is None:
+        raise HTTPException(status_code=401, detail="Usuário não encontrado")
+    _pin_writes(request, response, principal)
+    return principal
+
+
+def require_admin(current_user: AuthPrincipal = Depends(get_current_user)) -> AuthPrincipal:
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Acesso restrito a administradores")
+    return current_user
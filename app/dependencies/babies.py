@@ -0,0 +1,18 @@
+from typing import Iterable
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.utils.event_sync import lock_babies
+
+
+def require_babies(db: Session, user_id: int, baby_ids: Iterable[int]):
+    """
+    403 se algum dos bebês não for do usuário (lotes de eventos). A posse é
+    conferida na mesma consulta que trava os bebês até o fim da transação
+    (lock_babies), que a escrita faria de qualquer forma: apply_event_changes
+    não trava de novo, e uma exclusão concorrente espera a escrita terminar.
+    """
+    baby_ids = set(baby_ids)
+    if not lock_babies(db, baby_ids, user_id=user_id).issuperset(baby_ids):
+        raise HTTPException(status_code=403, detail="Acesso negado para este bebê")
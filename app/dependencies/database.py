@@ -0,0 +1,19 @@
+from fastapi import Depends, Request
+
+from app.dependencies.auth import AuthPrincipal, get_current_user_async
+from app.utils.read_routing import is_pinned_to_primary
+from config.database import AsyncReplicaSessionLocal, AsyncSessionLocal
+
+
+async def get_async_read_db(
+    request: Request, current_user: AuthPrincipal = Depends(get_current_user_async)
+):
+    """
+    Sessão de leitura para rotas GET: réplica, a não ser que o usuário tenha
+    escrito há pouco, neste worker ou em outro (cookie/cabeçalho, ver
+    app/utils/read_routing.py).
+    """
+    pinned = is_pinned_to_primary(current_user.id, request)
+    factory = AsyncSessionLocal if pinned else AsyncReplicaSessionLocal
+    async with factory() as db:
+        yield db
@@ -0,0 +1,77 @@
+# app/middleware/metrics.py
+"""
+Middleware ASGI de métricas HTTP: latência por rota, contagem por status,
+requisições em andamento e SQL por requisição (app/utils/sql_tracking.py).
+
+A rota é o template (ex.: /api/events/{event_id}), não a URL, para manter
+a cardinalidade baixa. Requisições com mais de SQL_QUERY_WARN_THRESHOLD
+comandos geram um warning (pega N+1 que passou no review).
+"""
+
+import logging
+import time
+
+from app.utils.metrics import Counter, Gauge, Histogram
+from app.utils.sql_tracking import start_tracking, stop_tracking
+from config.settings import SQL_QUERY_WARN_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+REQUESTS = Counter(
+    "http_requests_total", "Requisições HTTP por rota e status", ["method", "route", "status"]
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP", ["method", "route"]
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requisições HTTP em andamento")
+SQL_STATEMENTS = Histogram(
+    "db_statements_per_request", "Comandos SQL por requisição", ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+SQL_SECONDS = Counter(
+    "db_statement_seconds_total", "Tempo gasto em SQL pelas requisições", ["route"]
+)
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        sql, token = start_tracking()
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            stop_tracking(token)
+
+            method, route = scope["method"], route_template(scope)
+            REQUESTS.inc(method=method, route=route, status=str(status_code))
+            LATENCY.observe(elapsed, method=method, route=route)
+            SQL_STATEMENTS.observe(sql.count, route=route)
+            SQL_SECONDS.inc(sql.seconds, route=route)
+            if sql.count > SQL_QUERY_WARN_THRESHOLD:
+                logger.warning(
+                    "%s %s executou %d comandos SQL (%.1f ms) em %.1f ms",
+                    method, route, sql.count, sql.seconds * 1000, elapsed * 1000,
+                )
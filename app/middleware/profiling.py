@@ -0,0 +1,114 @@
+# app/middleware/profiling.py
+"""
+Profiling sob demanda: uma requisição com o header X-Profile-Token (emitido
+por um admin em POST /admin/profile-token para um usuário) roda sob cProfile
+com o SQL registrado, e o resultado é gravado em request_profiles. A
+resposta traz X-Profile-Id para buscar em GET /admin/profiles/{id}.
+
+Sem o header, o custo é uma busca no dict de headers. Token inválido,
+expirado ou de outro usuário é ignorado: a requisição segue sem profiling.
+"""
+
+import logging
+import time
+from uuid import uuid4
+
+import jwt
+from starlette.concurrency import run_in_threadpool
+
+from app.models.request_profile_model import RequestProfile
+from app.utils.magic import decode_access_token, decode_profile_token
+from app.utils.profiling import ProfileSession, end_session, format_profile, start_session
+from app.utils.sql_tracking import start_tracking, stop_tracking
+from config.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+MAX_STATEMENT_CHARS = 2000
+
+
+def _authorize(headers: dict, profile_token: bytes):
+    """Sessão de profiling se o token vale para o usuário desta requisição."""
+    try:
+        grant = decode_profile_token(profile_token.decode())
+        scheme, _, access_token = headers.get(b"authorization", b"").decode().partition(" ")
+        if scheme.lower() != "bearer":
+            return None
+        subject = decode_access_token(access_token)["sub"]
+    except (jwt.PyJWTError, UnicodeDecodeError):
+        return None
+    if subject != grant["sub"] or not subject.isdigit():
+        return None
+    return ProfileSession(user_id=int(subject), admin_id=grant.get("admin"))
+
+
+def _store(profile: RequestProfile):
+    db = SessionLocal()
+    try:
+        db.add(profile)
+        db.commit()
+    finally:
+        db.close()
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        profile_token = headers.get(PROFILE_TOKEN_HEADER)
+        session = _authorize(headers, profile_token) if profile_token else None
+        if session is None:
+            if profile_token:
+                logger.warning("X-Profile-Token inválido em %s %s", scope["method"], scope["path"])
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = str(uuid4())
+        status_code = None
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())],
+                }
+            await send(message)
+
+        sql, sql_token = start_tracking(record_statements=True)
+        session_token = start_session(session)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            elapsed = time.perf_counter() - started
+            end_session(session_token)
+            stop_tracking(sql_token)
+
+            profile = RequestProfile(
+                id=profile_id,
+                user_id=session.user_id,
+                requested_by=session.admin_id,
+                method=scope["method"],
+                path=scope["path"] + (f"?{scope['query_string'].decode()}" if scope["query_string"] else ""),
+                status_code=status_code,
+                duration_ms=elapsed * 1000,
+                sql_count=sql.count,
+                sql_ms=sql.seconds * 1000,
+                statements=[
+                    {"sql": statement[:MAX_STATEMENT_CHARS], "ms": round(seconds * 1000, 3)}
+                    for statement, seconds in sql.statements
+                ],
+                profile=format_profile(session.profiler),
+            )
+            try:
+                await run_in_threadpool(_store, profile)
+            except Exception:
+                logger.exception("Falha ao gravar o profile %s", profile_id)
@@ -12,7 +12,12 @@ class User(Base):
     stripe_customer_id = Column(String, unique=True, nullable=True)
 
     role = Column(String, default="parent", nullable=False)
+    # incrementada quando bebês ou eventos do usuário mudam (ETag)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, server_default=func.now())
+    # exclusão da conta em andamento (app/utils/deletion.py): some do login
+    # e da autenticação na hora; a linha sai quando os lotes terminam
+    deleted_at = Column(DateTime, nullable=True)
 
     # No User model
     babies = relationship("Baby", back_populates="parent")
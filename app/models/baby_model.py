@@ -11,8 +11,14 @@ class Baby(Base):
     birth_date = Column(Date, nullable=False)
     birth_weight_grams = Column(Integer, nullable=True)  # opcional
     gender = Column(String(6), nullable=False)
+    # incrementada a cada escrita que muda eventos/relatórios/plano (ETag)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     parent = relationship("User", back_populates="babies")
-    events = relationship("Event", back_populates="baby", cascade="all, delete")
+    # passive_deletes: quem apaga as linhas filhas é o ON DELETE CASCADE do
+    # banco; o ORM não carrega o histórico inteiro para apagar linha a linha
+    events = relationship("Event", back_populates="baby", cascade="all, delete", passive_deletes=True)
 
-    sleep_plans = relationship("SleepPlan", back_populates="baby", cascade="all, delete")
+    sleep_plans = relationship(
+        "SleepPlan", back_populates="baby", cascade="all, delete", passive_deletes=True
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Date, ForeignKey, Text, func
+from sqlalchemy import Column, Integer, Date, ForeignKey, Text, UniqueConstraint, func
 from config.database import Base
 
 class DailyReport(Base):
@@ -11,4 +11,10 @@ class DailyReport(Base):
     longest_nap_minutes = Column(Integer)
     total_feeds = Column(Integer, nullable=False, default=0) 
     notes = Column(Text)
-    created_at = Column(Date, server_default=func.now())
+    # CURRENT_DATE (migrations/0014): now() numa coluna Date não é lido de volta no SQLite
+    created_at = Column(Date, server_default=func.current_date())
+
+    # um relatório por bebê/dia: as escritas são upserts (ver report_generator)
+    __table_args__ = (
+        UniqueConstraint("baby_id", "date", name="uq_daily_reports_baby_id_date"),
+    )
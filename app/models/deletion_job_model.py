@@ -0,0 +1,27 @@
+# app/models/deletion_job_model.py
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
+from config.database import Base
+
+
+class DeletionJob(Base):
+    """
+    Exclusão de um bebê ou de uma conta inteira, feita em lotes pela outbox
+    (app/utils/deletion.py). Sem FK para users/babies de propósito: o
+    registro sobrevive à exclusão e só guarda ids e contagens.
+    """
+    __tablename__ = "deletion_jobs"
+
+    id = Column(String(36), primary_key=True)
+    kind = Column(String(16), nullable=False)  # baby | account
+    user_id = Column(Integer, nullable=False)
+    baby_id = Column(Integer, nullable=True)
+    status = Column(String(16), nullable=False, default="pending")  # pending | running | done
+    total_events = Column(Integer, nullable=False, default=0)
+    deleted_events = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_deletion_jobs_user_id", "user_id"),
+    )
@@ -1,5 +1,5 @@
 # app/models/event_model.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from config.database import Base
 
@@ -11,8 +11,24 @@ class Event(Base):
     baby_id = Column(Integer, ForeignKey("babies.id", ondelete="CASCADE"), nullable=False)
     type = Column(String(50), nullable=False)
     timestamp = Column(DateTime, nullable=False)
+    # chave gerada pelo app cliente; reenvios do mesmo evento são ignorados
+    idempotency_key = Column(String(64), nullable=True)
     created_at = Column(DateTime, server_default=func.now())
 
     baby = relationship("Baby", back_populates="events")
 
-
+    # Índices compostos para as consultas quentes (ver migrations/0001_*.sql):
+    # - relatório diário: baby_id + intervalo de timestamp
+    # - planner: baby_id + type + timestamp DESC (último sleep_start/sleep_end)
+    # - listagem do usuário: user_id ordenado por timestamp
+    __table_args__ = (
+        Index("ix_events_baby_id_timestamp", "baby_id", "timestamp"),
+        Index("ix_events_baby_id_type_timestamp", "baby_id", "type", timestamp.desc()),
+        Index("ix_events_user_id_timestamp", "user_id", "timestamp"),
+        Index(
+            "uq_events_user_id_idempotency_key", "user_id", "idempotency_key",
+            unique=True,
+            postgresql_where=idempotency_key.isnot(None),
+            sqlite_where=idempotency_key.isnot(None),
+        ),
+    )
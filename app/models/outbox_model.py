@@ -0,0 +1,25 @@
+# app/models/outbox_model.py
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index, func
+from config.database import Base
+
+
+class OutboxMessage(Base):
+    """
+    Outbox transacional: gravada na mesma transação da mudança de negócio e
+    consumida depois pelo worker (app/workers/outbox_worker.py).
+    """
+    __tablename__ = "outbox_messages"
+
+    id = Column(Integer, primary_key=True)
+    topic = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(16), nullable=False, default="pending")  # pending | done | dead
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, server_default=func.now())  # enqueue grava em UTC
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_outbox_messages_status_available_at", "status", "available_at"),
+    )
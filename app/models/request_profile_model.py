@@ -0,0 +1,25 @@
+# app/models/request_profile_model.py
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, JSON, ForeignKey, Index, func
+from config.database import Base
+
+
+class RequestProfile(Base):
+    """Profile de uma requisição pedido via X-Profile-Token (app/middleware/profiling.py)."""
+    __tablename__ = "request_profiles"
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    requested_by = Column(Integer, nullable=True)  # admin que emitiu o token
+    method = Column(String(8), nullable=False)
+    path = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    duration_ms = Column(Float, nullable=False)
+    sql_count = Column(Integer, nullable=False)
+    sql_ms = Column(Float, nullable=False)
+    statements = Column(JSON, nullable=False)  # [{"sql": ..., "ms": ...}, ...]
+    profile = Column(Text, nullable=False)     # pstats ordenado por tempo acumulado
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_request_profiles_user_id_created_at", "user_id", "created_at"),
+    )
@@ -0,0 +1,33 @@
+# app/models/rollup_model.py
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
+from config.database import Base
+
+
+class UserEventCount(Base):
+    """Total de eventos por usuário (app/utils/rollups.py)."""
+    __tablename__ = "user_event_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_user_event_counts_event_count", "event_count", "user_id"),
+    )
+
+
+class UserDayEventCount(Base):
+    """
+    Eventos por usuário, dia e tipo. Linhas por usuário (sem contador global
+    disputado entre escritas); usuários ativos e mix de eventos por dia são
+    agregações sobre esta tabela, não sobre events.
+    """
+    __tablename__ = "user_day_event_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    type = Column(String, primary_key=True)
+    event_count = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_user_day_event_counts_day", "day"),
+    )
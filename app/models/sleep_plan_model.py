@@ -1,6 +1,6 @@
 # app/models/sleep_plan_model.py
 
-from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, func
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, JSON, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from config.database import Base
 
@@ -30,4 +30,13 @@ class RoutinePlan(Base):
 
     feed_time = Column(DateTime, nullable=True)
 
-    created_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
+    # rotina completa + entradas do cálculo (ver routine_planner.encode_routine)
+    routine = Column(JSON, nullable=True)
+    routine_version = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime, server_default=func.now())
+
+    # um plano por bebê/dia: save_routine_plan grava com upsert
+    __table_args__ = (
+        UniqueConstraint("baby_id", "date", name="uq_routine_plans_baby_id_date"),
+    )
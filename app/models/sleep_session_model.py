@@ -0,0 +1,35 @@
+# app/models/sleep_session_model.py
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from config.database import Base
+
+
+class SleepSession(Base):
+    """
+    Pareamento sleep_start/sleep_end materializado na ingestão
+    (app/utils/sleep_sessions.py). Sessões que cruzam a meia-noite são
+    atribuídas ao dia em que terminam.
+
+    status:
+      closed       - início e fim pareados
+      open         - último sleep_start do bebê, ainda dormindo
+      orphan_start - sleep_start seguido de outro sleep_start
+      orphan_end   - sleep_end sem sleep_start anterior
+    """
+    __tablename__ = "sleep_sessions"
+
+    id = Column(Integer, primary_key=True)
+    baby_id = Column(Integer, ForeignKey("babies.id", ondelete="CASCADE"), nullable=False)
+    start_event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=True)
+    end_event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=True)
+    start_at = Column(DateTime, nullable=True)
+    end_at = Column(DateTime, nullable=True)
+    duration_minutes = Column(Integer, nullable=True)
+    status = Column(String(16), nullable=False)
+
+    __table_args__ = (
+        Index("ix_sleep_sessions_baby_id_end_at", "baby_id", "end_at"),
+        Index("ix_sleep_sessions_baby_id_start_at", "baby_id", "start_at"),
+        # um evento em no máximo uma sessão (migrations/0015); também indexam as FKs
+        Index("uq_sleep_sessions_start_event_id", "start_event_id", unique=True),
+        Index("uq_sleep_sessions_end_event_id", "end_event_id", unique=True),
+    )
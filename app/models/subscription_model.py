@@ -0,0 +1,21 @@
+# app/models/subscription_model.py
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, func
+from config.database import Base
+
+
+class Subscription(Base):
+    """
+    Espelho local do estado das assinaturas no Stripe, uma linha por
+    assinatura (um customer pode ter várias: a antiga cancelada e a nova).
+    Alimentado pelo webhook (/payment/webhook); o login só lê esta tabela.
+    """
+    __tablename__ = "subscriptions"
+
+    id = Column(Integer, primary_key=True)
+    stripe_customer_id = Column(String, index=True, nullable=False)
+    stripe_subscription_id = Column(String, unique=True, nullable=False)
+    status = Column(String(32), nullable=False)
+    current_period_end = Column(DateTime, nullable=True)
+    # "created" do evento Stripe aplicado por último: eventos fora de ordem são descartados
+    stripe_event_created = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -1,24 +1,53 @@
-from fastapi import APIRouter, Depends
+from datetime import date, timedelta
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from config.database import get_db
-from app.models.event_model import Event
-from app.models.baby_model import Baby
+from config.database import (
+    HAS_REPLICA,
+    async_engine,
+    async_replica_engine,
+    engine,
+    get_db,
+    get_read_db,
+    replica_engine,
+)
+from config.db_pool import pool_stats
+from app.dependencies.auth import AuthPrincipal, require_admin
 from app.models.auth_models import User
+from app.models.request_profile_model import RequestProfile
+from app.models.rollup_model import UserDayEventCount, UserEventCount
+from app.utils.magic import profile_token_for_user
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
 
 @router.get("/events-per-mother")
-def events_per_mother(db: Session = Depends(get_db)):
+def events_per_mother(
+    sort: Literal["event_count", "user_id"] = Query("event_count"),
+    order: Literal["asc", "desc"] = Query("desc"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    """Eventos por usuário, lidos do rollup user_event_counts."""
+    ordering = [getattr(UserEventCount, sort), UserEventCount.user_id]
+    if order == "desc":
+        ordering = [column.desc() for column in ordering]
     results = (
         db.query(
-            User.id.label("user_id"),
+            UserEventCount.user_id,
             User.email.label("mother_email"),
-            func.count(Event.id).label("event_count"),
+            UserEventCount.event_count,
         )
-        .join(Baby, Baby.user_id == User.id)
-        .join(Event, Event.baby_id == Baby.id)
-        .group_by(User.id, User.email)
+        .join(User, User.id == UserEventCount.user_id)
+        .filter(UserEventCount.event_count > 0)
+        .order_by(*ordering)
+        .limit(limit)
+        .offset(offset)
         .all()
     )
 
@@ -30,3 +59,125 @@ def events_per_mother(db: Session = Depends(get_db)):
         }
         for row in results
     ]
+
+
+@router.get("/active-users")
+def active_users_per_day(
+    from_: date = Query(..., alias="from"),
+    to: date = Query(...),
+    order: Literal["asc", "desc"] = Query("asc"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    """Usuários com ao menos um evento em cada dia do intervalo [from, to]."""
+    active = func.count(func.distinct(UserDayEventCount.user_id))
+    day = UserDayEventCount.day.desc() if order == "desc" else UserDayEventCount.day.asc()
+    results = (
+        db.query(UserDayEventCount.day, active.label("active_users"))
+        .filter(UserDayEventCount.day.between(from_, to))
+        .group_by(UserDayEventCount.day)
+        .order_by(day)
+        .limit(limit)
+        .offset(offset)
+        .all()
+    )
+    return [{"date": row.day, "active_users": row.active_users} for row in results]
+
+
+@router.get("/event-mix")
+def event_mix(
+    from_: date = Query(..., alias="from"),
+    to: date = Query(...),
+    type: Optional[str] = Query(None),
+    order: Literal["asc", "desc"] = Query("asc"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    """Total de eventos por dia e tipo no intervalo [from, to]."""
+    query = db.query(
+        UserDayEventCount.day,
+        UserDayEventCount.type,
+        func.sum(UserDayEventCount.event_count).label("event_count"),
+    ).filter(UserDayEventCount.day.between(from_, to))
+    if type is not None:
+        query = query.filter(UserDayEventCount.type == type)
+
+    day = UserDayEventCount.day.desc() if order == "desc" else UserDayEventCount.day.asc()
+    results = (
+        query.group_by(UserDayEventCount.day, UserDayEventCount.type)
+        .order_by(day, UserDayEventCount.type)
+        .limit(limit)
+        .offset(offset)
+        .all()
+    )
+    return [
+        {"date": row.day, "type": row.type, "event_count": row.event_count}
+        for row in results
+    ]
+
+
+@router.get("/pool-stats")
+async def get_pool_stats():
+    """
+    Estado dos pools de conexão deste processo. Some os valores de todos os
+    workers para comparar com o max_connections do banco/PgBouncer.
+    """
+    stats = {"sync": pool_stats(engine), "async": pool_stats(async_engine)}
+    if HAS_REPLICA:
+        stats["replica_sync"] = pool_stats(replica_engine)
+        stats["replica_async"] = pool_stats(async_replica_engine)
+    return stats
+
+
+@router.post("/profile-token")
+def create_profile_token(
+    user_id: int = Body(..., embed=True),
+    ttl_minutes: int = Body(30, embed=True, ge=1, le=24 * 60),
+    db: Session = Depends(get_read_db),
+    admin: AuthPrincipal = Depends(require_admin),
+):
+    """
+    Token para o header X-Profile-Token: as requisições desse usuário que o
+    enviarem rodam sob profiling (app/middleware/profiling.py).
+    """
+    if db.query(User.id).filter_by(id=user_id).first() is None:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    token = profile_token_for_user(user_id, admin.id, timedelta(minutes=ttl_minutes))
+    return {"profile_token": token, "expires_in": ttl_minutes * 60}
+
+
+@router.get("/profiles")
+def list_profiles(
+    user_id: Optional[int] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    query = db.query(
+        RequestProfile.id, RequestProfile.user_id, RequestProfile.method, RequestProfile.path,
+        RequestProfile.status_code, RequestProfile.duration_ms, RequestProfile.sql_count,
+        RequestProfile.sql_ms, RequestProfile.created_at,
+    )
+    if user_id is not None:
+        query = query.filter(RequestProfile.user_id == user_id)
+    rows = (
+        query.order_by(RequestProfile.created_at.desc(), RequestProfile.id)
+        .limit(limit)
+        .offset(offset)
+        .all()
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, db: Session = Depends(get_db)):
+    # primário: o profile acabou de ser gravado, a réplica pode não ter
+    profile = db.get(RequestProfile, profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile não encontrado")
+    return {
+        column.name: getattr(profile, column.name)
+        for column in RequestProfile.__table__.columns
+    }
@@ -1,10 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.baby_model import Baby
-from app.models.auth_models import User
 from app.schemas.baby_schema import BabyCreate, BabyUpdate, BabyResponse
 from config.database import get_db
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import get_current_user, get_current_user_async, AuthPrincipal
+from app.dependencies.database import get_async_read_db
+from app.utils.deletion import job_progress, start_baby_deletion
+from app.utils.etag import (
+    bump_baby_versions,
+    bump_user_version,
+    conditional_response,
+    make_etag,
+    user_version,
+)
+from app.workers.plan_scheduler import request_plan_refresh
 from typing import List
 
 router = APIRouter(prefix="/babies", tags=["babies"])
@@ -14,7 +25,7 @@ router = APIRouter(prefix="/babies", tags=["babies"])
 def create_baby(
     baby: BabyCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthPrincipal = Depends(get_current_user)
 ):
     new_baby = Baby(
         user_id=current_user.id,
@@ -24,6 +35,7 @@ def create_baby(
         gender=baby.gender   
     )
     db.add(new_baby)
+    bump_user_version(db, current_user.id)
     db.commit()
     db.refresh(new_baby)
 
@@ -35,20 +47,28 @@ def create_baby(
 
 # GET: busca os bebês do usuário logado
 @router.get("/me", response_model=List[BabyResponse])
-def get_my_babies(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_my_babies(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: AuthPrincipal = Depends(get_current_user_async)
 ):
-    babies = db.query(Baby).filter(Baby.user_id == current_user.id).all()
-    return babies
+    version = await db.run_sync(user_version, current_user.id)
+    etag = make_etag("babies", current_user.id, version)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    babies = await db.scalars(select(Baby).where(Baby.user_id == current_user.id))
+    return babies.all()
 
 # PUT: atualiza um bebê específico (se for do usuário)
 @router.put("/{baby_id}", response_model=BabyResponse)
 def update_baby(
-    baby_id: int,
     baby_data: BabyUpdate,
+    baby_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthPrincipal = Depends(get_current_user)
 ):
     baby = db.query(Baby).filter_by(id=baby_id, user_id=current_user.id).first()
     if not baby:
@@ -58,6 +78,24 @@ def update_baby(
     baby.birth_date = baby_data.birth_date or baby.birth_date
     baby.birth_weight_grams = baby_data.birth_weight_grams or baby.birth_weight_grams
 
+    # a idade muda a janela de vigília e o número de sonecas
+    request_plan_refresh(db, [baby.id])
+    bump_baby_versions(db, [baby.id])
     db.commit()
     db.refresh(baby)
     return baby
+
+# DELETE: exclui o bebê com todo o histórico (em lotes se for grande)
+@router.delete("/{baby_id}", status_code=status.HTTP_202_ACCEPTED)
+def delete_baby(
+    baby_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthPrincipal = Depends(get_current_user)
+):
+    baby = db.query(Baby.id).filter_by(id=baby_id, user_id=current_user.id).with_for_update().first()
+    if not baby:
+        raise HTTPException(status_code=404, detail="Bebê não encontrado.")
+
+    job = start_baby_deletion(db, current_user.id, baby_id)
+    db.commit()
+    return job_progress(job)
@@ -0,0 +1,122 @@
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+
+from app.models.baby_model import Baby
+from app.models.daily_report_model import DailyReport
+from app.models.event_model import Event
+from app.models.sleep_plan_model import RoutinePlan
+from app.dependencies.auth import get_current_user_async, AuthPrincipal
+from app.dependencies.database import get_async_read_db
+from app.schemas.dashboard_schema import Dashboard
+from app.utils.etag import conditional_response, make_etag, user_version
+from app.utils.routine_planner import plan_date, plan_is_expired, plan_routine
+from app.workers.plan_scheduler import plan_scheduler
+
+DEFAULT_EVENTS_PER_BABY = 10
+MAX_EVENTS_PER_BABY = 50
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+def _latest_events(baby_ids, limit: int):
+    """
+    Últimos `limit` eventos de cada bebê numa única consulta: um ramo
+    ORDER BY ... LIMIT por bebê (varredura curta de ix_events_baby_id_timestamp)
+    juntos com UNION ALL.
+    """
+    branches = [
+        select(
+            select(Event.id, Event.baby_id, Event.type, Event.timestamp)
+            .where(Event.baby_id == baby_id)
+            .order_by(Event.timestamp.desc(), Event.id.desc())
+            .limit(limit)
+            .subquery()
+        )
+        for baby_id in baby_ids
+    ]
+    return union_all(*branches)
+
+
+@router.get("", response_model=Dashboard)
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    events_limit: int = Query(DEFAULT_EVENTS_PER_BABY, ge=0, le=MAX_EVENTS_PER_BABY),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: AuthPrincipal = Depends(get_current_user_async),
+):
+    """
+    Tela inicial numa chamada só: bebês do usuário com o plano de hoje, o
+    relatório de hoje e os últimos eventos de cada um. Cada parte é uma
+    consulta em lote (IN / UNION ALL), independente do número de bebês.
+
+    Planos ausentes ou expirados voltam como null e são pedidos ao
+    agendador; o cliente pode consultar /plan/today para esse bebê.
+    """
+    today = date.today()  # relatórios: o mesmo dia de /report/daily e /report/generate
+    plan_day = plan_date()  # planos: o dia (UTC) em que ficam gravados
+    babies = (
+        await db.scalars(
+            select(Baby).where(Baby.user_id == current_user.id).order_by(Baby.id)
+        )
+    ).all()
+    baby_ids = [baby.id for baby in babies]
+
+    etag = make_etag(
+        "dashboard", current_user.id, await db.run_sync(user_version, current_user.id),
+        [(baby.id, baby.data_version) for baby in babies], today, plan_day, events_limit,
+    )
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    plans = {
+        plan.baby_id: plan
+        for plan in await db.scalars(
+            select(RoutinePlan).where(
+                RoutinePlan.baby_id.in_(baby_ids), RoutinePlan.date == plan_day
+            )
+        )
+    }
+    reports = {
+        report.baby_id: report
+        for report in await db.scalars(
+            select(DailyReport).where(
+                DailyReport.baby_id.in_(baby_ids), DailyReport.date == today
+            )
+        )
+    }
+    events = {baby_id: [] for baby_id in baby_ids}
+    if events_limit and baby_ids:
+        for row in await db.execute(_latest_events(baby_ids, events_limit)):
+            events[row.baby_id].append(row)
+
+    stale = [
+        baby_id for baby_id in baby_ids
+        if baby_id not in plans or plan_is_expired(plans[baby_id])
+    ]
+    if stale:
+        plan_scheduler.schedule(stale)
+        # a resposta vai mudar quando o agendador gravar os planos
+        del response.headers["ETag"]
+
+    items = []
+    for baby in babies:
+        plan = plans.get(baby.id)
+        report = reports.get(baby.id)
+        items.append({
+            "baby": baby,
+            "plan": plan_routine(plan) if baby.id not in stale else None,
+            "report": {
+                "total_sleep_minutes": report.total_sleep_minutes if report else 0,
+                "total_feeds": report.total_feeds if report else 0,
+                "longest_nap_minutes": report.longest_nap_minutes if report else 0,
+            },
+            "events": sorted(
+                events[baby.id], key=lambda ev: (ev.timestamp, ev.id), reverse=True
+            ),
+        })
+
+    return {"date": today.isoformat(), "babies": items}
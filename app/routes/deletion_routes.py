@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.models.deletion_job_model import DeletionJob
+from app.utils.deletion import job_progress
+from config.database import get_db
+
+router = APIRouter(prefix="/deletions", tags=["deletions"])
+
+
+# Sem autenticação: depois de DELETE /auth/conta o token já não vale. O id é
+# um uuid4 devolvido só a quem pediu, e a resposta não tem dado pessoal.
+# Lê do primário: o job acabou de ser criado e a réplica pode estar atrás.
+@router.get("/{job_id}")
+def get_deletion(job_id: str, db: Session = Depends(get_db)):
+    job = db.get(DeletionJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Exclusão não encontrada.")
+    return job_progress(job)
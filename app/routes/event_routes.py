@@ -1,11 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request, Response
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.event_model import Event
-from app.models.auth_models import User
-from app.schemas.event_schema import EventCreate, EventUpdate, EventRead
+from app.schemas.event_schema import EventCreate, EventUpdate, EventPage
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.db_helpers import dialect_insert
+from app.utils.etag import conditional_response, make_etag, user_version
+from app.utils.event_sync import EventChange, apply_event_changes, lock_babies
 from config.database import get_db
-from app.dependencies.auth import get_current_user
-from typing import List, Union
+from app.dependencies.auth import get_current_user, get_current_user_async, AuthPrincipal
+from app.dependencies.babies import require_babies
+from app.dependencies.database import get_async_read_db
+from datetime import datetime
+from typing import List, Optional, Union
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BATCH_SIZE = 500
 
 router = APIRouter(prefix="/events", tags=["events"])
 
@@ -14,11 +26,14 @@ def create_event(
     # Aqui estamos dizendo: o body pode ser um único EventCreate ou uma lista de EventCreate.
     events: Union[EventCreate, List[EventCreate]] = Body(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthPrincipal = Depends(get_current_user),
 ):
     """
     Se receber um objeto único (EventCreate), cria um único registro.
-    Se receber uma lista de EventCreate, cria múltiplos registros em batch.
+    Se receber uma lista de EventCreate, cria todos num único INSERT multi-linha.
+
+    Eventos com idempotency_key já registrada para o usuário não são
+    duplicados: voltam em "duplicates" com o id do registro original.
     """
 
     # Vamos padronizar uma lista de eventos a ser processada:
@@ -27,47 +42,169 @@ def create_event(
     else:
         event_list = [events]
 
-    created = []  # para retornar dados de cada evento criado
+    if not event_list:
+        return {"msg": "Nenhum evento enviado.", "created": [], "duplicates": []}
+    if len(event_list) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Envie no máximo {MAX_BATCH_SIZE} eventos por lote."
+        )
 
-    for ev_data in event_list:
+    # Confere no banco a posse de cada bebê distinto do lote (e os trava)
+    require_babies(db, current_user.id, {ev.baby_id for ev in event_list})
 
-        new_event = Event(
-            user_id=current_user.id,
-            baby_id=ev_data.baby_id,
-            type=ev_data.type,
-            timestamp=ev_data.timestamp,
+    # Chaves repetidas dentro do próprio lote contam uma vez só
+    rows, seen_keys = [], set()
+    for ev_data in event_list:
+        key = ev_data.idempotency_key
+        if key is not None:
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+        rows.append({
+            "user_id": current_user.id,
+            "baby_id": ev_data.baby_id,
+            "type": ev_data.type,
+            "timestamp": ev_data.timestamp,
+            "idempotency_key": key,
+        })
+
+    stmt = (
+        dialect_insert(db, Event)
+        .values(rows)
+        .on_conflict_do_nothing(
+            index_elements=[Event.user_id, Event.idempotency_key],
+            index_where=Event.idempotency_key.isnot(None),
         )
-        db.add(new_event)
-        db.flush()  # garante que new_event.id seja atribuído antes do commit
-        created.append({"event_id": new_event.id, "type": new_event.type})
+        .returning(Event.id, Event.baby_id, Event.type, Event.timestamp, Event.idempotency_key)
+    )
+    inserted = db.execute(stmt).all()
+
+    apply_event_changes(
+        db, [EventChange(row.baby_id, row.type, row.timestamp) for row in inserted]
+    )
+
+    created = [
+        {"event_id": row.id, "type": row.type, "idempotency_key": row.idempotency_key}
+        for row in inserted
+    ]
+
+    # Chaves que não voltaram no RETURNING já existiam (reenvio do cliente)
+    duplicate_keys = seen_keys - {row.idempotency_key for row in inserted}
+    duplicates = []
+    if duplicate_keys:
+        duplicates = [
+            {"event_id": row.id, "type": row.type, "idempotency_key": row.idempotency_key}
+            for row in db.query(Event.id, Event.type, Event.idempotency_key).filter(
+                Event.user_id == current_user.id,
+                Event.idempotency_key.in_(duplicate_keys),
+            )
+        ]
 
     db.commit()
 
     return {
         "msg": "Eventos registrados com sucesso.",
         "created": created,
+        "duplicates": duplicates,
     }
 
-@router.get("", response_model=List[EventRead])
-def list_events(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    events = db.query(Event).filter(Event.user_id == current_user.id).order_by(Event.timestamp.desc()).all()
-    return events
+@router.get("", response_model=EventPage)
+async def list_events(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    baby_id: Optional[int] = Query(None),
+    type: Optional[str] = Query(None),
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: AuthPrincipal = Depends(get_current_user_async),
+):
+    """
+    Lista os eventos do usuário do mais recente para o mais antigo, paginando
+    por (timestamp, id). Cada página é uma varredura limitada de índice;
+    passe o next_cursor recebido em `cursor` para buscar a próxima.
+    """
+    version = await db.run_sync(user_version, current_user.id)
+    etag = make_etag("events", current_user.id, version, request.url.query)
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    query = select(Event).where(Event.user_id == current_user.id)
+
+    if baby_id is not None:
+        query = query.where(Event.baby_id == baby_id)
+    if type is not None:
+        query = query.where(Event.type == type)
+    if from_ is not None:
+        query = query.where(Event.timestamp >= from_)
+    if to is not None:
+        query = query.where(Event.timestamp < to)
+
+    position = decode_cursor(cursor)
+    if position:
+        last_ts, last_id = position
+        # "timestamp <= :ts" é redundante, mas dá ao planner o limite do range
+        query = query.where(
+            Event.timestamp <= last_ts,
+            or_(
+                Event.timestamp < last_ts,
+                and_(Event.timestamp == last_ts, Event.id < last_id),
+            ),
+        )
+
+    rows = (
+        await db.scalars(
+            query.order_by(Event.timestamp.desc(), Event.id.desc()).limit(limit + 1)
+        )
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+
+    return {"items": rows, "next_cursor": next_cursor}
+
+def _locked_event(db: Session, event_id: int, user_id: int) -> Event:
+    """
+    Evento do usuário com o bebê já travado, antes de qualquer alteração:
+    toda escrita trava o bebê primeiro (ver app/utils/event_sync.py), senão
+    o DELETE em cascata nas sessões de sono inverte a ordem das travas com
+    um POST concorrente. Relido depois da trava, que pode ter esperado por
+    outra escrita do mesmo evento.
+    """
+    event = db.query(Event).filter_by(id=event_id, user_id=user_id).first()
+    if event:
+        lock_babies(db, [event.baby_id])
+        event = (
+            db.query(Event).filter_by(id=event_id, user_id=user_id).populate_existing().first()
+        )
+    if not event:
+        raise HTTPException(status_code=404, detail="Evento não encontrado.")
+    return event
+
 
 @router.put("/{event_id}")
 def update_event(
     event_id: int,
     event_update: EventUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthPrincipal = Depends(get_current_user)
 ):
-    event = db.query(Event).filter_by(id=event_id, user_id=current_user.id).first()
+    event = _locked_event(db, event_id, current_user.id)
 
-    if not event:
-        raise HTTPException(status_code=404, detail="Evento não encontrado.")
+    before = EventChange(event.baby_id, event.type, event.timestamp)
 
     event.type = event_update.type or event.type
     event.timestamp = event_update.timestamp or event.timestamp
+    db.flush()
+    db.refresh(event)  # timestamp como ficou gravado (sem fuso)
 
+    apply_event_changes(db, [before, EventChange(event.baby_id, event.type, event.timestamp)])
     db.commit()
     db.refresh(event)
 
@@ -83,14 +220,14 @@ def update_event(
 def delete_event(
     event_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthPrincipal = Depends(get_current_user)
 ):
-    event = db.query(Event).filter_by(id=event_id, user_id=current_user.id).first()
-
-    if not event:
-        raise HTTPException(status_code=404, detail="Evento não encontrado.")
+    event = _locked_event(db, event_id, current_user.id)
 
     db.delete(event)
+    db.flush()
+
+    apply_event_changes(db, [EventChange(event.baby_id, event.type, event.timestamp)])
     db.commit()
 
     return {"msg": "Evento excluído com sucesso."}
\ No newline at end of file
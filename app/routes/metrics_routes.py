@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+
+from app.utils.metrics import register_collector, render
+from config.database import HAS_REPLICA, async_engine, async_replica_engine, engine, replica_engine
+from config.db_pool import pool_stats
+from config.settings import METRICS_TOKEN
+
+router = APIRouter(tags=["metrics"])
+
+POOL_GAUGES = {
+    "checked_out": "Conexões em uso",
+    "checked_in": "Conexões ociosas no pool",
+    "overflow": "Conexões além de pool_size",
+    "checkouts": "Checkouts desde o início do processo",
+    "timeouts": "Checkouts que estouraram pool_timeout",
+    "wait_seconds_total": "Tempo total esperando conexão",
+}
+
+
+def _pool_metrics():
+    engines = {"sync": engine, "async": async_engine}
+    if HAS_REPLICA:
+        engines.update(replica_sync=replica_engine, replica_async=async_replica_engine)
+    stats = {name: pool_stats(eng) for name, eng in engines.items()}
+
+    for key, documentation in POOL_GAUGES.items():
+        name = f"db_pool_{key}"
+        yield f"# HELP {name} {documentation}"
+        yield f"# TYPE {name} gauge"
+        for pool, values in stats.items():
+            if key in values:
+                yield f'{name}{{pool="{pool}"}} {values[key]}'
+
+
+register_collector(_pool_metrics)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(authorization: Optional[str] = Header(None)):
+    """Métricas do processo no formato texto do Prometheus."""
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Token inválido")
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
@@ -1,13 +1,17 @@
 # src/routers/payment.py
 
 import stripe
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.models.auth_models import User
 from config.database import get_db
-from app.dependencies.auth import get_current_user
+from config.settings import STRIPE_WEBHOOK_SECRET
+from app.dependencies.auth import get_current_user, AuthPrincipal
+from app.models.auth_models import User
+from app.utils.subscriptions import SUBSCRIPTION_EVENTS, upsert_subscription
 
 import os
+from typing import Optional
 
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 router = APIRouter(prefix="/payment")
@@ -16,13 +20,23 @@ router = APIRouter(prefix="/payment")
 def create_checkout_session(
     data: dict,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: AuthPrincipal = Depends(get_current_user),
 ):
     price_id = data.get("priceId")
     if not price_id:
         raise HTTPException(status_code=400, detail="Price ID obrigatório.")
+    # o customer é criado de forma assíncrona logo após o cadastro (outbox);
+    # lido do banco, não do principal em cache, que pode ser anterior a isso
+    stripe_customer_id = user.stripe_customer_id or db.scalar(
+        select(User.stripe_customer_id).where(User.id == user.id)
+    )
+    if not stripe_customer_id:
+        raise HTTPException(
+            status_code=409,
+            detail="Perfil de pagamento ainda em criação. Tente novamente em instantes."
+        )
     session = stripe.checkout.Session.create(
-        customer=user.stripe_customer_id,
+        customer=stripe_customer_id,
         payment_method_types=["card"],
         line_items=[{"price": price_id, "quantity": 1}],
         mode="subscription",
@@ -30,3 +44,35 @@ def create_checkout_session(
         cancel_url="https://nanafacil-web.onrender.com/plans",
     )
     return {"sessionId": session.id}
+
+
+async def _raw_body(request: Request) -> bytes:
+    # a verificação da assinatura exige o corpo exatamente como foi enviado
+    return await request.body()
+
+
+@router.post("/webhook")
+def stripe_webhook(
+    payload: bytes = Depends(_raw_body),
+    stripe_signature: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Recebe eventos do Stripe e mantém a tabela subscriptions atualizada.
+    A assinatura do payload é verificada com STRIPE_WEBHOOK_SECRET.
+    """
+    if not STRIPE_WEBHOOK_SECRET:
+        raise HTTPException(status_code=503, detail="Webhook não configurado.")
+
+    try:
+        event = stripe.Webhook.construct_event(payload, stripe_signature, STRIPE_WEBHOOK_SECRET)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Payload inválido.")
+    except stripe.SignatureVerificationError:
+        raise HTTPException(status_code=400, detail="Assinatura inválida.")
+
+    if event["type"] in SUBSCRIPTION_EVENTS:
+        upsert_subscription(db, event["data"]["object"], event["created"])
+        db.commit()
+
+    return {"received": True}
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import date, datetime
+from datetime import date
 from typing import List
 
 from config.database import get_db
-from app.models.baby_model import Baby
-from app.models.event_model import Event
 from app.models.daily_report_model import DailyReport
-from app.dependencies.auth import get_current_user
+from app.dependencies.auth import AuthPrincipal, get_current_user, get_current_user_async
+from app.dependencies.database import get_async_read_db
+from app.utils.etag import baby_version, bump_baby_versions, conditional_response, make_etag
+from app.utils.event_sync import lock_babies
+from app.utils.report_generator import refresh_daily_report
 
 # Importa os Schemas que você já possui
 from app.schemas.report_schema import DailyReportResponse, DailyReportOut
@@ -20,90 +24,32 @@ router = APIRouter(prefix="/report", tags=["daily report"])
     response_model=DailyReportResponse
 )
 def generate_daily_report(
-    baby_id: int = Query(...),
+    baby_id: int,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user: AuthPrincipal = Depends(get_current_user),
 ):
     """
     Gera ou atualiza o relatório diário para o bebê:
     - total_sleep_minutes: soma de todas as sonecas do dia (em minutos)
     - total_feeds: contagem de eventos com tipo 'feed' no dia
     - longest_nap_minutes: duração da maior soneca (em minutos)
+
+    Os relatórios já são mantidos a cada escrita de evento; este endpoint
+    apenas força o recálculo do dia de hoje.
     """
     today = date.today()
-    start_of_day = datetime.combine(today, datetime.min.time())
-    end_of_day = datetime.combine(today, datetime.max.time())
-
-    # 1) Confere se o bebê pertence ao usuário logado
-    baby = (
-        db.query(Baby)
-        .filter_by(id=baby_id, user_id=current_user.id)
-        .first()
-    )
-    if not baby:
-        raise HTTPException(status_code=403, detail="Acesso negado para este bebê")
 
-    # 2) Busca todos os eventos do dia para esse bebê
-    events = (
-        db.query(Event)
-        .filter_by(baby_id=baby_id)
-        .filter(Event.timestamp.between(start_of_day, end_of_day))
-        .all()
-    )
-    if not events:
-        raise HTTPException(status_code=400, detail="Nenhum evento encontrado para hoje")
-
-    # 3) Calcula total de sono e maior soneca
-    last_sleep = None
-    total_sleep_minutes = 0
-    longest_nap = 0
-
-    for event in sorted(events, key=lambda e: e.timestamp):
-        if event.type == "sleep_start":
-            last_sleep = event.timestamp
-        elif event.type == "sleep_end" and last_sleep:
-            duration = int((event.timestamp - last_sleep).total_seconds() / 60)
-            total_sleep_minutes += duration
-            longest_nap = max(longest_nap, duration)
-            last_sleep = None
-
-    # 4) Conta quantos eventos de tipo 'feed' ocorreram no dia
-    total_feeds = sum(1 for e in events if e.type == "feed")
-
-    # 5) Prepara texto de notas (opcional, não faz parte da DailyReportResponse)
-    notes_text = (
-        f"Total de sono hoje: {total_sleep_minutes} minutos. "
-        f"Maior soneca: {longest_nap} minutos. "
-        f"Total de mamadas: {total_feeds}."
-    )
-
-    # 6) Verifica se já existe relatório para hoje e, se sim, atualiza; senão, cria novo
-    existing_report = (
-        db.query(DailyReport)
-        .filter_by(baby_id=baby_id, date=today)
-        .first()
-    )
+    # Trava o bebê como as escritas de eventos; a mesma consulta confere a posse
+    if not lock_babies(db, [baby_id], user_id=current_user.id):
+        raise HTTPException(status_code=403, detail="Acesso negado para este bebê")
 
-    if existing_report:
-        existing_report.total_sleep_minutes = total_sleep_minutes
-        existing_report.longest_nap_minutes = longest_nap
-        existing_report.total_feeds = total_feeds
-        existing_report.notes = notes_text
+    # Recalcula e grava o relatório do dia
+    report = refresh_daily_report(db, baby_id, today)
+    bump_baby_versions(db, [baby_id], owners=False)
+    if report is None:
         db.commit()
-        db.refresh(existing_report)
-        report = existing_report
-    else:
-        report = DailyReport(
-            baby_id=baby_id,
-            date=today,
-            total_sleep_minutes=total_sleep_minutes,
-            longest_nap_minutes=longest_nap,
-            total_feeds=total_feeds,
-            notes=notes_text,
-        )
-        db.add(report)
-        db.commit()
-        db.refresh(report)
+        raise HTTPException(status_code=400, detail="Nenhum evento encontrado para hoje")
+    db.commit()
 
     return {
         "total_sleep_minutes": report.total_sleep_minutes,
@@ -116,31 +62,34 @@ def generate_daily_report(
     "/daily",
     response_model=DailyReportResponse
 )
-def get_daily_report(
-    baby_id: int = Query(...),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+async def get_daily_report(
+    request: Request,
+    response: Response,
+    baby_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user = Depends(get_current_user_async)
 ):
     """
     Retorna o relatório diário (hoje) para o bebê: 
     - total_sleep_minutes, total_feeds, longest_nap_minutes
+    Sem relatório, ainda não houve eventos hoje: tudo zerado.
     """
     today = date.today()
-    baby = (
-        db.query(Baby)
-        .filter_by(id=baby_id, user_id=current_user.id)
-        .first()
-    )
-    if not baby:
+    version = await db.run_sync(baby_version, baby_id, current_user.id)
+    if version is None:
         raise HTTPException(status_code=403, detail="Acesso negado para este bebê")
 
-    report = (
-        db.query(DailyReport)
-        .filter_by(baby_id=baby_id, date=today)
-        .first()
+    not_modified = conditional_response(
+        request, response, make_etag("report-daily", baby_id, version, today)
+    )
+    if not_modified:
+        return not_modified
+
+    report = await db.scalar(
+        select(DailyReport).filter_by(baby_id=baby_id, date=today)
     )
     if not report:
-        raise HTTPException(status_code=404, detail="Relatório não encontrado")
+        return {"total_sleep_minutes": 0, "total_feeds": 0, "longest_nap_minutes": 0}
 
     return {
         "total_sleep_minutes": report.total_sleep_minutes,
@@ -153,29 +102,32 @@ def get_daily_report(
     "/history",
     response_model=List[DailyReportOut]
 )
-def get_reports_history(
-    baby_id: int = Query(...),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+async def get_reports_history(
+    request: Request,
+    response: Response,
+    baby_id: int,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user = Depends(get_current_user_async)
 ):
     """
     Retorna o histórico completo de DailyReport para um bebê,
     em ordem crescente de data, no formato:
       [{ "date": "YYYY-MM-DD", "total_sleep_minutes": X, "longest_nap_minutes": Y }, ...]
     """
-    baby = (
-        db.query(Baby)
-        .filter_by(id=baby_id, user_id=current_user.id)
-        .first()
-    )
-    if not baby:
+    version = await db.run_sync(baby_version, baby_id, current_user.id)
+    if version is None:
         raise HTTPException(status_code=403, detail="Acesso negado para este bebê")
 
-    reports = (
-        db.query(DailyReport)
+    not_modified = conditional_response(
+        request, response, make_etag("report-history", baby_id, version)
+    )
+    if not_modified:
+        return not_modified
+
+    reports = await db.scalars(
+        select(DailyReport)
         .filter_by(baby_id=baby_id)
         .order_by(DailyReport.date.asc())
-        .all()
     )
 
     history_list = []
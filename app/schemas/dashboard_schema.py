@@ -0,0 +1,26 @@
+# app/schemas/dashboard_schema.py
+
+from pydantic import BaseModel
+from datetime import datetime
+
+from app.schemas.baby_schema import BabyResponse
+from app.schemas.event_schema import EventRead
+from app.schemas.report_schema import DailyReportResponse
+
+class NapRead(BaseModel):
+    start: datetime
+    end: datetime
+
+class PlanRead(BaseModel):
+    naps: list[NapRead]
+    feeds: list[datetime | None]
+
+class DashboardBaby(BaseModel):
+    baby: BabyResponse
+    plan: PlanRead | None = None    # None: plano ainda sendo calculado
+    report: DailyReportResponse
+    events: list[EventRead]
+
+class Dashboard(BaseModel):
+    date: str
+    babies: list[DashboardBaby]
@@ -1,12 +1,13 @@
 # app/schemas/event_schema.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 class EventCreate(BaseModel):
     baby_id: int
     type: str
     timestamp: datetime
+    idempotency_key: str | None = Field(default=None, max_length=64)
 
     class Config:
         orm_mode = True
@@ -23,3 +24,7 @@ class EventRead(BaseModel):
 
     class Config:
         orm_mode = True
+
+class EventPage(BaseModel):
+    items: list[EventRead]
+    next_cursor: str | None = None
@@ -0,0 +1,22 @@
+# app/utils/db_helpers.py
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session, model):
+    """
+    INSERT com suporte a ON CONFLICT para o dialeto da sessão.
+    Produção roda em Postgres; o SQLite só é usado em dev/benchmarks locais.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def minutes_between(db: Session, start, end):
+    """Expressão SQL com os minutos inteiros (truncados) entre dois timestamps."""
+    if db.get_bind().dialect.name == "sqlite":
+        # julianday em dias; o epsilon evita 89.999... virar 89
+        return cast((func.julianday(end) - func.julianday(start)) * 1440 + 1e-6, Integer)
+    return cast(func.floor(func.extract("epoch", end - start) / 60), Integer)
@@ -0,0 +1,141 @@
+# app/utils/deletion.py
+"""
+Exclusão de um bebê ou de uma conta inteira (LGPD), em lotes.
+
+O pedido roda numa transação curta: cria o DeletionJob, tira o bebê do
+usuário (ou marca a conta como excluída, o que a tira do login e da
+autenticação) e agenda o primeiro lote na outbox. O cache de principals é
+limpo pela rota depois do commit e só no worker que atendeu: nos outros,
+tokens já emitidos continuam autenticando até PRINCIPAL_CACHE_TTL_SECONDS.
+Cada lote apaga até
+DELETE_BATCH_SIZE eventos numa transação própria e agenda o seguinte, então
+nenhum lock dura mais que um lote e o trabalho sobrevive a restart. As
+linhas dependentes (sessões de sono, relatórios, planos, rollups) saem pelo
+ON DELETE CASCADE do banco. Históricos pequenos são apagados já no pedido.
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models.auth_models import MagicToken, User
+from app.models.baby_model import Baby
+from app.models.deletion_job_model import DeletionJob
+from app.models.event_model import Event
+from app.models.subscription_model import Subscription
+from app.utils.etag import bump_user_version
+from app.utils.outbox import enqueue
+from app.utils.rollups import refresh_event_rollups
+from app.utils.stripe_customers import DELETE_CUSTOMER_TOPIC
+from config.settings import DELETE_BATCH_SIZE
+
+DELETION_TOPIC = "deletion.batch"
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+
+
+def start_baby_deletion(db: Session, user_id: int, baby_id: int) -> DeletionJob:
+    """O bebê some para o usuário já nesta transação; o histórico sai em lotes."""
+    db.query(Baby).filter_by(id=baby_id).update({Baby.user_id: None}, synchronize_session=False)
+    bump_user_version(db, user_id)
+    total = db.query(func.count(Event.id)).filter(Event.baby_id == baby_id).scalar()
+    return _start(db, DeletionJob(kind="baby", user_id=user_id, baby_id=baby_id, total_events=total))
+
+
+def start_account_deletion(db: Session, user_id: int) -> DeletionJob:
+    """A conta sai do login e da autenticação no commit desta transação."""
+    db.query(User).filter_by(id=user_id).update(
+        {User.deleted_at: datetime.utcnow()}, synchronize_session=False
+    )
+    total = db.query(func.count(Event.id)).filter(Event.user_id == user_id).scalar()
+    return _start(db, DeletionJob(kind="account", user_id=user_id, total_events=total))
+
+
+def _start(db: Session, job: DeletionJob) -> DeletionJob:
+    job.id = str(uuid4())
+    job.status = PENDING
+    job.deleted_events = 0
+    db.add(job)
+    if job.total_events <= DELETE_BATCH_SIZE:
+        # um lote só: resolve no próprio pedido, sem passar pela outbox
+        while not delete_batch(db, job):
+            pass
+    else:
+        enqueue(db, DELETION_TOPIC, {"job_id": job.id})
+    return job
+
+
+def delete_batch(db: Session, job: DeletionJob) -> bool:
+    """Apaga um lote de eventos; sem eventos restantes, finaliza. True = terminou."""
+    if job.status == DONE:
+        return True
+    job.status = RUNNING
+
+    scope = Event.baby_id == job.baby_id if job.kind == "baby" else Event.user_id == job.user_id
+    batch = (
+        select(Event.id)
+        .where(scope)
+        .order_by(Event.timestamp)  # segue o índice (baby_id|user_id, timestamp)
+        .limit(DELETE_BATCH_SIZE)
+    )
+    deleted = db.execute(
+        delete(Event).where(Event.id.in_(batch)).returning(Event.timestamp),
+        execution_options={"synchronize_session": False},
+    ).scalars().all()
+
+    if deleted:
+        job.deleted_events += len(deleted)
+        if job.kind == "baby":
+            # a conta continua: trava o usuário (versão) e acerta os rollups
+            bump_user_version(db, job.user_id)
+            refresh_event_rollups(db, {(job.user_id, ts.date()) for ts in deleted})
+        return False
+
+    if job.kind == "baby":
+        db.query(Baby).filter_by(id=job.baby_id).delete(synchronize_session=False)
+    else:
+        _delete_account(db, job.user_id)
+    job.status = DONE
+    job.finished_at = datetime.utcnow()
+    return True
+
+
+def _delete_account(db: Session, user_id: int):
+    user = db.query(User).filter_by(id=user_id).first()
+    if user is None:
+        return
+    if user.stripe_customer_id:
+        db.query(Subscription).filter_by(stripe_customer_id=user.stripe_customer_id).delete(
+            synchronize_session=False
+        )
+        enqueue(db, DELETE_CUSTOMER_TOPIC, {"stripe_customer_id": user.stripe_customer_id})
+    db.query(MagicToken).filter_by(email=user.email).delete(synchronize_session=False)
+    db.query(Baby).filter_by(user_id=user_id).delete(synchronize_session=False)
+    db.query(User).filter_by(id=user_id).delete(synchronize_session=False)
+
+
+def process_deletion_batch(db: Session, payload: dict):
+    """Handler da outbox: um lote por mensagem, reagendando o próximo."""
+    job = db.query(DeletionJob).filter_by(id=payload["job_id"]).with_for_update().first()
+    if job is None:
+        return
+    if not delete_batch(db, job):
+        enqueue(db, DELETION_TOPIC, {"job_id": job.id})
+
+
+def job_progress(job: DeletionJob) -> dict:
+    total = max(job.total_events, job.deleted_events)
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "total_events": total,
+        "deleted_events": job.deleted_events,
+        "progress": 1.0 if job.status == DONE else (job.deleted_events / total if total else 0.0),
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
@@ -0,0 +1,81 @@
+# app/utils/etag.py
+"""
+GET condicional (ETag / If-None-Match) guiado por versões de dados.
+
+Bebês e usuários têm uma coluna data_version incrementada, na mesma
+transação, a cada escrita que muda o que as rotas de leitura devolvem:
+eventos, dados do bebê, relatórios e planos. As rotas de leitura buscam só
+a versão (uma consulta por chave primária) e, se o cliente já tem aquela
+versão, respondem 304 sem montar a resposta.
+"""
+
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.auth_models import User
+from app.models.baby_model import Baby
+
+
+def bump_baby_versions(db: Session, baby_ids: Iterable[int], owners: bool = True):
+    """Incrementa a versão dos bebês (e, por padrão, dos seus responsáveis)."""
+    baby_ids = sorted(set(baby_ids))
+    if not baby_ids:
+        return
+    db.query(Baby).filter(Baby.id.in_(baby_ids)).update(
+        {Baby.data_version: Baby.data_version + 1}, synchronize_session=False
+    )
+    if owners:
+        db.query(User).filter(
+            User.id.in_(select(Baby.user_id).where(Baby.id.in_(baby_ids)))
+        ).update({User.data_version: User.data_version + 1}, synchronize_session=False)
+
+
+def bump_user_version(db: Session, user_id: int):
+    db.query(User).filter(User.id == user_id).update(
+        {User.data_version: User.data_version + 1}, synchronize_session=False
+    )
+
+
+def baby_version(db: Session, baby_id: int, user_id: int) -> Optional[int]:
+    """Versão do bebê, ou None se ele não pertence ao usuário."""
+    return (
+        db.query(Baby.data_version)
+        .filter(Baby.id == baby_id, Baby.user_id == user_id)
+        .scalar()
+    )
+
+
+def user_version(db: Session, user_id: int) -> int:
+    return db.query(User.data_version).filter(User.id == user_id).scalar() or 0
+
+
+def make_etag(*parts) -> str:
+    """ETag fraca a partir da versão e do que mais variar a resposta."""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # comparação fraca: W/"x" e "x" são a mesma representação
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Anota a ETag na resposta. Devolve um 304 pronto se o cliente já tem
+    essa versão; senão None e a rota segue normalmente.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,112 @@
+# app/utils/event_sync.py
+"""
+Manutenção dos dados derivados de eventos (sessões de sono, relatórios
+diários etc.).
+
+As rotas de escrita de eventos chamam apply_event_changes na mesma transação
+da escrita, antes do commit, passando o estado de cada evento afetado:
+o novo (criação), o antigo (exclusão) ou ambos (atualização).
+
+Os recálculos leem os eventos do bebê e regravam o resultado: duas escritas
+simultâneas do mesmo bebê, cada uma sem ver o evento ainda não commitado
+da outra, deixariam totais desatualizados. Por isso apply_event_changes
+começa travando as linhas dos bebês (lock_babies); a segunda escrita espera
+o commit da primeira e recalcula já enxergando o evento dela.
+
+A trava do bebê vem antes de qualquer outra: rotas que alteram ou apagam um
+evento travam o bebê antes de mexer nele (o DELETE trava, em cascata, as
+sessões de sono que o referenciam, que um POST concorrente também regrava).
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from config.database import SessionLocal
+from app.models.baby_model import Baby
+from app.utils.etag import bump_baby_versions
+from app.utils.report_generator import refresh_daily_report
+from app.utils.rollups import refresh_event_rollups
+from app.utils.sleep_sessions import SLEEP_TYPES, resync_sleep_sessions
+from app.workers.plan_scheduler import request_plan_refresh
+
+
+@dataclass(frozen=True)
+class EventChange:
+    baby_id: int
+    type: str
+    timestamp: datetime
+
+
+def lock_babies(db: Session, baby_ids: Iterable[int], user_id: Optional[int] = None) -> Set[int]:
+    """
+    Trava as linhas dos bebês até o fim da transação, em ordem de id (sem
+    deadlock entre lotes com os mesmos bebês). FOR NO KEY UPDATE não conflita
+    com o KEY SHARE que a FK de events toma ao inserir. Com `user_id`, só
+    trava (e devolve) os bebês desse usuário; sem ele, pula os que já foram
+    travados nesta transação (a rota trava ao conferir a posse e
+    apply_event_changes não repete a consulta).
+    """
+    locked = db.info.setdefault("locked_babies", set())
+    baby_ids = set(baby_ids)
+    if user_id is None:
+        baby_ids -= locked
+    baby_ids = sorted(baby_ids)
+    if not baby_ids:
+        return set()
+    query = (
+        select(Baby.id)
+        .where(Baby.id.in_(baby_ids))
+        .order_by(Baby.id)
+        .with_for_update(key_share=True)
+    )
+    if user_id is not None:
+        query = query.where(Baby.user_id == user_id)
+    result = set(db.scalars(query))
+    locked.update(result)
+    return result
+
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(SessionLocal, "after_rollback")
+def _release_locked_babies(session):
+    # as travas acabam com a transação
+    session.info.pop("locked_babies", None)
+
+
+def apply_event_changes(db: Session, changes: Iterable[EventChange]):
+    changes = list(changes)
+    # antes de qualquer leitura dos recálculos abaixo (ver docstring do módulo)
+    lock_babies(db, {change.baby_id for change in changes})
+    db.flush()
+
+    # Um evento movido de dia afeta o dia antigo e o novo
+    days = {(change.baby_id, change.timestamp.date()) for change in changes}
+
+    # Sessões de sono: um re-pareamento por bebê cobrindo todas as mudanças
+    sleep_ranges = {}
+    for change in changes:
+        if change.type in SLEEP_TYPES:
+            lo, hi = sleep_ranges.get(change.baby_id, (change.timestamp, change.timestamp))
+            sleep_ranges[change.baby_id] = (min(lo, change.timestamp), max(hi, change.timestamp))
+    for baby_id, (t_min, t_max) in sleep_ranges.items():
+        for day in resync_sleep_sessions(db, baby_id, t_min, t_max):
+            days.add((baby_id, day))
+    request_plan_refresh(db, sleep_ranges.keys())
+
+    for baby_id, day in sorted(days):
+        refresh_daily_report(db, baby_id, day)
+
+    baby_ids = {change.baby_id for change in changes}
+    # trava também as linhas dos usuários; os rollups abaixo dependem disso
+    bump_baby_versions(db, baby_ids)
+
+    if baby_ids:
+        owners = dict(db.query(Baby.id, Baby.user_id).filter(Baby.id.in_(baby_ids)))
+        refresh_event_rollups(
+            db, {(owners[change.baby_id], change.timestamp.date()) for change in changes}
+        )
+    db.flush()
@@ -3,13 +3,70 @@ import secrets, jwt
 from datetime import datetime, timedelta
 from config.settings import JWT_SECRET, JWT_ALGORITHM
 
+ACCESS_TOKEN_TTL = timedelta(days=3)
+# Tokens de profiling levam aud: decode_access_token os rejeita (PyJWT exige
+# audience explícita), então não servem como login.
+PROFILE_TOKEN_AUDIENCE = "profile"
+
+# Chave e algoritmo preparados uma única vez (configure_jwt, no startup);
+# encode e decode usam sempre a mesma implementação (PyJWT).
+_jwt_algorithm = None
+_jwt_key = None
+
+
+def configure_jwt():
+    global _jwt_algorithm, _jwt_key
+    if not JWT_SECRET:
+        raise RuntimeError("JWT_SECRET não configurado")
+    _jwt_algorithm = JWT_ALGORITHM or "HS256"
+    _jwt_key = jwt.get_algorithm_by_name(_jwt_algorithm).prepare_key(JWT_SECRET)
+
+
+def _key():
+    if _jwt_key is None:
+        configure_jwt()
+    return _jwt_key
+
+
 def generate_magic_token() -> str:
     return secrets.token_urlsafe(32)
 
-def jwt_for_user(email: str, role: str = "parent"):
+def jwt_for_user(user_id: int, email: str, role: str = "parent"):
     payload = {
-        "sub": email,
+        "sub": str(user_id),
+        "email": email,
         "role": role,
-        "exp": datetime.utcnow() + timedelta(days=3),
+        "exp": datetime.utcnow() + ACCESS_TOKEN_TTL,
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return jwt.encode(payload, _key(), algorithm=_jwt_algorithm)
+
+
+def decode_access_token(token: str) -> dict:
+    """Valida assinatura e expiração; levanta jwt.PyJWTError se inválido."""
+    return jwt.decode(
+        token,
+        _key(),
+        algorithms=[_jwt_algorithm],
+        options={"require": ["sub", "exp"]},
+    )
+
+
+def profile_token_for_user(user_id: int, admin_id: int, ttl: timedelta) -> str:
+    """Autoriza o profiling das requisições de um usuário (header X-Profile-Token)."""
+    payload = {
+        "sub": str(user_id),
+        "admin": admin_id,
+        "aud": PROFILE_TOKEN_AUDIENCE,
+        "exp": datetime.utcnow() + ttl,
+    }
+    return jwt.encode(payload, _key(), algorithm=_jwt_algorithm)
+
+
+def decode_profile_token(token: str) -> dict:
+    return jwt.decode(
+        token,
+        _key(),
+        algorithms=[_jwt_algorithm],
+        audience=PROFILE_TOKEN_AUDIENCE,
+        options={"require": ["sub", "exp", "aud"]},
+    )
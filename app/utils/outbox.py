@@ -0,0 +1,69 @@
+# app/utils/outbox.py
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+from sqlalchemy.orm import Session
+
+from app.models.outbox_model import OutboxMessage
+from config.settings import OUTBOX_MAX_ATTEMPTS
+
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 60 * 60
+
+
+def enqueue(db: Session, topic: str, payload: dict) -> OutboxMessage:
+    """Adiciona a mensagem à transação corrente; só é publicada no commit."""
+    # available_at em UTC, como a comparação de process_next: o default da
+    # coluna (now()) segue o fuso do banco
+    message = OutboxMessage(topic=topic, payload=payload, available_at=datetime.utcnow())
+    db.add(message)
+    return message
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Backoff exponencial com jitter: 5s, 10s, 20s... até 1h."""
+    seconds = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+
+def process_next(db: Session, handlers: Dict[str, Callable[[Session, dict], None]]) -> bool:
+    """
+    Processa a próxima mensagem disponível. Retorna False se a fila está vazia.
+
+    A linha fica travada (FOR UPDATE SKIP LOCKED) até o commit, então vários
+    workers podem rodar em paralelo sem processar a mesma mensagem.
+    """
+    message = (
+        db.query(OutboxMessage)
+        .filter(
+            OutboxMessage.status == "pending",
+            OutboxMessage.available_at <= datetime.utcnow(),
+        )
+        .order_by(OutboxMessage.available_at)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if message is None:
+        db.rollback()
+        return False
+
+    handler = handlers.get(message.topic)
+    try:
+        if handler is None:
+            raise LookupError(f"Nenhum handler para o tópico {message.topic!r}")
+        with db.begin_nested():
+            handler(db, message.payload)
+    except Exception as exc:
+        message.attempts += 1
+        message.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+        if message.attempts >= OUTBOX_MAX_ATTEMPTS:
+            message.status = "dead"
+        else:
+            message.available_at = datetime.utcnow() + backoff_delay(message.attempts)
+    else:
+        message.status = "done"
+        message.processed_at = datetime.utcnow()
+
+    db.commit()
+    return True
@@ -0,0 +1,91 @@
+# app/utils/profiling.py
+"""
+Profiling sob demanda de uma requisição (cProfile + SQL executado).
+
+install_profiling troca o route.dependant.call de cada rota por um wrapper
+que só liga o cProfile quando o ProfilingMiddleware abriu uma sessão no
+contexto; fora disso o custo é uma leitura de ContextVar. O wrapper roda
+onde o endpoint roda (thread do threadpool para rotas def), que é onde o
+cProfile precisa estar ligado. Em rotas async o profile também pode pegar
+outras tarefas do event loop intercaladas com a requisição.
+"""
+
+import asyncio
+import cProfile
+import functools
+import io
+import pstats
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi.routing import APIRoute
+
+PROFILE_TOP_FUNCTIONS = 60
+
+
+@dataclass
+class ProfileSession:
+    user_id: int
+    admin_id: Optional[int] = None
+    profiler: Optional[cProfile.Profile] = None
+
+
+_active: ContextVar[Optional[ProfileSession]] = ContextVar("profile_session", default=None)
+
+
+def start_session(session: ProfileSession):
+    return _active.set(session)
+
+
+def end_session(token):
+    _active.reset(token)
+
+
+def _wrap(call):
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def profiled(*args, **kwargs):
+            session = _active.get()
+            if session is None:
+                return await call(*args, **kwargs)
+            session.profiler = cProfile.Profile()
+            session.profiler.enable()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                session.profiler.disable()
+    else:
+        @functools.wraps(call)
+        def profiled(*args, **kwargs):
+            session = _active.get()
+            if session is None:
+                return call(*args, **kwargs)
+            session.profiler = cProfile.Profile()
+            session.profiler.enable()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                session.profiler.disable()
+    profiled._profiling_wrapped = True
+    return profiled
+
+
+def install_profiling(app):
+    """
+    Chamar depois de incluir todas as rotas. O FastAPI lê dependant.call a
+    cada requisição (e decide sync/async na criação da rota), então basta
+    trocar o callable preservando o tipo.
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not getattr(route.dependant.call, "_profiling_wrapped", False):
+            route.dependant.call = _wrap(route.dependant.call)
+
+
+def format_profile(profiler: Optional[cProfile.Profile]) -> str:
+    if profiler is None:
+        return ""
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    return out.getvalue()
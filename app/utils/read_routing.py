@@ -0,0 +1,60 @@
+# app/utils/read_routing.py
+"""
+Read-your-writes com réplica de leitura.
+
+Toda requisição de escrita autenticada fixa o usuário no primário por
+REPLICA_PIN_SECONDS; enquanto isso as leituras dele não vão à réplica.
+
+O registro em memória é por processo e não chega aos outros workers. Por
+isso a escrita também devolve o fim da janela (epoch em segundos) no cookie
+PIN_COOKIE e no cabeçalho PIN_HEADER: navegadores mandam o cookie de volta,
+outros clientes repetem o cabeçalho, e qualquer worker roteia a leitura
+pelo valor recebido.
+"""
+
+import math
+import time
+from typing import Optional
+
+from fastapi import Request, Response
+
+from config.database import HAS_REPLICA
+from config.settings import PRINCIPAL_CACHE_SIZE, REPLICA_PIN_SECONDS
+from app.utils.ttl_cache import TTLCache
+
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+PIN_COOKIE = "primary_until"
+PIN_HEADER = "X-Primary-Until"
+
+# user_id -> True enquanto as leituras devem ir ao primário
+_pinned = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl_seconds=REPLICA_PIN_SECONDS)
+
+
+def pin_to_primary(user_id: int, response: Optional[Response] = None):
+    if not HAS_REPLICA:
+        return
+    _pinned.set(user_id, True)
+    if response is not None:
+        until = f"{time.time() + REPLICA_PIN_SECONDS:.3f}"
+        response.set_cookie(
+            PIN_COOKIE, until, max_age=math.ceil(REPLICA_PIN_SECONDS), httponly=True, samesite="lax"
+        )
+        response.headers[PIN_HEADER] = until
+
+
+def _pinned_by_client(request: Request) -> bool:
+    value = request.headers.get(PIN_HEADER) or request.cookies.get(PIN_COOKIE)
+    try:
+        until = float(value)
+    except (TypeError, ValueError):
+        return False
+    now = time.time()
+    # valores além da janela não foram emitidos por nós: ignorados
+    return now < until <= now + REPLICA_PIN_SECONDS
+
+
+def is_pinned_to_primary(user_id: int, request: Optional[Request] = None) -> bool:
+    if _pinned.get(user_id) is not None:
+        return True
+    return request is not None and _pinned_by_client(request)
@@ -1,39 +1,226 @@
 # app/utils/report_generator.py
 
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from datetime import date as date_cls, datetime
+from sqlalchemy import case, func, literal, null, select, true, union_all
+from sqlalchemy.orm import Session, aliased
+from app.models.baby_model import Baby
 from app.models.event_model import Event
+from app.models.daily_report_model import DailyReport
+from app.utils.db_helpers import dialect_insert, minutes_between
+from app.utils.etag import bump_baby_versions
+from app.utils.sleep_sessions import SLEEP_TYPES, closed_sessions_between
+
+# linhas por INSERT multi-linha (limite de parâmetros por instrução)
+UPSERT_CHUNK = 1000
 
 def generate_daily_summary(db: Session, baby_id: int, date: datetime.date):
+    """
+    Totais do dia a partir das sessões de sono materializadas: conta as
+    sessões fechadas que terminaram no dia (inclusive as que começaram na
+    véspera) e os eventos 'feed' do dia.
+    """
     # Define intervalo do dia (00:00 às 23:59)
     day_start = datetime.combine(date, datetime.min.time())
     day_end = datetime.combine(date, datetime.max.time())
 
-    events = db.query(Event).filter(
-        Event.baby_id == baby_id,
-        Event.timestamp >= day_start,
-        Event.timestamp <= day_end
-    ).order_by(Event.timestamp).all()
-
-    total_sleep = timedelta()
-    total_feeds = 0
-    longest_nap = timedelta()
-    last_sleep_start = None
-
-    for event in events:
-        if event.type == "sleep_start":
-            last_sleep_start = event.timestamp
-        elif event.type == "sleep_end" and last_sleep_start:
-            duration = event.timestamp - last_sleep_start
-            total_sleep += duration
-            if duration > longest_nap:
-                longest_nap = duration
-            last_sleep_start = None
-        elif event.type == "feed":
-            total_feeds += 1
+    sessions = closed_sessions_between(db, baby_id, day_start, day_end)
+    durations = [s.duration_minutes for s in sessions]
+
+    total_feeds = (
+        db.query(func.count(Event.id))
+        .filter(
+            Event.baby_id == baby_id,
+            Event.type == "feed",
+            Event.timestamp.between(day_start, day_end),
+        )
+        .scalar()
+    )
 
     return {
-        "total_sleep_minutes": int(total_sleep.total_seconds() / 60),
+        "total_sleep_minutes": sum(durations),
         "total_feeds": total_feeds,
-        "longest_nap_minutes": int(longest_nap.total_seconds() / 60),
+        "longest_nap_minutes": max(durations, default=0),
     }
+
+
+def _report_notes(summary: dict) -> str:
+    return (
+        f"Total de sono hoje: {summary['total_sleep_minutes']} minutos. "
+        f"Maior soneca: {summary['longest_nap_minutes']} minutos. "
+        f"Total de mamadas: {summary['total_feeds']}."
+    )
+
+
+def refresh_daily_report(db: Session, baby_id: int, date: datetime.date):
+    """
+    Recalcula o DailyReport de um único bebê/dia (leitura limitada ao dia,
+    via índice baby_id + timestamp) e grava na transação corrente.
+    Sem eventos no dia, o relatório é removido. Rode com o bebê travado
+    (event_sync.lock_babies), senão escritas simultâneas perdem eventos.
+    """
+    day_start = datetime.combine(date, datetime.min.time())
+    day_end = datetime.combine(date, datetime.max.time())
+
+    has_events = db.query(
+        db.query(Event.id)
+        .filter(Event.baby_id == baby_id, Event.timestamp.between(day_start, day_end))
+        .exists()
+    ).scalar()
+
+    if not has_events:
+        db.query(DailyReport).filter_by(baby_id=baby_id, date=date).delete(
+            synchronize_session=False
+        )
+        return None
+
+    summary = generate_daily_summary(db, baby_id, date)
+    stmt = _upsert_reports(db, [
+        {"baby_id": baby_id, "date": date, "notes": _report_notes(summary), **summary}
+    ])
+    return db.scalars(
+        stmt.returning(DailyReport), execution_options={"populate_existing": True}
+    ).one()
+
+
+def _upsert_reports(db: Session, rows):
+    """
+    INSERT ... ON CONFLICT (baby_id, date) DO UPDATE: uma instrução, sem
+    corrida entre duas gerações simultâneas do mesmo dia.
+    """
+    stmt = dialect_insert(db, DailyReport).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[DailyReport.baby_id, DailyReport.date],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("total_sleep_minutes", "longest_nap_minutes", "total_feeds", "notes")
+        },
+    )
+
+
+def aggregate_daily_reports(db: Session, start_date, end_date, baby_ids=None):
+    """
+    Recalcula os totais diários direto dos eventos, numa única consulta SQL,
+    para um intervalo de dias e um conjunto de bebês (None = todos).
+
+    Pareia o sono com LAG sobre os eventos sleep_start/sleep_end (mesma regra
+    de app/utils/sleep_sessions.py), incluindo o último evento de sono antes
+    do intervalo para não perder sonecas que cruzam a meia-noite. Retorna
+    {(baby_id, date): {total_sleep_minutes, total_feeds, longest_nap_minutes}}
+    com uma entrada para cada bebê/dia que tem algum evento.
+    """
+    range_start = datetime.combine(start_date, datetime.min.time())
+    range_end = datetime.combine(end_date, datetime.max.time())
+
+    def in_scope(column):
+        return column.in_(baby_ids) if baby_ids is not None else true()
+
+    # Último evento de sono de cada bebê antes do intervalo (um probe de índice por bebê)
+    e2 = aliased(Event)
+    boundary_id = (
+        select(e2.id)
+        .where(
+            e2.baby_id == Baby.id,
+            e2.type.in_(SLEEP_TYPES),
+            e2.timestamp < range_start,
+        )
+        .order_by(e2.timestamp.desc(), e2.id.desc())
+        .limit(1)
+        .correlate(Baby)
+        .scalar_subquery()
+    )
+    boundary_ids = select(boundary_id).where(in_scope(Baby.id))
+
+    sleep_columns = (Event.baby_id, Event.type, Event.timestamp, Event.id)
+    sleep_events = union_all(
+        select(*sleep_columns).where(
+            in_scope(Event.baby_id),
+            Event.type.in_(SLEEP_TYPES),
+            Event.timestamp.between(range_start, range_end),
+        ),
+        select(*sleep_columns).where(Event.id.in_(boundary_ids)),
+    ).subquery("sleep_events")
+    ordering = dict(
+        partition_by=sleep_events.c.baby_id,
+        order_by=(sleep_events.c.timestamp, sleep_events.c.id),
+    )
+    paired = select(
+        sleep_events.c.baby_id,
+        sleep_events.c.type,
+        sleep_events.c.timestamp,
+        func.lag(sleep_events.c.type).over(**ordering).label("prev_type"),
+        func.lag(sleep_events.c.timestamp).over(**ordering).label("prev_ts"),
+    ).subquery("paired")
+
+    # Cada soneca contribui com sua duração; cada evento do dia garante a linha do dia
+    nap_minutes = minutes_between(db, paired.c.prev_ts, paired.c.timestamp)
+    naps = select(
+        paired.c.baby_id.label("baby_id"),
+        func.date(paired.c.timestamp).label("day"),
+        nap_minutes.label("sleep"),
+        literal(0).label("feed"),
+    ).where(
+        paired.c.type == "sleep_end",
+        paired.c.prev_type == "sleep_start",
+        paired.c.timestamp.between(range_start, range_end),
+    )
+    day_events = select(
+        Event.baby_id.label("baby_id"),
+        func.date(Event.timestamp).label("day"),
+        null().label("sleep"),
+        case((Event.type == "feed", 1), else_=0).label("feed"),
+    ).where(
+        in_scope(Event.baby_id),
+        Event.timestamp.between(range_start, range_end),
+    )
+    contributions = union_all(naps, day_events).subquery("contributions")
+
+    rows = db.execute(
+        select(
+            contributions.c.baby_id,
+            contributions.c.day,
+            func.coalesce(func.sum(contributions.c.sleep), 0).label("total_sleep_minutes"),
+            func.coalesce(func.max(contributions.c.sleep), 0).label("longest_nap_minutes"),
+            func.sum(contributions.c.feed).label("total_feeds"),
+        ).group_by(contributions.c.baby_id, contributions.c.day)
+    )
+
+    summaries = {}
+    for row in rows:
+        day = row.day if not isinstance(row.day, str) else date_cls.fromisoformat(row.day)
+        summaries[(row.baby_id, day)] = {
+            "total_sleep_minutes": int(row.total_sleep_minutes),
+            "total_feeds": int(row.total_feeds),
+            "longest_nap_minutes": int(row.longest_nap_minutes),
+        }
+    return summaries
+
+
+def rebuild_daily_reports(db: Session, start_date, end_date, baby_ids) -> int:
+    """
+    Substitui os DailyReport dos bebês/dias informados pelos totais de
+    aggregate_daily_reports: upsert multi-linha dos dias com eventos e
+    DELETE dos que ficaram sem. Retorna o número de relatórios gravados.
+    """
+    summaries = aggregate_daily_reports(db, start_date, end_date, baby_ids)
+
+    stale_ids = [
+        row.id
+        for row in db.query(DailyReport.id, DailyReport.baby_id, DailyReport.date).filter(
+            DailyReport.baby_id.in_(baby_ids),
+            DailyReport.date.between(start_date, end_date),
+        )
+        if (row.baby_id, row.date) not in summaries
+    ]
+    if stale_ids:
+        db.query(DailyReport).filter(DailyReport.id.in_(stale_ids)).delete(
+            synchronize_session=False
+        )
+
+    rows = [
+        {"baby_id": baby_id, "date": day, "notes": _report_notes(summary), **summary}
+        for (baby_id, day), summary in summaries.items()
+    ]
+    for offset in range(0, len(rows), UPSERT_CHUNK):
+        db.execute(_upsert_reports(db, rows[offset:offset + UPSERT_CHUNK]))
+    bump_baby_versions(db, baby_ids, owners=False)
+    return len(summaries)
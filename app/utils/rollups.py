@@ -0,0 +1,106 @@
+# app/utils/rollups.py
+"""
+Contadores de eventos para as consultas de admin (app/models/rollup_model.py).
+
+refresh_event_rollups recontra os (usuário, dia) afetados por uma escrita,
+na mesma transação, como os relatórios diários; rebuild_event_rollups
+refaz tudo a partir de events (backfill / reparo).
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.event_model import Event
+from app.models.rollup_model import UserDayEventCount, UserEventCount
+from app.utils.db_helpers import dialect_insert
+
+
+def refresh_event_rollups(db: Session, user_days: Iterable[Tuple[int, date]]):
+    """
+    Recalcula os contadores dos (user_id, dia) informados. Precisa rodar
+    depois de travar a linha do usuário (bump de data_version em
+    apply_event_changes): escritas concorrentes do mesmo usuário ficam em
+    série e cada recontagem enxerga a anterior já commitada.
+    """
+    deltas = {}
+    for user_id, day in sorted(set(user_days)):
+        day_start = datetime.combine(day, datetime.min.time())
+        counts = dict(
+            db.query(Event.type, func.count(Event.id))
+            .filter(
+                Event.user_id == user_id,
+                Event.timestamp >= day_start,
+                Event.timestamp < day_start + timedelta(days=1),
+            )
+            .group_by(Event.type)
+            .all()
+        )
+        old = dict(
+            db.query(UserDayEventCount.type, UserDayEventCount.event_count)
+            .filter_by(user_id=user_id, day=day)
+            .all()
+        )
+        if counts == old:
+            continue
+
+        gone = old.keys() - counts.keys()
+        if gone:
+            db.query(UserDayEventCount).filter(
+                UserDayEventCount.user_id == user_id,
+                UserDayEventCount.day == day,
+                UserDayEventCount.type.in_(gone),
+            ).delete(synchronize_session=False)
+        if counts:
+            stmt = dialect_insert(db, UserDayEventCount).values([
+                {"user_id": user_id, "day": day, "type": type_, "event_count": n}
+                for type_, n in counts.items()
+            ])
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["user_id", "day", "type"],
+                set_={"event_count": stmt.excluded.event_count},
+            ))
+        deltas[user_id] = deltas.get(user_id, 0) + sum(counts.values()) - sum(old.values())
+
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        stmt = dialect_insert(db, UserEventCount).values(user_id=user_id, event_count=delta)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"event_count": UserEventCount.event_count + delta},
+        ))
+
+
+def rebuild_event_rollups(db: Session, user_ids: List[int]) -> int:
+    """
+    Recria os contadores dos usuários informados com INSERT ... SELECT
+    agrupado sobre events. Retorna o número de linhas (usuário, dia, tipo).
+    """
+    db.query(UserDayEventCount).filter(UserDayEventCount.user_id.in_(user_ids)).delete(
+        synchronize_session=False
+    )
+    db.query(UserEventCount).filter(UserEventCount.user_id.in_(user_ids)).delete(
+        synchronize_session=False
+    )
+
+    day = func.date(Event.timestamp)
+    rows = db.execute(
+        UserDayEventCount.__table__.insert().from_select(
+            ["user_id", "day", "type", "event_count"],
+            select(Event.user_id, day, Event.type, func.count(Event.id))
+            .where(Event.user_id.in_(user_ids))
+            .group_by(Event.user_id, day, Event.type),
+        )
+    ).rowcount
+    db.execute(
+        UserEventCount.__table__.insert().from_select(
+            ["user_id", "event_count"],
+            select(UserDayEventCount.user_id, func.sum(UserDayEventCount.event_count))
+            .where(UserDayEventCount.user_id.in_(user_ids))
+            .group_by(UserDayEventCount.user_id),
+        )
+    )
+    return rows
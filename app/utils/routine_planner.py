@@ -0,0 +1,308 @@
+# app/utils/routine_planner.py
+"""
+Cálculo e persistência do plano de rotina (sonecas e mamadas do dia).
+
+Usado pela rota POST /plan/routine/generate e pelo agendador em background
+(app/workers/plan_scheduler.py), que mantém o plano atualizado para que
+GET /plan/today seja só uma leitura.
+"""
+
+from datetime import datetime, timedelta, date, timezone
+from statistics import mean
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.sleep_plan_model import RoutinePlan
+from app.models.event_model import Event
+from app.models.baby_model import Baby
+from app.models.sleep_session_model import SleepSession
+from app.utils.db_helpers import dialect_insert
+from app.utils.etag import bump_baby_versions
+from app.utils.sleep_sessions import CLOSED
+from app.utils.wake_window_calculator import get_wake_window_minutes
+
+# Versão do formato gravado em RoutinePlan.routine
+ROUTINE_FORMAT_VERSION = 1
+
+
+def ensure_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+def _get_historical_naps(
+    baby_id: int,
+    db: Session,
+    days_back: int = 3
+) -> List[Dict[str, datetime]]:
+    """
+    Busca as sessões de sono fechadas iniciadas nos últimos 'days_back' dias
+    e retorna pares de início/fim de soneca para cálculo de duração média.
+    """
+    cutoff = datetime.now() - timedelta(days=days_back)
+    sessions = (
+        db.query(SleepSession.start_at, SleepSession.end_at)
+        .filter(
+            SleepSession.baby_id == baby_id,
+            SleepSession.status == CLOSED,
+            SleepSession.start_at >= cutoff,
+        )
+        .order_by(SleepSession.start_at.asc())
+        .all()
+    )
+
+    return [{"start": s.start_at, "end": s.end_at} for s in sessions]
+
+
+def _average_nap_duration(naps: List[Dict[str, datetime]], age_days: int) -> int:
+    """
+    Retorna a duração média em minutos. Se não houver histórico, usa uma estimativa baseada na idade.
+    """
+    if naps and len(naps) >= 2:
+        durations = [(nap["end"] - nap["start"]).seconds // 60 for nap in naps]
+        return int(mean(durations)) if durations else _nap_duration_fallback(age_days)
+    return _nap_duration_fallback(age_days)
+
+
+
+def _determine_naps_per_day(age_days: int) -> int:
+    """
+    Define quantas sonecas esperar em um dia, com base nas horas totais de sono diárias recomendadas.
+    """
+    if age_days <= 90:  # Recém-nascido (0–3 meses)
+        return 6  # Vários ciclos curtos (~2–3h) ao longo do dia
+    elif age_days <= 180:  # 3–6 meses
+        return 4
+    elif age_days <= 270:  # 6–9 meses
+        return 3
+    elif age_days <= 365:  # 9–12 meses
+        return 2
+    elif age_days <= 730:  # 1–2 anos
+        return 1
+    else:  # >2 anos
+        return 1
+
+    
+
+def _nap_duration_fallback(age_days: int) -> int:
+    """
+    Duração estimada de cada soneca, baseada na quantidade de sono diário dividido pelo número de sonecas.
+    """
+    if age_days <= 90:
+        return 90  # 6 sonecas de ~1h30
+    elif age_days <= 180:
+        return 90  # 4 sonecas de ~1h30
+    elif age_days <= 270:
+        return 90  # 3 sonecas de ~1h30
+    elif age_days <= 365:
+        return 90  # 2 sonecas de ~1h30
+    elif age_days <= 730:
+        return 120  # 1 soneca de 2h
+    else:
+        return 90  # >2 anos: 1 soneca de ~1h30
+
+
+
+
+def _build_daily_routine(
+    baby_id: int,
+    last_sleep_end: datetime,
+    avg_nap_minutes: int,
+    current_date: date,
+    naps_count: int,
+    age_days: int,  
+) -> Dict[str, Any]:
+    """
+    Gera o plano de rotina...
+    """
+
+    wake_minutes = get_wake_window_minutes(age_days)
+
+    naps_list: List[Dict[str, datetime]] = []
+    feeds_list: List[datetime] = []
+
+    # Corrige timezone
+    now_dt = datetime.now(timezone.utc)
+    last_sleep_end = last_sleep_end.astimezone(timezone.utc)
+
+    tentative_first_start = last_sleep_end + timedelta(minutes=wake_minutes)
+
+    if tentative_first_start < now_dt:
+        tentative_first_start = now_dt + timedelta(minutes=15)
+
+    first_start = tentative_first_start
+
+    nap_start = first_start
+    for i in range(naps_count):
+        nap_end = nap_start + timedelta(minutes=avg_nap_minutes)
+        feed_time = nap_end + timedelta(minutes=15)
+
+        naps_list.append({"start": nap_start, "end": nap_end})
+        feeds_list.append(feed_time)
+
+        nap_start = nap_end + timedelta(minutes=wake_minutes)
+
+    return {
+        "baby_id": baby_id,
+        "date": naps_list[0]["start"].date(),
+        "naps": naps_list,
+        "feeds": feeds_list,
+        # entradas usadas, gravadas junto com o plano para reproduzi-lo
+        "inputs": {
+            "last_sleep_end": last_sleep_end,
+            "avg_nap_minutes": avg_nap_minutes,
+            "wake_window_minutes": wake_minutes,
+            "naps_count": naps_count,
+            "age_days": age_days,
+        },
+    }
+
+
+def compute_routine(db: Session, baby: Baby) -> Optional[Dict[str, Any]]:
+    """
+    Gera o plano de rotina completo para o dia atual, sem gravar nada.
+    Usa os últimos eventos + histórico de 3 dias para estimar duração média
+    de soneca, quantidade de naps e wake-window pela idade.
+    Retorna None se o bebê ainda não tem eventos de sono.
+    """
+    last_sleep_event: Event = (
+        db.query(Event)
+        .filter(
+            Event.baby_id == baby.id,
+            Event.type.in_(["sleep_start", "sleep_end"])
+        )
+        .order_by(Event.timestamp.desc())
+        .first()
+    )
+    if not last_sleep_event:
+        return None
+
+    # ------------------ histórico e métricas ------------------
+    historical_naps = _get_historical_naps(baby.id, db, days_back=3)
+    age_in_days     = (date.today() - baby.birth_date).days
+    avg_nap_minutes = _average_nap_duration(historical_naps, age_in_days)
+    naps_count      = _determine_naps_per_day(age_in_days)
+
+    # ------------------ ponto de partida ------------------
+    if last_sleep_event.type == "sleep_start":
+        # ainda dormindo → estimar fim
+        last_sleep_end_dt = last_sleep_event.timestamp + timedelta(
+            minutes=avg_nap_minutes
+        )
+    else:
+        # já acordou
+        last_sleep_end_dt = last_sleep_event.timestamp
+
+    # ------------------ gerar rotina ------------------
+    return _build_daily_routine(
+        baby_id=baby.id,
+        last_sleep_end=last_sleep_end_dt,
+        avg_nap_minutes=avg_nap_minutes,
+        current_date=date.today(),
+        naps_count=naps_count,
+        age_days=age_in_days,            # wake-window correto
+    )
+
+
+def encode_routine(routine: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Representação compacta da rotina: horários como offsets em segundos
+    a partir do início da primeira soneca (epoch UTC em "base").
+    """
+    base = routine["naps"][0]["start"]
+
+    def offset(dt: datetime) -> int:
+        return int((dt - base).total_seconds())
+
+    inputs = dict(routine["inputs"])
+    inputs["last_sleep_end"] = int(inputs["last_sleep_end"].timestamp())
+    return {
+        "v": ROUTINE_FORMAT_VERSION,
+        "base": int(base.timestamp()),
+        "naps": [[offset(nap["start"]), offset(nap["end"])] for nap in routine["naps"]],
+        "feeds": [offset(feed) for feed in routine["feeds"]],
+        "inputs": inputs,
+    }
+
+
+def decode_routine(data: Dict[str, Any]) -> Dict[str, List]:
+    if data.get("v") != ROUTINE_FORMAT_VERSION:
+        raise ValueError(f"Formato de rotina desconhecido: {data.get('v')!r}")
+    base = datetime.fromtimestamp(data["base"], tz=timezone.utc)
+    return {
+        "naps": [
+            {"start": base + timedelta(seconds=start), "end": base + timedelta(seconds=end)}
+            for start, end in data["naps"]
+        ],
+        "feeds": [base + timedelta(seconds=feed) for feed in data["feeds"]],
+    }
+
+
+def plan_routine(plan: RoutinePlan) -> Dict[str, List]:
+    """Sonecas e mamadas gravadas; planos antigos só têm a primeira soneca."""
+    if plan.routine and plan.routine_version == ROUTINE_FORMAT_VERSION:
+        return decode_routine(plan.routine)
+    return {
+        "naps": [{"start": ensure_utc(plan.nap_start), "end": ensure_utc(plan.nap_end)}],
+        "feeds": [plan.feed_time],
+    }
+
+
+def plan_date() -> date:
+    """
+    Dia (UTC) do plano pedido agora. O plano fica gravado nesse dia mesmo
+    quando a primeira soneca cai no dia seguinte (à noite): assim o plano
+    recalculado substitui o que expirou, em vez de ir para a linha de amanhã.
+    """
+    return datetime.now(timezone.utc).date()
+
+
+def save_routine_plan(db: Session, routine: Dict[str, Any]) -> RoutinePlan:
+    """
+    Persiste a rotina completa (na transação corrente) com um único
+    INSERT ... ON CONFLICT (baby_id, date) DO UPDATE: duas gerações
+    simultâneas do mesmo dia terminam numa linha só.
+    """
+    first_nap  = routine["naps"][0]
+    first_feed = routine["feeds"][0]
+
+    # primeira soneca/mamada continuam em colunas próprias (varredura de expiração)
+    values = {
+        "nap_start": first_nap["start"],
+        "nap_end": first_nap["end"],
+        "feed_time": first_feed,
+        "routine": encode_routine(routine),
+        "routine_version": ROUTINE_FORMAT_VERSION,
+    }
+    stmt = dialect_insert(db, RoutinePlan).values(
+        baby_id=routine["baby_id"], date=plan_date(), **values
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RoutinePlan.baby_id, RoutinePlan.date],
+        set_={column: stmt.excluded[column] for column in values},
+    )
+    plan = db.scalars(
+        stmt.returning(RoutinePlan), execution_options={"populate_existing": True}
+    ).one()
+    bump_baby_versions(db, [routine["baby_id"]], owners=False)
+    return plan
+
+
+def regenerate_plan(db: Session, baby_id: int) -> Optional[RoutinePlan]:
+    """Recalcula e grava o plano de um bebê; usado pelo agendador."""
+    baby = db.query(Baby).filter_by(id=baby_id).first()
+    if baby is None:
+        return None
+    routine = compute_routine(db, baby)
+    if routine is None:
+        return None
+    plan = save_routine_plan(db, routine)
+    db.commit()
+    return plan
+
+
+def plan_is_expired(plan: RoutinePlan, now: datetime = None) -> bool:
+    """O plano vale até o fim da soneca sugerida."""
+    now = now or datetime.now(timezone.utc)
+    return plan.nap_end is None or ensure_utc(plan.nap_end) <= now
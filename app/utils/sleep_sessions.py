@@ -0,0 +1,205 @@
+# app/utils/sleep_sessions.py
+"""
+Pareamento de eventos de sono em sessões (tabela sleep_sessions).
+
+Regra única de pareamento, a mesma dos antigos loops em Python: percorrendo
+os eventos de sono de um bebê em ordem (timestamp, id), um sleep_end fecha
+a sessão se o evento de sono imediatamente anterior for um sleep_start.
+Consequência útil: logo após qualquer sleep_end o estado é "acordado", então
+uma mudança só afeta o trecho entre o último sleep_end antes dela e o
+primeiro sleep_end depois dela.
+"""
+
+from datetime import date, datetime
+from typing import Iterable, List, Set
+
+from sqlalchemy import and_, func, literal, null, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.event_model import Event
+from app.models.sleep_session_model import SleepSession
+from app.utils.db_helpers import minutes_between
+
+SLEEP_TYPES = ("sleep_start", "sleep_end")
+
+CLOSED = "closed"
+OPEN = "open"
+ORPHAN_START = "orphan_start"
+ORPHAN_END = "orphan_end"
+
+
+def duration_minutes(start: datetime, end: datetime) -> int:
+    return int((end - start).total_seconds() / 60)
+
+
+def pair_sleep_events(events: Iterable, stream_ends_here: bool = True) -> List[dict]:
+    """
+    Pareia eventos de sono já ordenados por (timestamp, id).
+    `stream_ends_here` indica que não há eventos de sono depois destes; só
+    então um sleep_start final é uma sessão "open".
+    """
+    sessions = []
+    current = None
+    for ev in events:
+        if ev.type == "sleep_start":
+            if current is not None:
+                sessions.append(_session(current, None, ORPHAN_START))
+            current = ev
+        elif ev.type == "sleep_end":
+            if current is not None:
+                sessions.append(_session(current, ev, CLOSED))
+                current = None
+            else:
+                sessions.append(_session(None, ev, ORPHAN_END))
+
+    if current is not None:
+        sessions.append(_session(current, None, OPEN if stream_ends_here else ORPHAN_START))
+    return sessions
+
+
+def _session(start, end, status) -> dict:
+    return {
+        "start_event_id": start.id if start else None,
+        "end_event_id": end.id if end else None,
+        "start_at": start.timestamp if start else None,
+        "end_at": end.timestamp if end else None,
+        "duration_minutes": (
+            duration_minutes(start.timestamp, end.timestamp) if start and end else None
+        ),
+        "status": status,
+    }
+
+
+def _after(ts_col, id_col, anchor):
+    return or_(ts_col > anchor.timestamp, and_(ts_col == anchor.timestamp, id_col > anchor.id))
+
+
+def _until(ts_col, id_col, limit):
+    return or_(ts_col < limit.timestamp, and_(ts_col == limit.timestamp, id_col <= limit.id))
+
+
+def resync_sleep_sessions(db: Session, baby_id: int, t_min: datetime, t_max: datetime) -> Set[date]:
+    """
+    Refaz as sessões afetadas por eventos de sono alterados entre t_min e
+    t_max (inclua os timestamps antigos de eventos movidos/excluídos).
+    Retorna os dias cujos totais de sono podem ter mudado.
+    """
+    sleep_events = db.query(Event.id, Event.timestamp).filter(
+        Event.baby_id == baby_id, Event.type == "sleep_end"
+    )
+    anchor = (
+        sleep_events.filter(Event.timestamp < t_min)
+        .order_by(Event.timestamp.desc(), Event.id.desc())
+        .first()
+    )
+    limit = (
+        sleep_events.filter(Event.timestamp > t_max)
+        .order_by(Event.timestamp.asc(), Event.id.asc())
+        .first()
+    )
+
+    window = db.query(Event.id, Event.type, Event.timestamp).filter(
+        Event.baby_id == baby_id, Event.type.in_(SLEEP_TYPES)
+    )
+    stale = db.query(SleepSession).filter(SleepSession.baby_id == baby_id)
+    if anchor:
+        window = window.filter(_after(Event.timestamp, Event.id, anchor))
+        stale = stale.filter(or_(
+            _after(SleepSession.start_at, SleepSession.start_event_id, anchor),
+            _after(SleepSession.end_at, SleepSession.end_event_id, anchor),
+        ))
+    if limit:
+        window = window.filter(_until(Event.timestamp, Event.id, limit))
+        stale = stale.filter(or_(
+            _until(SleepSession.start_at, SleepSession.start_event_id, limit),
+            and_(SleepSession.start_at.is_(None),
+                 _until(SleepSession.end_at, SleepSession.end_event_id, limit)),
+        ))
+
+    touched_days = set()
+    stale_ids = []
+    for old in stale.with_entities(SleepSession.id, SleepSession.status, SleepSession.end_at):
+        stale_ids.append(old.id)
+        if old.status == CLOSED:
+            touched_days.add(old.end_at.date())
+    if stale_ids:
+        db.query(SleepSession).filter(SleepSession.id.in_(stale_ids)).delete(
+            synchronize_session=False
+        )
+
+    events = window.order_by(Event.timestamp, Event.id).all()
+    new_sessions = pair_sleep_events(events, stream_ends_here=limit is None)
+    for values in new_sessions:
+        if values["status"] == CLOSED:
+            touched_days.add(values["end_at"].date())
+    if new_sessions:
+        db.execute(
+            SleepSession.__table__.insert(),
+            [{"baby_id": baby_id, **values} for values in new_sessions],
+        )
+    return touched_days
+
+
+def rebuild_sleep_sessions(db: Session, baby_ids: List[int]) -> int:
+    """
+    Recria do zero as sessões dos bebês informados com uma única instrução
+    INSERT ... SELECT (LAG/LEAD sobre os eventos de sono). Usado em backfill.
+    """
+    db.query(SleepSession).filter(SleepSession.baby_id.in_(baby_ids)).delete(
+        synchronize_session=False
+    )
+
+    ordering = dict(partition_by=Event.baby_id, order_by=(Event.timestamp, Event.id))
+    ev = (
+        select(
+            Event.id, Event.baby_id, Event.type, Event.timestamp,
+            func.lag(Event.type).over(**ordering).label("prev_type"),
+            func.lag(Event.id).over(**ordering).label("prev_id"),
+            func.lag(Event.timestamp).over(**ordering).label("prev_ts"),
+            func.lead(Event.type).over(**ordering).label("next_type"),
+        )
+        .where(Event.baby_id.in_(baby_ids), Event.type.in_(SLEEP_TYPES))
+        .cte("ev")
+    )
+
+    closed = select(
+        ev.c.baby_id, ev.c.prev_id, ev.c.id, ev.c.prev_ts, ev.c.timestamp,
+        minutes_between(db, ev.c.prev_ts, ev.c.timestamp), literal(CLOSED),
+    ).where(ev.c.type == "sleep_end", ev.c.prev_type == "sleep_start")
+
+    orphan_end = select(
+        ev.c.baby_id, null(), ev.c.id, null(), ev.c.timestamp,
+        null(), literal(ORPHAN_END),
+    ).where(ev.c.type == "sleep_end", or_(ev.c.prev_type.is_(None), ev.c.prev_type == "sleep_end"))
+
+    starts = select(
+        ev.c.baby_id, ev.c.id, null(), ev.c.timestamp, null(),
+        null(), literal(ORPHAN_START),
+    ).where(ev.c.type == "sleep_start", ev.c.next_type == "sleep_start")
+
+    open_ = select(
+        ev.c.baby_id, ev.c.id, null(), ev.c.timestamp, null(),
+        null(), literal(OPEN),
+    ).where(ev.c.type == "sleep_start", ev.c.next_type.is_(None))
+
+    stmt = SleepSession.__table__.insert().from_select(
+        ["baby_id", "start_event_id", "end_event_id", "start_at", "end_at",
+         "duration_minutes", "status"],
+        union_all(closed, orphan_end, starts, open_),
+    )
+    return db.execute(stmt).rowcount
+
+
+def closed_sessions_between(db: Session, baby_id: int, start: datetime, end: datetime):
+    """Sessões fechadas que terminaram no intervalo [start, end]."""
+    return (
+        db.query(SleepSession)
+        .filter(
+            SleepSession.baby_id == baby_id,
+            SleepSession.status == CLOSED,
+            SleepSession.end_at.between(start, end),
+        )
+        .order_by(SleepSession.end_at)
+        .all()
+    )
+
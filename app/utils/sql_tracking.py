@@ -0,0 +1,65 @@
+# app/utils/sql_tracking.py
+"""
+Contagem e tempo dos comandos SQL por requisição.
+
+O middleware de métricas abre um SQLStats num ContextVar; os eventos de
+Engine abaixo (registrados na classe, valem para os engines sync, async e
+réplica) somam nele cada comando executado. Rotas síncronas também entram:
+o threadpool do Starlette copia o contexto para a thread.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class SQLStats:
+    count: int = 0
+    seconds: float = 0.0
+    # (sql, segundos); só preenchido quando alguém pede (ex.: profiling)
+    statements: Optional[List[Tuple[str, float]]] = None
+    # contagem aninhada (profiling dentro das métricas) soma nos dois
+    parent: Optional["SQLStats"] = None
+
+
+_current: ContextVar[Optional[SQLStats]] = ContextVar("request_sql", default=None)
+
+
+def start_tracking(record_statements: bool = False):
+    """Começa a contar no contexto atual; devolve (stats, token p/ stop_tracking)."""
+    stats = SQLStats(statements=[] if record_statements else None, parent=_current.get())
+    return stats, _current.set(stats)
+
+
+def stop_tracking(token):
+    _current.reset(token)
+
+
+def current_stats() -> Optional[SQLStats]:
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        context._sql_tracking_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_sql_tracking_started", None)
+    if stats is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    while stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        if stats.statements is not None:
+            stats.statements.append((statement, elapsed))
+        stats = stats.parent
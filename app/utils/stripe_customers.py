@@ -0,0 +1,41 @@
+# app/utils/stripe_customers.py
+import stripe
+from sqlalchemy.orm import Session
+
+from app.models.auth_models import User
+from app.dependencies.auth import invalidate_principal
+
+CREATE_CUSTOMER_TOPIC = "stripe.create_customer"
+DELETE_CUSTOMER_TOPIC = "stripe.delete_customer"
+
+
+def provision_stripe_customer(db: Session, payload: dict):
+    """
+    Handler da outbox: cria o customer no Stripe e grava o id no usuário.
+    A idempotency key por usuário torna seguro repetir após falha/crash.
+    """
+    user_id = payload["user_id"]
+    user = db.query(User).filter_by(id=user_id).first()
+    if user is None or user.deleted_at or user.stripe_customer_id:
+        return  # conta removida (ou em exclusão) ou já provisionada
+
+    customer = stripe.Customer.create(
+        email=user.email,
+        metadata={"app": "nanafacil", "user_email": user.email},
+        idempotency_key=f"nanafacil-customer-user-{user_id}",
+    )
+    user.stripe_customer_id = customer.id
+    db.flush()
+    invalidate_principal(user_id)
+
+
+def delete_stripe_customer(db: Session, payload: dict):
+    """
+    Handler da outbox: remove o customer (e as assinaturas dele) do Stripe
+    quando a conta é excluída. Customer já inexistente conta como feito.
+    """
+    try:
+        stripe.Customer.delete(payload["stripe_customer_id"])
+    except stripe.error.InvalidRequestError as exc:
+        if getattr(exc, "code", None) != "resource_missing":
+            raise
@@ -0,0 +1,74 @@
+# app/utils/subscriptions.py
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.subscription_model import Subscription
+from app.utils.db_helpers import dialect_insert
+
+# Mesmo critério da antiga consulta ao Stripe (status="active")
+ACTIVE_STATUSES = ("active",)
+
+SUBSCRIPTION_EVENTS = (
+    "customer.subscription.created",
+    "customer.subscription.updated",
+    "customer.subscription.deleted",
+    "customer.subscription.paused",
+    "customer.subscription.resumed",
+)
+
+
+def _period_end(sub) -> Optional[datetime]:
+    # Versões recentes da API movem current_period_end para os itens
+    epoch = sub.get("current_period_end")
+    if epoch is None:
+        items = (sub.get("items") or {}).get("data") or []
+        epoch = items[0].get("current_period_end") if items else None
+    return datetime.utcfromtimestamp(epoch) if epoch else None
+
+
+def upsert_subscription(db: Session, sub, event_created: int):
+    """
+    Grava o estado de uma assinatura Stripe (objeto ou dict) numa única
+    instrução, ignorando eventos mais antigos do que o último aplicado.
+    """
+    values = {
+        "stripe_customer_id": sub["customer"],
+        "stripe_subscription_id": sub["id"],
+        "status": sub["status"],
+        "current_period_end": _period_end(sub),
+        "stripe_event_created": event_created,
+    }
+    stmt = dialect_insert(db, Subscription).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Subscription.stripe_subscription_id],
+        set_={
+            "status": stmt.excluded.status,
+            "current_period_end": stmt.excluded.current_period_end,
+            "stripe_event_created": stmt.excluded.stripe_event_created,
+            "updated_at": datetime.utcnow(),
+        },
+        where=Subscription.stripe_event_created <= stmt.excluded.stripe_event_created,
+    )
+    db.execute(stmt)
+
+
+def has_active_subscription(db: Session, stripe_customer_id: Optional[str]) -> bool:
+    """Alguma assinatura ativa do customer (como a antiga consulta ao Stripe)."""
+    if not stripe_customer_id:
+        return False
+    active = (
+        db.query(Subscription.id)
+        .filter(
+            Subscription.stripe_customer_id == stripe_customer_id,
+            Subscription.status.in_(ACTIVE_STATUSES),
+            or_(
+                Subscription.current_period_end.is_(None),
+                Subscription.current_period_end > datetime.utcnow(),
+            ),
+        )
+        .first()
+    )
+    return active is not None
@@ -0,0 +1,71 @@
+# app/workers/outbox_worker.py
+"""
+Consome a outbox em background.
+
+Roda como thread dentro da API (OUTBOX_WORKER_ENABLED) ou isolado:
+    python -m app.workers.outbox_worker
+"""
+
+import logging
+import threading
+
+from config.database import SessionLocal
+from config.settings import OUTBOX_POLL_SECONDS
+from app.utils.outbox import process_next
+from app.utils.deletion import DELETION_TOPIC, process_deletion_batch
+from app.utils.stripe_customers import (
+    CREATE_CUSTOMER_TOPIC,
+    DELETE_CUSTOMER_TOPIC,
+    delete_stripe_customer,
+    provision_stripe_customer,
+)
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {
+    CREATE_CUSTOMER_TOPIC: provision_stripe_customer,
+    DELETE_CUSTOMER_TOPIC: delete_stripe_customer,
+    DELETION_TOPIC: process_deletion_batch,
+}
+
+
+class OutboxWorker:
+    def __init__(self, poll_seconds: float = OUTBOX_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread = None
+
+    def drain(self) -> int:
+        """Processa tudo o que estiver disponível agora."""
+        processed = 0
+        db = SessionLocal()
+        try:
+            while not self._stop.is_set() and process_next(db, HANDLERS):
+                processed += 1
+        finally:
+            db.close()
+        return processed
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("Falha ao processar a outbox")
+            self._stop.wait(self.poll_seconds)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="outbox-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+
+if __name__ == "__main__":
+    import main  # noqa: F401 (registra os mappers e configura o Stripe)
+
+    logging.basicConfig(level=logging.INFO)
+    OutboxWorker().run()
@@ -0,0 +1,138 @@
+# app/workers/plan_scheduler.py
+"""
+Recalcula planos de rotina fora do caminho da requisição.
+
+- Eventos de sono gravados pedem o recálculo do plano do bebê; o pedido só
+  é enfileirado depois do commit (request_plan_refresh + after_commit).
+- Rajadas de eventos do mesmo bebê são agrupadas (debounce), com um atraso
+  máximo para que uploads contínuos não adiem o plano para sempre.
+- Uma varredura periódica agenda os planos de hoje que já expiraram.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config.database import SessionLocal
+from config.settings import PLAN_DEBOUNCE_SECONDS, PLAN_MAX_DELAY_SECONDS, PLAN_SWEEP_SECONDS
+from app.models.sleep_plan_model import RoutinePlan
+from app.utils.routine_planner import plan_date, regenerate_plan
+
+logger = logging.getLogger(__name__)
+
+SWEEP_BATCH = 1000
+
+
+class PlanScheduler:
+    def __init__(
+        self,
+        debounce_seconds: float = PLAN_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = PLAN_MAX_DELAY_SECONDS,
+        sweep_seconds: float = PLAN_SWEEP_SECONDS,
+    ):
+        self.debounce = debounce_seconds
+        self.max_delay = max_delay_seconds
+        self.sweep_every = sweep_seconds
+        self._pending = {}  # baby_id -> (primeiro pedido, vencimento)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def schedule(self, baby_ids: Iterable[int]):
+        now = time.monotonic()
+        with self._lock:
+            for baby_id in baby_ids:
+                first, _ = self._pending.get(baby_id, (now, None))
+                due = min(now + self.debounce, first + self.max_delay)
+                self._pending[baby_id] = (first, due)
+        self._wakeup.set()
+
+    def _take_due(self):
+        now = time.monotonic()
+        with self._lock:
+            due = [b for b, (_, at) in self._pending.items() if at <= now]
+            for baby_id in due:
+                del self._pending[baby_id]
+            next_at = min((at for _, at in self._pending.values()), default=None)
+        return due, next_at
+
+    def run_due(self):
+        due, next_at = self._take_due()
+        for baby_id in due:
+            db = SessionLocal()
+            try:
+                regenerate_plan(db, baby_id)
+            except Exception:
+                db.rollback()
+                logger.exception("Falha ao recalcular o plano do bebê %s", baby_id)
+            finally:
+                db.close()
+        return next_at
+
+    def sweep_expired(self):
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(RoutinePlan.baby_id)
+                .filter(RoutinePlan.date == plan_date(), RoutinePlan.nap_end <= datetime.utcnow())
+                .limit(SWEEP_BATCH)
+                .all()
+            )
+        finally:
+            db.close()
+        if rows:
+            self.schedule(row.baby_id for row in rows)
+
+    def run(self):
+        next_sweep = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() >= next_sweep:
+                    self.sweep_expired()
+                    next_sweep = time.monotonic() + self.sweep_every
+                next_at = self.run_due()
+            except Exception:
+                logger.exception("Falha no agendador de planos")
+                next_at = None
+
+            wait = next_sweep - time.monotonic()
+            if next_at is not None:
+                wait = min(wait, next_at - time.monotonic())
+            self._wakeup.wait(max(wait, 0.05))
+            self._wakeup.clear()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="plan-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+
+plan_scheduler = PlanScheduler()
+
+
+def request_plan_refresh(db: Session, baby_ids: Iterable[int]):
+    """Pede o recálculo dos planos quando (e se) a transação for confirmada."""
+    db.info.setdefault("plan_refresh", set()).update(baby_ids)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _schedule_after_commit(session):
+    baby_ids = session.info.pop("plan_refresh", None)
+    if baby_ids:
+        plan_scheduler.schedule(baby_ids)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("plan_refresh", None)
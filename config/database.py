@@ -1,15 +1,115 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from config.settings import DATABASE_URL
+from config.db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, connect_args
+from config.settings import (
+    ASYNC_DATABASE_URL,
+    DATABASE_REPLICA_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_PGBOUNCER,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT_MS,
+)
 
-engine = create_engine(DATABASE_URL)
+# Drivers assíncronos equivalentes aos da DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(url):
+    """Mesma URL do engine síncrono, trocando o driver pelo assíncrono."""
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def engine_options(url, poolclass) -> dict:
+    """Perfil de conexão lido das settings, comum aos dois engines."""
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "connect_args": connect_args(url, DB_STATEMENT_TIMEOUT_MS, DB_PGBOUNCER),
+    }
+
+
+_url = make_url(DATABASE_URL)
+engine = create_engine(_url, **engine_options(_url, InstrumentedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+_async_url = make_url(ASYNC_DATABASE_URL) if ASYNC_DATABASE_URL else async_url(DATABASE_URL)
+async_engine = create_async_engine(
+    _async_url, **engine_options(_async_url, InstrumentedAsyncQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Réplica de leitura: sem DATABASE_REPLICA_URL aponta para o primário
+if DATABASE_REPLICA_URL:
+    _replica_url = make_url(DATABASE_REPLICA_URL)
+    replica_engine = create_engine(_replica_url, **engine_options(_replica_url, InstrumentedQueuePool))
+    _async_replica_url = async_url(_replica_url)
+    async_replica_engine = create_async_engine(
+        _async_replica_url, **engine_options(_async_replica_url, InstrumentedAsyncQueuePool)
+    )
+else:
+    replica_engine, async_replica_engine = engine, async_engine
+HAS_REPLICA = replica_engine is not engine
+
+
+def _enable_sqlite_foreign_keys(target):
+    """
+    O SQLite (dev/benchmarks) vem com as FKs desligadas; sem isso os
+    ON DELETE CASCADE dos modelos não valem como no Postgres.
+    """
+    if target.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(target, "connect")
+    def _foreign_keys_on(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+for _engine in {engine, async_engine.sync_engine, replica_engine, async_replica_engine.sync_engine}:
+    _enable_sqlite_foreign_keys(_engine)
+
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+AsyncReplicaSessionLocal = async_sessionmaker(
+    async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Sessão para rotas async def; não ocupa thread do threadpool."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db():
+    """Sessão na réplica, para leituras sem usuário (admin, relatórios)."""
+    db = ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,99 @@
+# config/db_pool.py
+"""
+Pools de conexão instrumentados e opções de conexão por ambiente.
+
+InstrumentedQueuePool (sync) e InstrumentedAsyncQueuePool (asyncpg /
+aiosqlite) medem quanto cada checkout esperou por uma conexão, o que,
+junto com checked_out/overflow, mostra se o pool está pequeno para o
+número de workers.
+"""
+
+import threading
+import time
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class _CheckoutTimingMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._wait_seconds = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+
+    def connect(self):
+        # connect() não é reentrante (ao contrário de _do_get); o tempo inclui
+        # a espera na fila, a abertura de conexões novas e o pre-ping.
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self._checkouts += 1
+                self._wait_seconds += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "wait_seconds_total": round(self._wait_seconds, 6),
+                "wait_seconds_max": round(self._wait_max, 6),
+            }
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(engine) -> dict:
+    """Estatísticas do pool de um engine (sync ou async)."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    if isinstance(pool, _CheckoutTimingMixin):
+        return pool.stats()
+    return {"status": pool.status()}
+
+
+def connect_args(url, statement_timeout_ms: int, pgbouncer: bool) -> dict:
+    """
+    Opções de conexão do driver. statement_timeout vai como parâmetro de
+    inicialização, o que o PgBouncer não repassa: atrás dele, configure-o
+    no role (ALTER ROLE ... SET statement_timeout).
+    """
+    driver = url.get_driver_name()
+    if url.get_backend_name() != "postgresql":
+        return {}
+
+    if driver == "asyncpg":
+        args = {}
+        if pgbouncer:
+            # modo transação: prepared statements não sobrevivem entre
+            # transações nem podem repetir nome em outra conexão do servidor
+            args["statement_cache_size"] = 0
+            args["prepared_statement_cache_size"] = 0
+            args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        elif statement_timeout_ms:
+            args["server_settings"] = {"statement_timeout": str(statement_timeout_ms)}
+        return args
+
+    if statement_timeout_ms and not pgbouncer:
+        return {"options": f"-c statement_timeout={statement_timeout_ms}"}
+    return {}
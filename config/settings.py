@@ -11,4 +11,56 @@ JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
 
 
-DATABASE_URL = os.getenv("DATABASE_URL")
\ No newline at end of file
+DATABASE_URL = os.getenv("DATABASE_URL")
+# Opcional: por padrão deriva da DATABASE_URL (asyncpg / aiosqlite)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+# Réplica de leitura opcional para as rotas GET; sem ela tudo vai ao primário
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+# Depois de uma escrita, as leituras do usuário ficam no primário por este
+# tempo (cobre o atraso de replicação)
+REPLICA_PIN_SECONDS = float(os.getenv("REPLICA_PIN_SECONDS", "10"))
+
+# Pool de conexões (por processo, vale para o engine sync e para o async)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# 0 desliga; atrás do PgBouncer configure no role
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
+# PgBouncer em modo transação: sem parâmetros de inicialização nem cache de
+# prepared statements no asyncpg
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+# Métricas (GET /metrics): token opcional exigido no header Authorization
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# Requisições com mais comandos SQL que isso geram warning (N+1)
+SQL_QUERY_WARN_THRESHOLD = int(os.getenv("SQL_QUERY_WARN_THRESHOLD", "30"))
+
+# Threads do threadpool do Starlette para o que ainda é síncrono
+# (rotas def, dependências síncronas)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+
+# Cache de principals autenticados (get_current_user); também é quanto uma
+# conta excluída ainda autentica nos workers que não atenderam a exclusão
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+# Segredo de assinatura dos webhooks Stripe (whsec_...)
+STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
+
+# Worker da outbox (provisionamento Stripe etc.)
+OUTBOX_WORKER_ENABLED = os.getenv("OUTBOX_WORKER_ENABLED", "true").lower() == "true"
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "2"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "12"))
+
+# Agendador de planos de rotina (app/workers/plan_scheduler.py)
+PLAN_SCHEDULER_ENABLED = os.getenv("PLAN_SCHEDULER_ENABLED", "true").lower() == "true"
+PLAN_DEBOUNCE_SECONDS = float(os.getenv("PLAN_DEBOUNCE_SECONDS", "5"))
+PLAN_MAX_DELAY_SECONDS = float(os.getenv("PLAN_MAX_DELAY_SECONDS", "30"))
+PLAN_SWEEP_SECONDS = float(os.getenv("PLAN_SWEEP_SECONDS", "60"))
+
+# Exclusão de bebês/contas (app/utils/deletion.py): eventos por lote/transação;
+# históricos até esse tamanho são apagados já na requisição
+DELETE_BATCH_SIZE = int(os.getenv("DELETE_BATCH_SIZE", "5000"))
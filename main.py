@@ -1,3 +1,4 @@
+from anyio import to_thread
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -8,9 +9,23 @@ from app.routes.baby_routes import router as baby_routes
 from app.routes.event_routes import router as event_routes
 from app.routes.plan_routes import router as plan_routes
 from app.routes.report_routes import router as report_routes
+from app.routes.dashboard_routes import router as dashboard_routes
 from app.routes.payment.payment import router as payment_routes
 
 from app.routes.admin import router as admin_routes
+from app.routes.metrics_routes import router as metrics_routes
+from app.routes.deletion_routes import router as deletion_routes
+
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.utils.profiling import install_profiling
+
+from app.utils.magic import configure_jwt
+from app.utils.read_routing import PIN_HEADER
+from app.workers.outbox_worker import OutboxWorker
+from app.workers.plan_scheduler import plan_scheduler
+from config.database import async_engine
+from config.settings import OUTBOX_WORKER_ENABLED, PLAN_SCHEDULER_ENABLED, THREADPOOL_SIZE
 
 
 # Cria a instância do FastAPI
@@ -30,7 +45,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[PIN_HEADER],  # read-your-writes entre workers
 )
+app.add_middleware(ProfilingMiddleware)
+# Por último: fica por fora e mede também o CORS
+app.add_middleware(MetricsMiddleware)
 
 # Cria o roteador principal com prefixo /api
 routerAPI = APIRouter(prefix="/api")
@@ -41,11 +60,42 @@ routerAPI.include_router(baby_routes)
 routerAPI.include_router(event_routes)
 routerAPI.include_router(plan_routes)
 routerAPI.include_router(report_routes)
+routerAPI.include_router(dashboard_routes)
 routerAPI.include_router(payment_routes)
 routerAPI.include_router(admin_routes)
+routerAPI.include_router(deletion_routes)
 # Anexa o roteador à aplicação principal
 app.include_router(routerAPI)
+app.include_router(metrics_routes)
+# depois de todas as rotas: liga o cProfile sob X-Profile-Token
+install_profiling(app)
+
+
+
+outbox_worker = OutboxWorker()
+
+
+@app.on_event("startup")
+def startup():
+    # prepara a chave JWT uma única vez, falhando cedo se estiver ausente
+    configure_jwt()
+    # rotas def e dependências síncronas rodam neste threadpool
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    if OUTBOX_WORKER_ENABLED:
+        outbox_worker.start()
+    if PLAN_SCHEDULER_ENABLED:
+        plan_scheduler.start()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    outbox_worker.stop()
+    plan_scheduler.stop()
+
 
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
 
 
 @app.get("/", tags=["Root"])
@@ -0,0 +1,15 @@
+-- migrate: no-transaction
+-- Índices compostos da tabela events, criados sem bloquear escritas.
+-- CREATE INDEX CONCURRENTLY não roda dentro de transação, por isso este
+-- arquivo é aplicado em autocommit, um comando por vez.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_baby_id_timestamp
+    ON events (baby_id, "timestamp");
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_baby_id_type_timestamp
+    ON events (baby_id, type, "timestamp" DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_user_id_timestamp
+    ON events (user_id, "timestamp");
+
+ANALYZE events;
@@ -0,0 +1,3 @@
+-- Coluna de idempotência dos uploads em lote (nullable, sem default:
+-- só altera o catálogo, não reescreve a tabela).
+ALTER TABLE events ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(64);
@@ -0,0 +1,6 @@
+-- migrate: no-transaction
+-- Unicidade por usuário da chave de idempotência, só para linhas que a têm.
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_events_user_id_idempotency_key
+    ON events (user_id, idempotency_key)
+    WHERE idempotency_key IS NOT NULL;
@@ -0,0 +1,13 @@
+-- Estado local das assinaturas Stripe, alimentado por webhook.
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id SERIAL PRIMARY KEY,
+    stripe_customer_id VARCHAR NOT NULL,
+    stripe_subscription_id VARCHAR,
+    status VARCHAR(32) NOT NULL,
+    current_period_end TIMESTAMP,
+    stripe_event_created BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT now()
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_subscriptions_stripe_customer_id
+    ON subscriptions (stripe_customer_id);
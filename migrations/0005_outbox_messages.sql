@@ -0,0 +1,15 @@
+-- Outbox transacional (provisionamento assíncrono do customer Stripe no cadastro).
+CREATE TABLE IF NOT EXISTS outbox_messages (
+    id SERIAL PRIMARY KEY,
+    topic VARCHAR(64) NOT NULL,
+    payload JSON NOT NULL,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMP NOT NULL DEFAULT now(),
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT now(),
+    processed_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_outbox_messages_status_available_at
+    ON outbox_messages (status, available_at);
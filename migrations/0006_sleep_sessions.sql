@@ -0,0 +1,22 @@
+-- Sessões de sono materializadas. Popular com:
+--   python -m scripts.rebuild_sleep_sessions
+CREATE TABLE IF NOT EXISTS sleep_sessions (
+    id SERIAL PRIMARY KEY,
+    baby_id INTEGER NOT NULL REFERENCES babies (id) ON DELETE CASCADE,
+    start_event_id INTEGER REFERENCES events (id) ON DELETE CASCADE,
+    end_event_id INTEGER REFERENCES events (id) ON DELETE CASCADE,
+    start_at TIMESTAMP,
+    end_at TIMESTAMP,
+    duration_minutes INTEGER,
+    status VARCHAR(16) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_sleep_sessions_baby_id_end_at
+    ON sleep_sessions (baby_id, end_at);
+CREATE INDEX IF NOT EXISTS ix_sleep_sessions_baby_id_start_at
+    ON sleep_sessions (baby_id, start_at);
+-- FKs para events: sem índice, cada DELETE em events varreria a tabela
+CREATE INDEX IF NOT EXISTS ix_sleep_sessions_start_event_id
+    ON sleep_sessions (start_event_id);
+CREATE INDEX IF NOT EXISTS ix_sleep_sessions_end_event_id
+    ON sleep_sessions (end_event_id);
@@ -0,0 +1,3 @@
+-- Rotina completa (sonecas, mamadas e entradas do cálculo) em JSON compacto.
+ALTER TABLE routine_plans ADD COLUMN IF NOT EXISTS routine JSON;
+ALTER TABLE routine_plans ADD COLUMN IF NOT EXISTS routine_version INTEGER;
@@ -0,0 +1,4 @@
+-- Versões de dados para ETags (ver app/utils/etag.py). ADD COLUMN com
+-- DEFAULT constante não reescreve a tabela no Postgres 11+.
+ALTER TABLE babies ADD COLUMN IF NOT EXISTS data_version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users ADD COLUMN IF NOT EXISTS data_version INTEGER NOT NULL DEFAULT 0;
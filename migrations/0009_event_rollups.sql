@@ -0,0 +1,18 @@
+-- Rollups de eventos para o admin. Popular com:
+--   python -m scripts.rebuild_rollups
+CREATE TABLE IF NOT EXISTS user_event_counts (
+    user_id INTEGER PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+    event_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_user_event_counts_event_count
+    ON user_event_counts (event_count, user_id);
+
+CREATE TABLE IF NOT EXISTS user_day_event_counts (
+    user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    type VARCHAR NOT NULL,
+    event_count INTEGER NOT NULL,
+    PRIMARY KEY (user_id, day, type)
+);
+CREATE INDEX IF NOT EXISTS ix_user_day_event_counts_day
+    ON user_day_event_counts (day);
@@ -0,0 +1,17 @@
+-- Profiles de requisições pedidos por admins (X-Profile-Token).
+CREATE TABLE IF NOT EXISTS request_profiles (
+    id VARCHAR(36) PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+    requested_by INTEGER,
+    method VARCHAR(8) NOT NULL,
+    path VARCHAR NOT NULL,
+    status_code INTEGER,
+    duration_ms DOUBLE PRECISION NOT NULL,
+    sql_count INTEGER NOT NULL,
+    sql_ms DOUBLE PRECISION NOT NULL,
+    statements JSON NOT NULL,
+    profile TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_request_profiles_user_id_created_at
+    ON request_profiles (user_id, created_at);
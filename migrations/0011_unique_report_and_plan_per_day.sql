@@ -0,0 +1,27 @@
+-- Um DailyReport e um RoutinePlan por (baby_id, date). As gravações passam a
+-- ser INSERT ... ON CONFLICT DO UPDATE sobre estas constraints.
+--
+-- O lock bloqueia escritas (leituras seguem) entre a limpeza e a criação das
+-- constraints, para que nenhuma duplicata nova entre no meio. As duas
+-- tabelas têm uma linha por bebê/dia: o índice é construído em segundos.
+LOCK TABLE daily_reports, routine_plans IN SHARE ROW EXCLUSIVE MODE;
+
+-- Duplicatas vieram de gerações simultâneas; fica a gravada por último
+-- (maior id). Os valores são derivados dos eventos: para recalculá-los,
+--   python -m scripts.build_reports --from AAAA-MM-DD --to AAAA-MM-DD
+DELETE FROM daily_reports older
+USING daily_reports newer
+WHERE older.baby_id = newer.baby_id
+  AND older.date = newer.date
+  AND older.id < newer.id;
+
+DELETE FROM routine_plans older
+USING routine_plans newer
+WHERE older.baby_id = newer.baby_id
+  AND older.date = newer.date
+  AND older.id < newer.id;
+
+ALTER TABLE daily_reports
+    ADD CONSTRAINT uq_daily_reports_baby_id_date UNIQUE (baby_id, date);
+ALTER TABLE routine_plans
+    ADD CONSTRAINT uq_routine_plans_baby_id_date UNIQUE (baby_id, date);
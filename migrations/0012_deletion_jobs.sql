@@ -0,0 +1,16 @@
+-- Exclusão de bebês/contas em lotes (app/utils/deletion.py).
+ALTER TABLE users ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP;
+
+CREATE TABLE IF NOT EXISTS deletion_jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    kind VARCHAR(16) NOT NULL,
+    user_id INTEGER NOT NULL,
+    baby_id INTEGER,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    total_events INTEGER NOT NULL DEFAULT 0,
+    deleted_events INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT now(),
+    updated_at TIMESTAMP DEFAULT now(),
+    finished_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_deletion_jobs_user_id ON deletion_jobs (user_id);
@@ -0,0 +1,11 @@
+-- Uma linha por assinatura Stripe, não por customer: com a chave no customer,
+-- o cancelamento de uma assinatura antiga sobrescrevia a nova, ativa.
+-- Linhas antigas sempre têm stripe_subscription_id (gravado por todo webhook).
+DELETE FROM subscriptions WHERE stripe_subscription_id IS NULL;
+ALTER TABLE subscriptions ALTER COLUMN stripe_subscription_id SET NOT NULL;
+
+DROP INDEX IF EXISTS ix_subscriptions_stripe_customer_id;
+CREATE INDEX IF NOT EXISTS ix_subscriptions_stripe_customer_id
+    ON subscriptions (stripe_customer_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_subscriptions_stripe_subscription_id
+    ON subscriptions (stripe_subscription_id);
@@ -0,0 +1,3 @@
+-- created_at é Date: o default passa de now() para CURRENT_DATE, como no
+-- modelo (app/models/daily_report_model.py). Mesmo valor no Postgres.
+ALTER TABLE daily_reports ALTER COLUMN created_at SET DEFAULT CURRENT_DATE;
@@ -0,0 +1,33 @@
+-- migrate: no-transaction
+-- Cada evento de sono pertence a no máximo uma sessão. Escritas simultâneas
+-- do mesmo bebê chegaram a inserir sessões fechadas repetidas (sono contado
+-- duas vezes); com apply_event_changes travando o bebê isso não se repete, e
+-- os índices únicos abaixo garantem no banco.
+--
+-- Aplique depois do deploy do lock. Duplicatas antigas: fica a de menor id.
+-- Para recalcular os bebês afetados por completo:
+--   python -m scripts.rebuild_sleep_sessions --baby-id N ...
+--   python -m scripts.build_reports --from AAAA-MM-DD --to AAAA-MM-DD
+
+DELETE FROM sleep_sessions dup
+USING sleep_sessions keep
+WHERE dup.start_event_id = keep.start_event_id
+  AND dup.id > keep.id;
+
+DELETE FROM sleep_sessions dup
+USING sleep_sessions keep
+WHERE dup.end_event_id = keep.end_event_id
+  AND dup.id > keep.id;
+
+-- uma execução interrompida deixa o índice INVALID; recomeça do zero
+DROP INDEX CONCURRENTLY IF EXISTS uq_sleep_sessions_start_event_id;
+DROP INDEX CONCURRENTLY IF EXISTS uq_sleep_sessions_end_event_id;
+
+CREATE UNIQUE INDEX CONCURRENTLY uq_sleep_sessions_start_event_id
+    ON sleep_sessions (start_event_id);
+CREATE UNIQUE INDEX CONCURRENTLY uq_sleep_sessions_end_event_id
+    ON sleep_sessions (end_event_id);
+
+-- os únicos também servem aos DELETEs em cascata de events
+DROP INDEX CONCURRENTLY IF EXISTS ix_sleep_sessions_start_event_id;
+DROP INDEX CONCURRENTLY IF EXISTS ix_sleep_sessions_end_event_id;
@@ -0,0 +1,119 @@
+# scripts/bench_concurrency.py
+"""
+Mede como as rotas escalam com a concorrência, dentro do processo (ASGI via
+httpx, sem rede entre cliente e app).
+
+Compara o relatório diário servido pela rota async (GET /api/report/daily)
+com uma cópia síncrona da mesma consulta, montada só aqui em
+/bench/sync-daily. Com --threadpool pequeno, a cópia síncrona para de
+escalar quando as threads acabam; a rota async continua. Rode contra o
+Postgres (de preferência remoto): no SQLite local a espera por I/O é
+pequena demais para aparecer.
+
+Uso:
+    python -m scripts.bench_concurrency --baby-id 1
+    python -m scripts.bench_concurrency --baby-id 1 --threadpool 8 --concurrency 1,8,32,128
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import date
+
+import httpx
+from anyio import to_thread
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+import main as api
+from app.dependencies.auth import get_current_user
+from app.models.baby_model import Baby
+from app.models.daily_report_model import DailyReport
+from app.utils.magic import configure_jwt, jwt_for_user
+from config.database import SessionLocal, async_engine, get_db
+
+
+@api.app.get("/bench/sync-daily", include_in_schema=False)
+def sync_daily(baby_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    """Mesma leitura de GET /api/report/daily, no caminho síncrono antigo."""
+    db.query(Baby.id).filter_by(id=baby_id, user_id=current_user.id).first()
+    report = db.query(DailyReport).filter_by(baby_id=baby_id, date=date.today()).first()
+    return {"total_sleep_minutes": report.total_sleep_minutes if report else 0}
+
+
+def _token(baby_id: int) -> str:
+    db = SessionLocal()
+    try:
+        baby = db.get(Baby, baby_id)
+        if baby is None:
+            raise SystemExit(f"Bebê {baby_id} não encontrado")
+        parent = baby.parent
+        return jwt_for_user(user_id=parent.id, email=parent.email, role=parent.role)
+    finally:
+        db.close()
+
+
+async def run_level(client, path: str, headers: dict, concurrency: int, total: int):
+    latencies = []
+    queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    async def worker():
+        while not queue.empty():
+            queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def bench(args):
+    to_thread.current_default_thread_limiter().total_tokens = args.threadpool
+    headers = {"Authorization": f"Bearer {_token(args.baby_id)}"}
+    paths = {
+        "async": f"/api/report/daily?baby_id={args.baby_id}",
+        "sync": f"/bench/sync-daily?baby_id={args.baby_id}",
+    }
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"threadpool={args.threadpool}, {args.requests} requisições por nível")
+        print(f"{'rota':<6} {'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        for concurrency in args.concurrency:
+            for name, path in paths.items():
+                await run_level(client, path, headers, concurrency, min(concurrency, 20))  # aquece
+                result = await run_level(client, path, headers, concurrency, args.requests)
+                print(f"{name:<6} {concurrency:>5} {result['rps']:>9.1f} "
+                      f"{result['p50']:>8.1f} {result['p95']:>8.1f}")
+    await async_engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baby-id", type=int, required=True)
+    parser.add_argument("--threadpool", type=int, default=8)
+    parser.add_argument("--concurrency", default="1,8,32,128",
+                        type=lambda value: [int(v) for v in value.split(",")])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    configure_jwt()
+    asyncio.run(bench(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,540 @@
+# scripts/bench_endpoints.py
+"""
+Benchmark das rotas da API, dentro do processo (ASGI via httpx), sobre o
+banco populado por scripts/bench_seed.py.
+
+Cada cenário é uma rota de main.py com parâmetros realistas; as requisições
+giram entre os usuários do seed. Para cada um mede p50/p95/p99, vazão e
+comandos SQL por requisição (app/utils/sql_tracking.py). Leituras rodam
+antes das escritas; PUT/DELETE de eventos e as exclusões de bebê/conta usam
+os ids criados pelos POSTs.
+As rotas de pagamento ficam de fora (chamam o Stripe).
+
+As escritas alteram o banco: rode o seed de novo antes de cada medição
+que vá ser comparada.
+
+Resultados podem ser gravados como baseline (scripts/bench_baselines/) e
+comparados depois: sai com código 1 se o p95 de algum cenário piorar além
+de --threshold ou se o número de comandos SQL por requisição aumentar.
+
+scripts/bench_baselines/sqlite.json é a referência versionada, gravada com
+os comandos abaixo em SQLite (máquina e tamanho do banco no "meta"). Os
+comandos SQL por requisição valem em qualquer máquina; latências só se
+comparam com uma baseline gravada na mesma máquina, então grave a sua
+(--save-baseline local) antes de mexer no código. Em máquina compartilhada o
+p95 oscila entre rodadas: confirme uma regressão de latência rodando de novo.
+
+Uso:
+    python -m scripts.bench_seed --users 50 --days 14
+    python -m scripts.bench_endpoints --save-baseline local
+    python -m scripts.bench_endpoints --compare sqlite [--only events,report]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from anyio import to_thread
+from fastapi.routing import APIRoute
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+import main as api
+from app.models.auth_models import User
+from app.models.baby_model import Baby
+from app.models.event_model import Event
+from app.utils.magic import configure_jwt, jwt_for_user
+from app.utils.sql_tracking import start_tracking, stop_tracking
+from config.database import async_engine, engine
+from config.settings import METRICS_TOKEN, THREADPOOL_SIZE
+from scripts.bench_seed import ADMIN_EMAIL, BENCH_DOMAIN, BENCH_PASSWORD
+
+BASELINES_DIR = Path(__file__).resolve().parent / "bench_baselines"
+EXCLUDED_PREFIXES = ("/api/payment",)
+EVENT_BATCH_TYPES = ("feed", "sleep_start", "sleep_end", "feed", "sleep_start")
+# diferenças menores que isso no p95 são ruído, qualquer que seja a razão
+MIN_P95_DELTA_MS = 1.0
+SQL_TOLERANCE = 0.5
+
+Request = Tuple[str, dict]
+
+
+@dataclass
+class BenchUser:
+    id: int
+    email: str
+    headers: dict
+    baby_ids: List[int]
+
+
+@dataclass
+class BenchContext:
+    users: List[BenchUser]
+    admin_headers: dict
+    first_day: date
+    run_tag: str
+    # (índice do usuário, id do evento) criados pelo POST /api/events
+    created_events: deque = field(default_factory=deque)
+    # (índice do usuário, id do bebê) criados pelo POST /api/babies
+    created_babies: deque = field(default_factory=deque)
+    # headers das contas criadas pelo POST /api/auth/cadastro
+    created_accounts: deque = field(default_factory=deque)
+    deletion_jobs: List[str] = field(default_factory=list)
+    dashboard_etags: Dict[int, str] = field(default_factory=dict)
+    profile_id: Optional[str] = None
+
+    def user(self, i: int) -> BenchUser:
+        return self.users[i % len(self.users)]
+
+    def baby(self, i: int) -> int:
+        babies = self.user(i).baby_ids
+        return babies[(i // len(self.users)) % len(babies)]
+
+
+@dataclass
+class Scenario:
+    method: str
+    route: str
+    build: Callable[[BenchContext, int], Optional[Request]]
+    expect: Tuple[int, ...] = (200,)
+    variant: str = ""
+    after: Optional[Callable[[BenchContext, int, httpx.Response], None]] = None
+    prepare: Optional[Callable[[httpx.AsyncClient, BenchContext], Awaitable[None]]] = None
+
+    @property
+    def name(self) -> str:
+        name = f"{self.method} {self.route}"
+        return f"{name} ({self.variant})" if self.variant else name
+
+
+# ---------------------------------------------------------------- cenários
+
+def _get(path: str, headers: dict, **params) -> Request:
+    return path, {"headers": headers, "params": params}
+
+
+def _events_batch(ctx: BenchContext, i: int) -> Request:
+    user, baby_id = ctx.user(i), ctx.baby(i)
+    start = datetime.now() - timedelta(minutes=30 + i % 600)
+    body = [
+        {"baby_id": baby_id, "type": event_type,
+         "timestamp": (start + timedelta(minutes=10 * n)).isoformat(),
+         "idempotency_key": f"{ctx.run_tag}-{i}-{n}"}
+        for n, event_type in enumerate(EVENT_BATCH_TYPES)
+    ]
+    return "/api/events", {"headers": user.headers, "json": body}
+
+
+def _remember_events(ctx: BenchContext, i: int, response: httpx.Response):
+    for created in response.json()["created"]:
+        ctx.created_events.append((i, created["event_id"]))
+
+
+def _update_event(ctx: BenchContext, i: int) -> Optional[Request]:
+    if not ctx.created_events:
+        return None
+    owner, event_id = ctx.created_events.popleft()
+    body = {"timestamp": (datetime.now() - timedelta(minutes=5 + i % 300)).isoformat()}
+    return f"/api/events/{event_id}", {"headers": ctx.user(owner).headers, "json": body}
+
+
+def _delete_event(ctx: BenchContext, i: int) -> Optional[Request]:
+    if not ctx.created_events:
+        return None
+    owner, event_id = ctx.created_events.popleft()
+    return f"/api/events/{event_id}", {"headers": ctx.user(owner).headers}
+
+
+def _remember_baby(ctx: BenchContext, i: int, response: httpx.Response):
+    ctx.created_babies.append((i, response.json()["baby_id"]))
+
+
+def _remember_account(ctx: BenchContext, i: int, response: httpx.Response):
+    body = response.json()
+    token = jwt_for_user(user_id=body["user_id"], email=body["email"], role="parent")
+    ctx.created_accounts.append({"Authorization": f"Bearer {token}"})
+
+
+def _remember_deletion(ctx: BenchContext, i: int, response: httpx.Response):
+    ctx.deletion_jobs.append(response.json()["job_id"])
+
+
+def _delete_baby(ctx: BenchContext, i: int) -> Optional[Request]:
+    if not ctx.created_babies:
+        return None
+    owner, baby_id = ctx.created_babies.popleft()
+    return f"/api/babies/{baby_id}", {"headers": ctx.user(owner).headers}
+
+
+def _delete_account(ctx: BenchContext, i: int) -> Optional[Request]:
+    if not ctx.created_accounts:
+        return None
+    return "/api/auth/conta", {"headers": ctx.created_accounts.popleft()}
+
+
+def _deletion_status(ctx: BenchContext, i: int) -> Optional[Request]:
+    if not ctx.deletion_jobs:
+        return None
+    return f"/api/deletions/{ctx.deletion_jobs[i % len(ctx.deletion_jobs)]}", {}
+
+
+async def _fetch_dashboard_etags(client: httpx.AsyncClient, ctx: BenchContext):
+    for index, user in enumerate(ctx.users):
+        response = await client.get("/api/dashboard", headers=user.headers)
+        ctx.dashboard_etags[index] = response.headers.get("etag", "")
+
+
+def _dashboard_not_modified(ctx: BenchContext, i: int) -> Request:
+    user = ctx.user(i)
+    headers = {**user.headers, "If-None-Match": ctx.dashboard_etags[i % len(ctx.users)]}
+    return "/api/dashboard", {"headers": headers}
+
+
+async def _record_profile(client: httpx.AsyncClient, ctx: BenchContext):
+    """Gera um profile real (token de admin + requisição perfilada) para a consulta por id."""
+    user = ctx.users[0]
+    response = await client.post("/api/admin/profile-token", headers=ctx.admin_headers,
+                                 json={"user_id": user.id, "ttl_minutes": 5})
+    response.raise_for_status()
+    headers = {**user.headers, "X-Profile-Token": response.json()["profile_token"]}
+    response = await client.get("/api/babies/me", headers=headers)
+    ctx.profile_id = response.headers.get("x-profile-id")
+
+
+def _admin_range(ctx: BenchContext) -> dict:
+    return {"from": ctx.first_day.isoformat(), "to": date.today().isoformat()}
+
+
+def scenarios() -> List[Scenario]:
+    metrics_headers = {"Authorization": f"Bearer {METRICS_TOKEN}"} if METRICS_TOKEN else {}
+    return [
+        # -------- leituras
+        Scenario("GET", "/", lambda ctx, i: ("/", {})),
+        Scenario("POST", "/api/auth/login", lambda ctx, i: (
+            "/api/auth/login", {"json": {"email": ctx.user(i).email, "password": BENCH_PASSWORD}})),
+        Scenario("GET", "/api/babies/me", lambda ctx, i: _get("/api/babies/me", ctx.user(i).headers)),
+        Scenario("GET", "/api/events", lambda ctx, i: _get("/api/events", ctx.user(i).headers)),
+        Scenario("GET", "/api/events", lambda ctx, i: _get(
+            "/api/events", ctx.user(i).headers, baby_id=ctx.baby(i), type="sleep_end", limit=20),
+            variant="por bebê"),
+        Scenario("GET", "/api/plan/today", lambda ctx, i: _get(
+            "/api/plan/today", ctx.user(i).headers, baby_id=ctx.baby(i))),
+        Scenario("GET", "/api/report/daily", lambda ctx, i: _get(
+            "/api/report/daily", ctx.user(i).headers, baby_id=ctx.baby(i))),
+        Scenario("GET", "/api/report/history", lambda ctx, i: _get(
+            "/api/report/history", ctx.user(i).headers, baby_id=ctx.baby(i))),
+        Scenario("GET", "/api/dashboard", lambda ctx, i: _get("/api/dashboard", ctx.user(i).headers)),
+        Scenario("GET", "/api/dashboard", _dashboard_not_modified, expect=(304,),
+                 variant="304", prepare=_fetch_dashboard_etags),
+        Scenario("GET", "/api/admin/events-per-mother", lambda ctx, i: _get(
+            "/api/admin/events-per-mother", ctx.admin_headers, offset=(i * 10) % 100)),
+        Scenario("GET", "/api/admin/active-users", lambda ctx, i: (
+            "/api/admin/active-users", {"headers": ctx.admin_headers, "params": _admin_range(ctx)})),
+        Scenario("GET", "/api/admin/event-mix", lambda ctx, i: (
+            "/api/admin/event-mix", {"headers": ctx.admin_headers, "params": _admin_range(ctx)})),
+        Scenario("GET", "/api/admin/pool-stats", lambda ctx, i: _get(
+            "/api/admin/pool-stats", ctx.admin_headers)),
+        Scenario("GET", "/api/admin/profiles", lambda ctx, i: _get(
+            "/api/admin/profiles", ctx.admin_headers)),
+        Scenario("GET", "/api/admin/profiles/{profile_id}", lambda ctx, i: _get(
+            f"/api/admin/profiles/{ctx.profile_id}", ctx.admin_headers), prepare=_record_profile),
+        Scenario("GET", "/metrics", lambda ctx, i: ("/metrics", {"headers": metrics_headers})),
+        # -------- escritas
+        Scenario("POST", "/api/auth/cadastro", lambda ctx, i: (
+            "/api/auth/cadastro",
+            {"json": {"email": f"cadastro-{ctx.run_tag}-{i}{BENCH_DOMAIN}", "password": BENCH_PASSWORD}},
+        ), expect=(201,), after=_remember_account),
+        Scenario("POST", "/api/babies", lambda ctx, i: ("/api/babies", {
+            "headers": ctx.user(i).headers,
+            "json": {"name": f"Novo {i}", "birth_date": (date.today() - timedelta(days=30 + i % 300)).isoformat(),
+                     "gender": "female"},
+        }), after=_remember_baby),
+        Scenario("PUT", "/api/babies/{baby_id}", lambda ctx, i: (f"/api/babies/{ctx.baby(i)}", {
+            "headers": ctx.user(i).headers, "json": {"name": f"Bebê {ctx.baby(i)} ({i})"},
+        })),
+        Scenario("POST", "/api/events", _events_batch, expect=(201,), variant=f"lote de {len(EVENT_BATCH_TYPES)}",
+                 after=_remember_events),
+        Scenario("PUT", "/api/events/{event_id}", _update_event),
+        Scenario("DELETE", "/api/events/{event_id}", _delete_event),
+        Scenario("POST", "/api/plan/routine/generate", lambda ctx, i: (
+            "/api/plan/routine/generate", {"headers": ctx.user(i).headers, "params": {"baby_id": ctx.baby(i)}},
+        )),
+        # 400 é resposta legítima: bebê sem eventos hoje (seed rodado de madrugada)
+        Scenario("POST", "/api/report/generate", lambda ctx, i: (
+            "/api/report/generate", {"headers": ctx.user(i).headers, "params": {"baby_id": ctx.baby(i)}},
+        ), expect=(200, 400)),
+        Scenario("POST", "/api/admin/profile-token", lambda ctx, i: ("/api/admin/profile-token", {
+            "headers": ctx.admin_headers, "json": {"user_id": ctx.user(i).id},
+        })),
+        # exclusões só dos bebês/contas criados acima (sem histórico: caminho
+        # síncrono); os do seed continuam para as próximas medições
+        Scenario("DELETE", "/api/babies/{baby_id}", _delete_baby, expect=(202,), after=_remember_deletion),
+        Scenario("DELETE", "/api/auth/conta", _delete_account, expect=(202,), after=_remember_deletion),
+        Scenario("GET", "/api/deletions/{job_id}", _deletion_status),
+    ]
+
+
+def uncovered_routes(selected: List[Scenario]) -> List[str]:
+    """Rotas do app sem cenário (fora as excluídas de propósito)."""
+    covered = {(s.method, s.route) for s in selected}
+    missing = []
+    for route in api.app.routes:
+        if not isinstance(route, APIRoute) or route.path.startswith(EXCLUDED_PREFIXES):
+            continue
+        for method in sorted(route.methods):
+            if (method, route.path) not in covered:
+                missing.append(f"{method} {route.path}")
+    return missing
+
+
+# ---------------------------------------------------------------- execução
+
+def load_context() -> BenchContext:
+    with Session(engine) as db:
+        admin = db.query(User).filter_by(email=ADMIN_EMAIL).first()
+        parents = (
+            db.query(User)
+            .filter(User.email.like(f"bench%{BENCH_DOMAIN}"), User.role != "admin")
+            .order_by(User.id)
+            .all()
+        )
+        babies: Dict[int, List[int]] = {}
+        for baby in db.query(Baby.id, Baby.user_id).filter(
+            Baby.user_id.in_([p.id for p in parents])
+        ).order_by(Baby.id):
+            babies.setdefault(baby.user_id, []).append(baby.id)
+
+        first_event = db.query(func.min(Event.timestamp)).scalar()
+        users = [
+            BenchUser(p.id, p.email, _auth(p), babies[p.id]) for p in parents if p.id in babies
+        ]
+        if admin is None or not users:
+            raise SystemExit("Banco sem dados de benchmark: rode python -m scripts.bench_seed")
+        return BenchContext(
+            users=users,
+            admin_headers=_auth(admin),
+            first_day=first_event.date() if first_event else date.today(),
+            run_tag=str(int(time.time())),
+        )
+
+
+def _auth(user: User) -> dict:
+    token = jwt_for_user(user_id=user.id, email=user.email, role=user.role)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+async def run_scenario(client, ctx: BenchContext, scenario: Scenario, total: int,
+                       concurrency: int, warmup: int) -> dict:
+    latencies, sql_counts, sql_seconds = [], [], []
+    errors = skipped = 0
+    counter = iter(range(warmup + total))
+
+    async def one(i: int, record: bool):
+        nonlocal errors, skipped
+        request = scenario.build(ctx, i)
+        if request is None:
+            skipped += 1
+            return
+        url, kwargs = request
+        sql, token = start_tracking()
+        started = time.perf_counter()
+        try:
+            response = await client.request(scenario.method, url, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            stop_tracking(token)
+        if response.status_code not in scenario.expect:
+            if record:
+                errors += 1
+                if errors == 1:
+                    print(f"  {scenario.name}: {response.status_code} {response.text[:200]}")
+        elif scenario.after is not None:
+            scenario.after(ctx, i, response)
+        if record:
+            latencies.append(elapsed)
+            sql_counts.append(sql.count)
+            sql_seconds.append(sql.seconds)
+
+    async def worker():
+        for i in counter:
+            await one(i, record=i >= warmup)
+
+    if scenario.prepare is not None:
+        await scenario.prepare(client, ctx)
+    for i in itertools.islice(counter, warmup):
+        await one(i, record=False)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    done = len(latencies)
+    return {
+        "requests": done,
+        "errors": errors,
+        "skipped": skipped,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "rps": done / elapsed if elapsed else 0.0,
+        "sql_per_request": sum(sql_counts) / done if done else 0.0,
+        "sql_ms_per_request": sum(sql_seconds) * 1000 / done if done else 0.0,
+    }
+
+
+async def bench(selected: List[Scenario], args) -> Dict[str, dict]:
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    ctx = load_context()
+    results = {}
+    transport = httpx.ASGITransport(app=api.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for scenario in selected:
+                results[scenario.name] = await run_scenario(
+                    client, ctx, scenario, args.requests, args.concurrency, args.warmup
+                )
+                print_row(scenario.name, results[scenario.name], flush=True)
+    finally:
+        await async_engine.dispose()
+    return results
+
+
+# ---------------------------------------------------------------- relatório
+
+HEADER = (f"{'cenário':<46} {'n':>5} {'erros':>5} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'req/s':>8} {'sql/req':>7} {'sql ms':>7}")
+
+
+def print_row(name: str, r: dict, mark: str = "", flush: bool = False):
+    print(f"{name:<46} {r['requests']:>5} {r['errors']:>5} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+          f"{r['p99_ms']:>8.1f} {r['rps']:>8.1f} {r['sql_per_request']:>7.1f} "
+          f"{r['sql_ms_per_request']:>7.1f}{mark}", flush=flush)
+
+
+def dataset_size() -> dict:
+    """Tamanho do banco medido (antes das escritas do benchmark)."""
+    with Session(engine) as db:
+        return {
+            "users": db.query(func.count(User.id)).scalar(),
+            "babies": db.query(func.count(Baby.id)).scalar(),
+            "events": db.query(func.count(Event.id)).scalar(),
+        }
+
+
+def run_metadata(args, dataset: dict) -> dict:
+    return {
+        "database": engine.dialect.name,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "dataset": dataset,
+        "python": platform.python_version(),
+        "machine": f"{platform.node()} ({platform.system()} {platform.machine()}, {os.cpu_count()} CPU(s))",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def save_baseline(name: str, results: Dict[str, dict], meta: dict) -> Path:
+    BASELINES_DIR.mkdir(exist_ok=True)
+    path = BASELINES_DIR / f"{name}.json"
+    path.write_text(json.dumps({"meta": meta, "results": results}, indent=2, ensure_ascii=False) + "\n",
+                    encoding="utf-8")
+    return path
+
+
+def compare(name: str, results: Dict[str, dict], meta: dict, threshold: float) -> List[str]:
+    """Lista de regressões (vazia se tudo dentro da tolerância)."""
+    path = BASELINES_DIR / f"{name}.json"
+    if not path.exists():
+        raise SystemExit(f"Baseline não encontrada: {path}")
+    baseline = json.loads(path.read_text(encoding="utf-8"))
+    for key in ("database", "requests", "concurrency", "dataset"):
+        if baseline["meta"].get(key) != meta[key]:
+            print(f"Atenção: {key} difere da baseline "
+                  f"({baseline['meta'].get(key)} → {meta[key]}); comparação pouco confiável.")
+    same_machine = baseline["meta"].get("machine") == meta["machine"]
+    if not same_machine:
+        print(f"Baseline de outra máquina ({baseline['meta'].get('machine')}): "
+              "só os comandos SQL por requisição são comparados.")
+
+    regressions = []
+    print(f"\nComparação com {path.name} (p95 tolerado: +{threshold:.0%})")
+    print(f"{'cenário':<46} {'p95 antes':>10} {'p95 agora':>10} {'sql antes':>10} {'sql agora':>10}")
+    for scenario, current in results.items():
+        before = baseline["results"].get(scenario)
+        if before is None:
+            print(f"{scenario:<46} {'—':>10} {current['p95_ms']:>10.1f} {'—':>10} "
+                  f"{current['sql_per_request']:>10.1f}  (novo)")
+            continue
+        marks = []
+        if (same_machine and current["p95_ms"] > before["p95_ms"] * (1 + threshold)
+                and current["p95_ms"] - before["p95_ms"] > MIN_P95_DELTA_MS):
+            marks.append("p95")
+        if current["sql_per_request"] > before["sql_per_request"] + SQL_TOLERANCE:
+            marks.append("sql")
+        if marks:
+            regressions.append(f"{scenario}: {', '.join(marks)}")
+        print(f"{scenario:<46} {before['p95_ms']:>10.1f} {current['p95_ms']:>10.1f} "
+              f"{before['sql_per_request']:>10.1f} {current['sql_per_request']:>10.1f}"
+              f"{'  REGRESSÃO ' + '/'.join(marks) if marks else ''}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="requisições medidas por cenário")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", type=lambda value: [v.strip() for v in value.split(",")],
+                        help="só cenários cujo nome contém um destes trechos")
+    parser.add_argument("--save-baseline", metavar="NOME")
+    parser.add_argument("--compare", metavar="NOME")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="piora relativa tolerada no p95 (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    configure_jwt()
+    selected = scenarios()
+    if args.only:
+        selected = [s for s in selected if any(part in s.name for part in args.only)]
+    else:
+        for route in uncovered_routes(selected):
+            print(f"Atenção: rota sem cenário: {route}")
+    print(f"Rotas fora do benchmark: {', '.join(p + '/*' for p in EXCLUDED_PREFIXES)} (Stripe)")
+    print(f"{engine.dialect.name}, {args.requests} requisições por cenário, concorrência {args.concurrency}")
+    print(HEADER)
+
+    dataset = dataset_size()
+    results = asyncio.run(bench(selected, args))
+    meta = run_metadata(args, dataset)
+
+    if args.save_baseline:
+        print(f"\nBaseline gravada em {save_baseline(args.save_baseline, results, meta)}")
+    if args.compare:
+        regressions = compare(args.compare, results, meta, args.threshold)
+        if regressions:
+            print("\nRegressões:\n  " + "\n  ".join(regressions))
+            return 1
+        print("\nSem regressões.")
+    return 1 if any(r["errors"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# scripts/bench_seed.py
+"""
+Popula um banco local (SQLite ou Postgres de desenvolvimento) com dados
+sintéticos para o benchmark de rotas (scripts/bench_endpoints.py).
+
+Cria N usuários bench{i}@bench.example.com (senha BENCH_PASSWORD), um admin
+admin@bench.example.com, bebês com idades variadas e alguns dias de eventos por
+bebê, vindos de scripts/event_generator.py (o mesmo tráfego que o
+scripts/replay_load.py envia pela API). Depois recria sessões de sono, relatórios, rollups e planos como o backfill
+faria. Tudo sai de um gerador com semente: a mesma linha de comando produz
+o mesmo banco (com as datas relativas ao dia de hoje).
+
+Só roda em banco vazio ou que contenha apenas usuários @bench.example.com; nesse
+caso as tabelas são recriadas do zero.
+
+Uso:
+    python -m scripts.bench_seed [--users 50] [--babies-per-user 2] [--days 14] [--seed 1]
+                                 [--holdout-hours 24]
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from passlib.context import CryptContext
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from config.database import Base, SessionLocal, engine
+from app.models.auth_models import User
+from app.models.baby_model import Baby
+from app.models.event_model import Event
+from app.models import (  # noqa: F401 (registra os mappers)
+    daily_report_model, deletion_job_model, outbox_model, request_profile_model,
+    rollup_model, sleep_plan_model, sleep_session_model, subscription_model,
+)
+from app.utils.report_generator import rebuild_daily_reports
+from app.utils.rollups import rebuild_event_rollups
+from app.utils.routine_planner import regenerate_plan
+from app.utils.sleep_sessions import rebuild_sleep_sessions
+from scripts.event_generator import baby_events, population
+
+BENCH_DOMAIN = "@bench.example.com"
+BENCH_PASSWORD = "bench-senha"
+ADMIN_EMAIL = "admin" + BENCH_DOMAIN
+INSERT_CHUNK = 5000
+
+
+def bench_email(index: int) -> str:
+    return f"bench{index}{BENCH_DOMAIN}"
+
+
+def _reset_schema():
+    inspector = inspect(engine)
+    if inspector.has_table(User.__tablename__):
+        with Session(engine) as db:
+            foreign = db.query(User.id).filter(~User.email.endswith(BENCH_DOMAIN)).first()
+        if foreign is not None:
+            raise SystemExit(
+                "O banco tem usuários fora de @bench.example.com; use um banco descartável "
+                "(DATABASE_URL) para o benchmark."
+            )
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def seed(db: Session, users: int, babies_per_user: int, days: int, seed: int = 1,
+         holdout_hours: int = 0) -> dict:
+    """
+    Grava o conjunto sintético; devolve as contagens. As últimas
+    `holdout_hours` horas ficam sem eventos, para o replay_load enviá-las
+    pela API com a mesma semente (continuação dos mesmos bebês).
+    """
+    rng = random.Random(seed)
+    password_hash = CryptContext(schemes=["bcrypt"]).hash(BENCH_PASSWORD)
+    today = date.today()
+    until = datetime.now() - timedelta(hours=holdout_hours)
+    first_day = today - timedelta(days=days - 1)
+
+    db.add(User(email=ADMIN_EMAIL, password_hash=password_hash, role="admin"))
+    parents = [User(email=bench_email(i), password_hash=password_hash) for i in range(users)]
+    db.add_all(parents)
+    db.flush()
+
+    profiles = population(seed, users, babies_per_user, first_day)
+    babies: List[Baby] = [
+        Baby(
+            user_id=parents[profile.user].id,
+            name=f"Bebê {profile.user}-{profile.baby}",
+            birth_date=profile.birth_date,
+            birth_weight_grams=rng.randint(2500, 4200),
+            gender=rng.choice(["male", "female"]),
+        )
+        for profile in profiles
+    ]
+    db.add_all(babies)
+    db.flush()
+
+    rows, total_events = [], 0
+    start = datetime.combine(first_day, datetime.min.time())
+    for baby, profile in zip(babies, profiles):
+        for event in baby_events(seed, profile, start, until):
+            rows.append({"user_id": baby.user_id, "baby_id": baby.id, "type": event.type,
+                         "timestamp": event.timestamp, "idempotency_key": event.idempotency_key})
+        if len(rows) >= INSERT_CHUNK:
+            db.execute(Event.__table__.insert(), rows)
+            total_events += len(rows)
+            rows = []
+    if rows:
+        db.execute(Event.__table__.insert(), rows)
+        total_events += len(rows)
+
+    baby_ids = [baby.id for baby in babies]
+    rebuild_sleep_sessions(db, baby_ids)
+    reports = rebuild_daily_reports(db, first_day - timedelta(days=1), today, baby_ids)
+    rebuild_event_rollups(db, [parent.id for parent in parents])
+    db.commit()
+
+    plans = sum(1 for baby_id in baby_ids if regenerate_plan(db, baby_id) is not None)
+    return {"users": users, "babies": len(babies), "events": total_events,
+            "reports": reports, "plans": plans}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Popula o banco do benchmark")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--babies-per-user", type=int, default=2)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--holdout-hours", type=int, default=0,
+                        help="deixa as últimas N horas para o scripts.replay_load")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    _reset_schema()
+    db = SessionLocal()
+    try:
+        counts = seed(db, args.users, args.babies_per_user, args.days, args.seed, args.holdout_hours)
+    finally:
+        db.close()
+    summary = ", ".join(f"{value} {name}" for name, value in counts.items())
+    print(f"{summary} ({time.monotonic() - started:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# scripts/build_reports.py
+"""
+(Re)constrói os DailyReport de todos os bebês para um dia ou intervalo,
+em lotes de bebês (uma agregação SQL + um upsert multi-linha por lote),
+opcionalmente em paralelo num pool de processos por faixa de ids.
+
+Uso:
+    python -m scripts.build_reports                       # ontem
+    python -m scripts.build_reports --date 2025-06-01
+    python -m scripts.build_reports --from 2025-01-01 --to 2025-06-30 --workers 4
+    python -m scripts.build_reports --from ... --to ... --rebuild-sessions
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+from config.database import SessionLocal, engine
+from app.models.baby_model import Baby
+from app.models import auth_models, event_model, sleep_plan_model  # noqa: F401 (registra os mappers)
+from app.utils.report_generator import rebuild_daily_reports
+from app.utils.sleep_sessions import rebuild_sleep_sessions
+
+
+def baby_id_ranges(chunk_size: int):
+    """Faixas contíguas [primeiro_id, último_id] com até chunk_size bebês cada."""
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            ids = [
+                row.id
+                for row in db.query(Baby.id)
+                .filter(Baby.id > last_id)
+                .order_by(Baby.id)
+                .limit(chunk_size)
+            ]
+            if not ids:
+                return
+            yield ids[0], ids[-1]
+            last_id = ids[-1]
+    finally:
+        db.close()
+
+
+def build_range(id_range, start_date, end_date, rebuild_sessions=False):
+    """Processa uma faixa de bebês numa transação; roda no processo filho."""
+    first_id, last_id = id_range
+    db = SessionLocal()
+    try:
+        baby_ids = [
+            row.id
+            for row in db.query(Baby.id).filter(Baby.id.between(first_id, last_id))
+        ]
+        if rebuild_sessions:
+            rebuild_sleep_sessions(db, baby_ids)
+        reports = rebuild_daily_reports(db, start_date, end_date, baby_ids)
+        db.commit()
+        return len(baby_ids), reports
+    finally:
+        db.close()
+
+
+def _init_worker():
+    # conexões herdadas do processo pai via fork não podem ser reutilizadas
+    engine.dispose(close=False)
+
+
+def run(start_date, end_date, chunk_size=500, workers=1, rebuild_sessions=False):
+    started = time.monotonic()
+    babies = reports = 0
+
+    def progress(result):
+        nonlocal babies, reports
+        babies += result[0]
+        reports += result[1]
+        elapsed = time.monotonic() - started
+        print(
+            f"{babies} bebês, {reports} relatórios "
+            f"({elapsed:.1f}s, {babies / elapsed:.0f} bebês/s, {reports / elapsed:.0f} relatórios/s)",
+            flush=True,
+        )
+
+    ranges = baby_id_ranges(chunk_size)
+    if workers <= 1:
+        for id_range in ranges:
+            progress(build_range(id_range, start_date, end_date, rebuild_sessions))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [
+                pool.submit(build_range, id_range, start_date, end_date, rebuild_sessions)
+                for id_range in ranges
+            ]
+            for future in futures:
+                progress(future.result())
+
+    elapsed = time.monotonic() - started
+    print(f"Concluído: {babies} bebês, {reports} relatórios em {elapsed:.1f}s "
+          f"({start_date} a {end_date}).")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Constrói os relatórios diários em lote")
+    parser.add_argument("--date", type=date.fromisoformat, help="um único dia (padrão: ontem)")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat)
+    parser.add_argument("--to", dest="end", type=date.fromisoformat)
+    parser.add_argument("--chunk-size", type=int, default=500, help="bebês por lote")
+    parser.add_argument("--workers", type=int, default=1, help="processos em paralelo")
+    parser.add_argument("--rebuild-sessions", action="store_true",
+                        help="reconstrói sleep_sessions dos bebês antes dos relatórios")
+    args = parser.parse_args(argv)
+
+    if args.start or args.end:
+        if not (args.start and args.end) or args.date:
+            parser.error("use --date ou o par --from/--to")
+        start_date, end_date = args.start, args.end
+    else:
+        start_date = end_date = args.date or date.today() - timedelta(days=1)
+
+    run(start_date, end_date, args.chunk_size, args.workers, args.rebuild_sessions)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
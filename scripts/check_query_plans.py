@@ -0,0 +1,173 @@
+# scripts/check_query_plans.py
+"""
+Confere que as consultas quentes sobre events/sleep_sessions usam índice.
+
+Roda EXPLAIN (FORMAT JSON) de cada consulta e falha (exit 1) se algum nó
+fizer Seq Scan nessas tabelas. Por padrão desliga enable_seqscan na sessão, o
+que torna a checagem determinística mesmo num banco vazio de CI: se ainda
+assim o plano usar Seq Scan, é porque não existe índice que atenda a
+consulta. Com --real-planner o planner decide livremente (útil para rodar
+contra uma réplica com volume de produção).
+
+Uso:
+    python -m scripts.check_query_plans [--real-planner] [--verbose]
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from config.database import engine
+from app.models.event_model import Event
+from app.models.sleep_session_model import SleepSession
+from app.models import auth_models, baby_model, sleep_plan_model  # noqa: F401 (registra os mappers)
+
+
+HOT_TABLES = ("events", "sleep_sessions")
+
+
+def hot_queries(db: Session):
+    """Consultas espelhando as rotas de relatório, plano e listagem."""
+    baby_id, user_id = 1, 1
+    day_start = datetime.combine(datetime.now().date(), datetime.min.time())
+    day_end = datetime.combine(datetime.now().date(), datetime.max.time())
+    cutoff = datetime.now() - timedelta(days=3)
+
+    return {
+        # report_generator.refresh_daily_report (existe evento no dia?)
+        "eventos_do_dia": (
+            db.query(Event.id)
+            .filter(Event.baby_id == baby_id, Event.timestamp.between(day_start, day_end))
+            .limit(1)
+        ),
+        # report_generator.generate_daily_summary
+        "sessoes_do_dia": (
+            db.query(SleepSession)
+            .filter(
+                SleepSession.baby_id == baby_id,
+                SleepSession.status == "closed",
+                SleepSession.end_at.between(day_start, day_end),
+            )
+            .order_by(SleepSession.end_at)
+        ),
+        "mamadas_do_dia": (
+            db.query(func.count(Event.id))
+            .filter(
+                Event.baby_id == baby_id,
+                Event.type == "feed",
+                Event.timestamp.between(day_start, day_end),
+            )
+        ),
+        # routine_planner.compute_routine
+        "ultimo_evento_sono": (
+            db.query(Event)
+            .filter(Event.baby_id == baby_id, Event.type.in_(["sleep_start", "sleep_end"]))
+            .order_by(Event.timestamp.desc())
+            .limit(1)
+        ),
+        # routine_planner._get_historical_naps
+        "sonecas_historicas": (
+            db.query(SleepSession.start_at, SleepSession.end_at)
+            .filter(
+                SleepSession.baby_id == baby_id,
+                SleepSession.status == "closed",
+                SleepSession.start_at >= cutoff,
+            )
+            .order_by(SleepSession.start_at.asc())
+        ),
+        # sleep_sessions.resync_sleep_sessions (âncora do re-pareamento)
+        "ancora_sleep_end": (
+            db.query(Event.id, Event.timestamp)
+            .filter(Event.baby_id == baby_id, Event.type == "sleep_end",
+                    Event.timestamp < cutoff)
+            .order_by(Event.timestamp.desc(), Event.id.desc())
+            .limit(1)
+        ),
+        # rollups.refresh_event_rollups (recontagem usuário/dia)
+        "rollup_usuario_dia": (
+            db.query(Event.type, func.count(Event.id))
+            .filter(Event.user_id == user_id, Event.timestamp >= day_start,
+                    Event.timestamp < day_end)
+            .group_by(Event.type)
+        ),
+        # event_routes.list_events (página keyset)
+        "eventos_do_usuario": (
+            db.query(Event)
+            .filter(Event.user_id == user_id, Event.timestamp <= datetime.now())
+            .order_by(Event.timestamp.desc(), Event.id.desc())
+            .limit(51)
+        ),
+        # event_routes.list_events filtrando por bebê
+        "eventos_do_bebe": (
+            db.query(Event)
+            .filter(Event.user_id == user_id, Event.baby_id == baby_id,
+                    Event.timestamp >= cutoff)
+            .order_by(Event.timestamp.desc(), Event.id.desc())
+            .limit(51)
+        ),
+    }
+
+
+def _compile(query) -> str:
+    return str(query.statement.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    ))
+
+
+def _walk(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def check(real_planner: bool = False, verbose: bool = False) -> bool:
+    ok = True
+    with Session(engine) as db:
+        db.begin()
+        if not real_planner:
+            db.execute(text("SET LOCAL enable_seqscan = off"))
+
+        for name, query in hot_queries(db).items():
+            sql = _compile(query)
+            plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            root = plan[0]["Plan"]
+
+            scans = [
+                (n["Node Type"], n.get("Index Name"))
+                for n in _walk(root)
+                if n.get("Relation Name") in HOT_TABLES
+            ]
+            seq_scan = any(node_type == "Seq Scan" for node_type, _ in scans)
+            ok = ok and not seq_scan
+
+            status = "FALHOU" if seq_scan else "ok"
+            detail = ", ".join(f"{t} ({i})" if i else t for t, i in scans)
+            print(f"[{status}] {name}: {detail}")
+            if verbose:
+                print(sql)
+                print(json.dumps(root, indent=2))
+
+        db.rollback()
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--real-planner", action="store_true",
+                        help="não desliga enable_seqscan")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    return 0 if check(args.real_planner, args.verbose) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
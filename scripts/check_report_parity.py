@@ -0,0 +1,66 @@
+# scripts/check_report_parity.py
+"""
+Auditoria sobre um banco de verdade: confere a agregação SQL
+(aggregate_daily_reports) contra o cálculo por sessões de sono
+(generate_daily_summary) e contra os DailyReport gravados. Sai com código 1
+se houver divergência. A paridade com o loop em Python original fica em
+tests/test_report_parity.py.
+
+Uso:
+    python -m scripts.check_report_parity --from 2025-01-01 --to 2025-01-31 [--baby-id 42 ...]
+"""
+
+import argparse
+import sys
+from datetime import date
+
+from config.database import SessionLocal
+from app.models.daily_report_model import DailyReport
+from app.models import auth_models, sleep_plan_model  # noqa: F401 (registra os mappers)
+from app.utils.report_generator import aggregate_daily_reports, generate_daily_summary
+
+FIELDS = ("total_sleep_minutes", "total_feeds", "longest_nap_minutes")
+
+
+def check(start: date, end: date, baby_ids=None) -> int:
+    db = SessionLocal()
+    mismatches = 0
+    try:
+        from_sql = aggregate_daily_reports(db, start, end, baby_ids)
+
+        stored_query = db.query(DailyReport).filter(DailyReport.date.between(start, end))
+        if baby_ids is not None:
+            stored_query = stored_query.filter(DailyReport.baby_id.in_(baby_ids))
+        stored = {
+            (r.baby_id, r.date): {f: getattr(r, f) for f in FIELDS} for r in stored_query
+        }
+
+        for key in sorted(from_sql.keys() | stored.keys()):
+            baby_id, day = key
+            sql = from_sql.get(key)
+            python = generate_daily_summary(db, baby_id, day) if sql else None
+            if sql != python:
+                mismatches += 1
+                print(f"[python] bebê {baby_id} {day}: sql={sql} python={python}")
+            if stored.get(key) != sql:
+                mismatches += 1
+                print(f"[gravado] bebê {baby_id} {day}: sql={sql} daily_reports={stored.get(key)}")
+
+        print(f"{len(from_sql)} bebê/dia conferidos, {mismatches} divergência(s).")
+    finally:
+        db.close()
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paridade SQL x Python dos relatórios diários")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, required=True)
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, required=True)
+    parser.add_argument("--baby-id", type=int, action="append")
+    args = parser.parse_args(argv)
+
+    return 1 if check(args.start, args.end, args.baby_id) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
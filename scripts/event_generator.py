@@ -0,0 +1,275 @@
+# scripts/event_generator.py
+"""
+Gerador de tráfego sintético parecido com o dos nossos usuários.
+
+Eventos: por bebê e por dia, sonecas na quantidade de
+_determine_naps_per_day separadas pela janela de vigília de
+get_wake_window_minutes (a última do dia mais longa), sonecas curtas de vez
+em quando, mamadas no intervalo da idade e sono noturno com despertares
+(muitos no recém-nascido, raros depois do primeiro ano).
+
+Envio: o app manda cada evento logo depois de registrado, mas às vezes fica
+offline por horas e sobe tudo de uma vez num lote atrasado; ao abrir o app
+os pais consultam o dashboard, que também é consultado de tempos em tempos
+durante o dia.
+
+Tudo é gerado sob demanda (geradores), com sementes derivadas de
+(seed, usuário, bebê, dia): a mesma semente produz o mesmo tráfego, e
+milhões de eventos não passam pela memória de uma vez.
+
+Uso (JSON lines na saída padrão):
+    python -m scripts.event_generator --users 1000 --days 30 [--seed 1] [--actions]
+"""
+
+import argparse
+import heapq
+import json
+import random
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from app.utils.routine_planner import _determine_naps_per_day, _nap_duration_fallback
+from app.utils.wake_window_calculator import get_wake_window_minutes
+
+# por evento registrado: chance de o app ficar offline a partir dali
+OFFLINE_PROBABILITY = 0.03
+OFFLINE_HOURS = (1, 10)
+# chance de abrir o dashboard logo depois de registrar algo
+POLL_AFTER_UPLOAD = 0.6
+# intervalo médio entre aberturas "espontâneas" do dashboard (acordados)
+POLL_INTERVAL_MINUTES = 45
+
+UPLOAD = "upload"
+DASHBOARD = "dashboard"
+
+
+@dataclass(frozen=True)
+class BabyProfile:
+    user: int
+    baby: int
+    birth_date: date
+
+
+@dataclass(frozen=True)
+class GeneratedEvent:
+    type: str
+    timestamp: datetime
+    # estável entre execuções: reenvios do mesmo evento viram duplicata
+    idempotency_key: str
+
+
+@dataclass(frozen=True)
+class Action:
+    at: datetime
+    kind: str
+    user: int
+    baby: Optional[int] = None
+    events: Tuple[GeneratedEvent, ...] = ()
+
+    def __lt__(self, other: "Action"):
+        return (self.at, self.user) < (other.at, other.user)
+
+
+def _rng(seed: int, *parts) -> random.Random:
+    # semente em texto: determinística, independe do PYTHONHASHSEED
+    return random.Random(":".join(str(p) for p in (seed, *parts)))
+
+
+def _minutes(rng: random.Random, low: int, high: int) -> timedelta:
+    return timedelta(minutes=rng.randint(low, high))
+
+
+def _feed_interval_minutes(age_days: int) -> int:
+    if age_days < 90:
+        return 150
+    if age_days < 180:
+        return 180
+    if age_days < 365:
+        return 210
+    return 240
+
+
+def _night_wakings(rng: random.Random, age_days: int) -> int:
+    expected = 3.0 if age_days < 90 else 2.0 if age_days < 180 else 1.0 if age_days < 365 else 0.3
+    # Poisson pela soma de Bernoullis: barato e determinístico
+    return sum(1 for _ in range(6) if rng.random() < expected / 6)
+
+
+def day_events(seed: int, profile: BabyProfile, day: date) -> List[Tuple[str, datetime]]:
+    """
+    Eventos (tipo, horário) do dia `day`, do despertar da manhã até o fim
+    da noite seguinte (despertares noturnos entram no dia em que o bebê
+    foi dormir). Ordenados por horário.
+    """
+    rng = _rng(seed, profile.user, profile.baby, day.isoformat())
+    age_days = max(0, (day - profile.birth_date).days)
+    naps = _determine_naps_per_day(age_days)
+    wake_window = get_wake_window_minutes(age_days)
+    nap_minutes = _nap_duration_fallback(age_days)
+    midnight = datetime.combine(day, datetime.min.time())
+
+    events = []
+    wake_up = midnight + timedelta(hours=6) + _minutes(rng, -30, 75)
+    events.append(("sleep_end", wake_up))
+
+    clock = wake_up
+    for n in range(naps):
+        # vez ou outra a última soneca é pulada
+        if n == naps - 1 and naps > 1 and rng.random() < 0.15:
+            break
+        clock += timedelta(minutes=wake_window) + _minutes(rng, -15, 20)
+        if rng.random() < 0.15:
+            duration = rng.randint(20, 40)  # soneca curta (acordou no meio)
+        else:
+            duration = max(25, nap_minutes + rng.randint(-35, 25))
+        events.append(("sleep_start", clock))
+        clock += timedelta(minutes=duration)
+        events.append(("sleep_end", clock))
+
+    # a última janela do dia é a mais longa
+    bedtime = max(
+        clock + timedelta(minutes=int(wake_window * 1.25)),
+        midnight + timedelta(hours=19) + _minutes(rng, -45, 45),
+    )
+    events.append(("sleep_start", bedtime))
+
+    feed_interval = _feed_interval_minutes(age_days)
+    feed = wake_up + _minutes(rng, 5, 20)
+    while feed < bedtime - timedelta(minutes=30):
+        events.append(("feed", feed))
+        feed += timedelta(minutes=feed_interval) + _minutes(rng, -30, 30)
+    events.append(("feed", bedtime - _minutes(rng, 10, 25)))
+
+    night = bedtime
+    dawn = midnight + timedelta(days=1, hours=5)
+    # despertar mais cedo possível do dia seguinte (wake_up acima, -30 min):
+    # o bebê tem de voltar a dormir antes dele
+    next_wake_up = midnight + timedelta(days=1, hours=5, minutes=30)
+    for _ in range(_night_wakings(rng, age_days)):
+        night += _minutes(rng, 90, 240)
+        if night >= dawn:
+            break
+        events.append(("sleep_end", night))
+        events.append(("feed", night + _minutes(rng, 1, 5)))
+        night = min(night + _minutes(rng, 15, 45), next_wake_up - timedelta(minutes=1))
+        events.append(("sleep_start", night))
+
+    events.sort(key=itemgetter(1))
+    return events
+
+
+def baby_events(seed: int, profile: BabyProfile, start: datetime, end: datetime) -> Iterator[GeneratedEvent]:
+    """Eventos de um bebê com horário em [start, end), em ordem."""
+    day = start.date() - timedelta(days=1)  # a noite anterior pode cair em start
+    while datetime.combine(day, datetime.min.time()) < end:
+        for index, (type_, timestamp) in enumerate(day_events(seed, profile, day)):
+            if start <= timestamp < end:
+                key = f"g{seed}-{profile.user}-{profile.baby}-{day:%Y%m%d}-{index}"
+                yield GeneratedEvent(type_, timestamp, key)
+        day += timedelta(days=1)
+
+
+def baby_actions(seed: int, profile: BabyProfile, start: datetime, end: datetime) -> Iterator[Action]:
+    """
+    Envios (e consultas ao dashboard em seguida) de um bebê, em ordem de
+    horário de envio. Eventos registrados offline sobem juntos, num lote
+    atrasado, quando a conexão volta.
+    """
+    rng = _rng(seed, profile.user, profile.baby, "envio")
+    pending: List[GeneratedEvent] = []
+    offline_until = None
+    last = start
+
+    def emit(at: datetime, events):
+        nonlocal last
+        at = max(at, last)
+        yield Action(at, UPLOAD, profile.user, profile.baby, tuple(events))
+        last = at
+        if rng.random() < POLL_AFTER_UPLOAD:
+            last = at + timedelta(seconds=rng.randint(2, 20))
+            yield Action(last, DASHBOARD, profile.user)
+
+    for event in baby_events(seed, profile, start, end):
+        if offline_until is not None and event.timestamp >= offline_until:
+            yield from emit(offline_until, pending)
+            pending, offline_until = [], None
+        if offline_until is not None:
+            pending.append(event)
+        elif rng.random() < OFFLINE_PROBABILITY:
+            offline_until = event.timestamp + timedelta(hours=rng.uniform(*OFFLINE_HOURS))
+            pending.append(event)
+        else:
+            yield from emit(event.timestamp + timedelta(seconds=rng.randint(1, 60)), [event])
+
+    if pending:
+        yield from emit(offline_until, pending)
+
+
+def user_polls(seed: int, user: int, start: datetime, end: datetime) -> Iterator[Action]:
+    """Aberturas do dashboard sem envio, mais frequentes de dia."""
+    rng = _rng(seed, user, "dashboard")
+    clock = start
+    while True:
+        awake = 6 <= clock.hour < 22
+        rate = 1 / POLL_INTERVAL_MINUTES if awake else 1 / (POLL_INTERVAL_MINUTES * 6)
+        clock += timedelta(minutes=rng.expovariate(rate))
+        if clock >= end:
+            return
+        yield Action(clock, DASHBOARD, user)
+
+
+def population(seed: int, users: int, babies_per_user: int, first_day: date) -> List[BabyProfile]:
+    """Bebês de recém-nascido a ~2 anos em `first_day`, passando por todas as faixas."""
+    rng = _rng(seed, "populacao")
+    return [
+        BabyProfile(user, baby, first_day - timedelta(days=rng.randint(7, 700)))
+        for user in range(users)
+        for baby in range(babies_per_user)
+    ]
+
+
+def traffic(seed: int, profiles: Iterable[BabyProfile], start: datetime, end: datetime) -> Iterator[Action]:
+    """Todas as ações da população, intercaladas em ordem de horário."""
+    profiles = list(profiles)
+    streams = [baby_actions(seed, profile, start, end) for profile in profiles]
+    streams += [user_polls(seed, user, start, end) for user in sorted({p.user for p in profiles})]
+    return heapq.merge(*streams)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera eventos/ações sintéticos em JSON lines")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--babies-per-user", type=int, default=1)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--actions", action="store_true",
+                        help="emite envios/consultas em vez dos eventos crus")
+    args = parser.parse_args(argv)
+
+    end = datetime.combine(date.today(), datetime.min.time())
+    start = end - timedelta(days=args.days)
+    profiles = population(args.seed, args.users, args.babies_per_user, start.date())
+
+    write = sys.stdout.write
+    if args.actions:
+        for action in traffic(args.seed, profiles, start, end):
+            write(json.dumps({
+                "at": action.at.isoformat(), "kind": action.kind, "user": action.user,
+                "baby": action.baby, "events": len(action.events),
+            }) + "\n")
+        return 0
+
+    for profile in profiles:
+        for event in baby_events(args.seed, profile, start, end):
+            write(json.dumps({
+                "user": profile.user, "baby": profile.baby, "type": event.type,
+                "timestamp": event.timestamp.isoformat(), "idempotency_key": event.idempotency_key,
+            }) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
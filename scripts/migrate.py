@@ -0,0 +1,140 @@
+# scripts/migrate.py
+"""
+Runner de migrações versionadas.
+
+Cada arquivo em migrations/ tem o formato NNNN_descricao.sql e é aplicado
+uma única vez, em ordem, registrando a versão na tabela schema_migrations.
+
+Arquivos cuja primeira linha é "-- migrate: no-transaction" rodam em
+autocommit, um comando por vez (necessário para CREATE INDEX CONCURRENTLY
+em tabela viva). Os demais rodam inteiros dentro de uma transação.
+
+Uso:
+    python -m scripts.migrate            # aplica as pendentes
+    python -m scripts.migrate status     # lista aplicadas/pendentes
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+from config.database import engine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+FILENAME_RE = re.compile(r"^(\d{4})_[\w-]+\.sql$")
+
+# Evita que um ALTER/CREATE fique enfileirado atrás de transações longas
+# segurando lock e travando todo o tráfego da tabela.
+LOCK_TIMEOUT = "5s"
+
+
+def discover_migrations():
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        match = FILENAME_RE.match(path.name)
+        if not match:
+            raise SystemExit(f"Nome de migração inválido: {path.name}")
+        migrations.append((match.group(1), path))
+    return migrations
+
+
+def _split_statements(sql: str):
+    """Divide um arquivo no-transaction em comandos simples (sem blocos DO)."""
+    body = "\n".join(
+        line for line in sql.splitlines() if not line.strip().startswith("--")
+    )
+    return [stmt.strip() for stmt in body.split(";") if stmt.strip()]
+
+
+def _ensure_table(conn):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version VARCHAR(16) PRIMARY KEY,"
+        " name VARCHAR(255) NOT NULL,"
+        " applied_at TIMESTAMP NOT NULL DEFAULT now())"
+    ))
+
+
+def applied_versions():
+    with engine.begin() as conn:
+        _ensure_table(conn)
+        rows = conn.execute(text("SELECT version FROM schema_migrations"))
+        return {row.version for row in rows}
+
+
+def _invalid_indexes(conn):
+    rows = conn.execute(text(
+        "SELECT indexrelid::regclass::text AS name FROM pg_index WHERE NOT indisvalid"
+    ))
+    return [row.name for row in rows]
+
+
+def apply_migration(version: str, path: Path):
+    sql = path.read_text(encoding="utf-8")
+
+    if sql.lstrip().startswith(NO_TRANSACTION_MARKER):
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(f"SET lock_timeout = '{LOCK_TIMEOUT}'"))
+            for statement in _split_statements(sql):
+                conn.exec_driver_sql(statement)
+
+            # Um CONCURRENTLY que falha deixa o índice INVALID para trás;
+            # não registramos a versão até que ele seja removido.
+            invalid = _invalid_indexes(conn)
+            if invalid:
+                raise SystemExit(
+                    f"{path.name}: índices inválidos {invalid}. "
+                    "Remova-os com DROP INDEX CONCURRENTLY e rode novamente."
+                )
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+                {"v": version, "n": path.name},
+            )
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        conn.exec_driver_sql(sql)
+        conn.execute(
+            text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+            {"v": version, "n": path.name},
+        )
+
+
+def upgrade():
+    done = applied_versions()
+    pending = [(v, p) for v, p in discover_migrations() if v not in done]
+    if not pending:
+        print("Nenhuma migração pendente.")
+        return
+
+    for version, path in pending:
+        print(f"Aplicando {path.name}...", flush=True)
+        apply_migration(version, path)
+    print(f"{len(pending)} migração(ões) aplicada(s).")
+
+
+def status():
+    done = applied_versions()
+    for version, path in discover_migrations():
+        mark = "aplicada" if version in done else "pendente"
+        print(f"{path.name:<60} {mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrações do banco NanaFácil")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "status"])
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        status()
+    else:
+        upgrade()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
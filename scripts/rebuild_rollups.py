@@ -0,0 +1,53 @@
+# scripts/rebuild_rollups.py
+"""
+Backfill/reconstrução dos rollups de eventos do admin (user_event_counts e
+user_day_event_counts), em lotes de usuários: cada lote é um DELETE e um
+INSERT ... SELECT agrupado numa transação curta.
+
+Uso:
+    python -m scripts.rebuild_rollups [--chunk-size 500] [--user-id 42 ...]
+"""
+
+import argparse
+import sys
+import time
+
+from config.database import SessionLocal
+from app.models.auth_models import User
+from app.models import baby_model, event_model, sleep_plan_model  # noqa: F401 (registra os mappers)
+from app.utils.rollups import rebuild_event_rollups
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconstrói os rollups de eventos")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--user-id", type=int, action="append",
+                        help="limita a estes usuários (pode repetir)")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    started = time.monotonic()
+    total_users = total_rows = 0
+    last_id = 0
+    try:
+        while True:
+            query = db.query(User.id).filter(User.id > last_id)
+            if args.user_id:
+                query = query.filter(User.id.in_(args.user_id))
+            ids = [row.id for row in query.order_by(User.id).limit(args.chunk_size)]
+            if not ids:
+                break
+
+            total_rows += rebuild_event_rollups(db, ids)
+            db.commit()
+
+            total_users += len(ids)
+            last_id = ids[-1]
+            print(f"{total_users} usuários, {total_rows} linhas dia/tipo "
+                  f"({time.monotonic() - started:.1f}s)", flush=True)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
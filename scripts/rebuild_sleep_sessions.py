@@ -0,0 +1,52 @@
+# scripts/rebuild_sleep_sessions.py
+"""
+Backfill/reconstrução da tabela sleep_sessions, em lotes de bebês
+(cada lote é um INSERT ... SELECT com LAG/LEAD numa transação curta).
+
+Uso:
+    python -m scripts.rebuild_sleep_sessions [--chunk-size 500] [--baby-id 42 ...]
+"""
+
+import argparse
+import sys
+import time
+
+from config.database import SessionLocal
+from app.models.baby_model import Baby
+from app.models import auth_models, event_model, sleep_plan_model  # noqa: F401 (registra os mappers)
+from app.utils.sleep_sessions import rebuild_sleep_sessions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconstrói sleep_sessions")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--baby-id", type=int, action="append",
+                        help="limita a estes bebês (pode repetir)")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    started = time.monotonic()
+    total_babies = total_sessions = 0
+    last_id = 0
+    try:
+        while True:
+            query = db.query(Baby.id).filter(Baby.id > last_id)
+            if args.baby_id:
+                query = query.filter(Baby.id.in_(args.baby_id))
+            ids = [row.id for row in query.order_by(Baby.id).limit(args.chunk_size)]
+            if not ids:
+                break
+
+            total_sessions += rebuild_sleep_sessions(db, ids)
+            db.commit()
+
+            total_babies += len(ids)
+            last_id = ids[-1]
+            print(f"{total_babies} bebês, {total_sessions} sessões "
+                  f"({time.monotonic() - started:.1f}s)", flush=True)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+# scripts/replay_load.py
+"""
+Replay de carga: envia à API o tráfego de scripts/event_generator.py
+(envios ao vivo, lotes atrasados de quando o app ficou offline e consultas
+ao dashboard com If-None-Match, como o app faz) para os usuários criados
+por scripts/bench_seed.py.
+
+O tráfego cobre as últimas --hours horas (use bench_seed --holdout-hours
+com a mesma semente para que seja a continuação dos dados do banco). A
+chegada das ações pode:
+  - seguir a linha do tempo gerada, comprimida por --speedup (padrão);
+  - seguir um processo de Poisson com --rate ações/s (ordem preservada);
+  - ir o mais rápido possível com --max-speed.
+--concurrency limita as requisições em andamento; quando ele satura, as
+chegadas atrasam e o atraso aparece no relatório.
+
+Sem --url roda dentro do processo (ASGI via httpx) contra a DATABASE_URL;
+com --url, contra um servidor de pé (login por senha).
+
+Uso:
+    python -m scripts.bench_seed --users 200 --days 14 --holdout-hours 24
+    python -m scripts.replay_load --users 200 --hours 24 --speedup 600 --concurrency 32
+    python -m scripts.replay_load --users 200 --rate 150 --url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import httpx
+
+from app.routes.event_routes import MAX_BATCH_SIZE
+from scripts.bench_seed import BENCH_PASSWORD, bench_email
+from scripts.event_generator import DASHBOARD, UPLOAD, Action, BabyProfile, traffic
+
+REPORT_EVERY_SECONDS = 10
+
+
+class ReplayClient:
+    """Estado de cliente por usuário: token, bebês e último ETag do dashboard."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.headers: Dict[int, dict] = {}
+        self.baby_ids: Dict[tuple, int] = {}
+        self.etags: Dict[int, str] = {}
+
+    async def load_users(self, users: int, local_tokens: bool, concurrency: int) -> List[BabyProfile]:
+        limit = asyncio.Semaphore(concurrency)
+        tokens = _local_tokens(users) if local_tokens else {}
+
+        async def load(index: int):
+            async with limit:
+                if index in tokens:
+                    token = tokens[index]
+                else:
+                    response = await self.client.post("/api/auth/login", json={
+                        "email": bench_email(index), "password": BENCH_PASSWORD,
+                    })
+                    response.raise_for_status()
+                    token = response.json()["access_token"]
+                self.headers[index] = {"Authorization": f"Bearer {token}"}
+                response = await self.client.get("/api/babies/me", headers=self.headers[index])
+                response.raise_for_status()
+                babies = sorted(response.json(), key=lambda baby: baby["id"])
+                profiles = []
+                for position, baby in enumerate(babies):
+                    self.baby_ids[(index, position)] = baby["id"]
+                    profiles.append(BabyProfile(
+                        index, position, datetime.strptime(baby["birth_date"], "%Y-%m-%d").date()
+                    ))
+                return profiles
+
+        loaded = await asyncio.gather(*(load(index) for index in range(users)))
+        return [profile for profiles in loaded for profile in profiles]
+
+    async def send(self, action: Action) -> str:
+        """Executa a ação; devolve o rótulo usado no relatório."""
+        headers = self.headers[action.user]
+        if action.kind == DASHBOARD:
+            etag = self.etags.get(action.user)
+            conditional = {**headers, "If-None-Match": etag} if etag else headers
+            response = await self.client.get("/api/dashboard", headers=conditional)
+            if response.status_code == 304:
+                return "dashboard (304)"
+            response.raise_for_status()
+            self.etags[action.user] = response.headers.get("etag")
+            return "dashboard"
+
+        baby_id = self.baby_ids[(action.user, action.baby)]
+        body = [
+            {"baby_id": baby_id, "type": event.type, "timestamp": event.timestamp.isoformat(),
+             "idempotency_key": event.idempotency_key}
+            for event in action.events
+        ]
+        for offset in range(0, len(body), MAX_BATCH_SIZE):
+            response = await self.client.post(
+                "/api/events", headers=headers, json=body[offset:offset + MAX_BATCH_SIZE]
+            )
+            response.raise_for_status()
+        return "upload (lote)" if len(body) > 1 else "upload"
+
+
+def _local_tokens(users: int) -> Dict[int, str]:
+    """Tokens assinados aqui mesmo (em processo): evita o bcrypt do login."""
+    from config.database import SessionLocal
+    from app.models.auth_models import User
+    from app.models import baby_model, event_model, sleep_plan_model  # noqa: F401 (registra os mappers)
+    from app.utils.magic import configure_jwt, jwt_for_user
+
+    configure_jwt()
+    emails = {bench_email(index): index for index in range(users)}
+    db = SessionLocal()
+    try:
+        rows = db.query(User.id, User.email, User.role).filter(User.email.in_(emails)).all()
+    finally:
+        db.close()
+    return {
+        emails[row.email]: jwt_for_user(user_id=row.id, email=row.email, role=row.role)
+        for row in rows
+    }
+
+
+def arrivals(actions, args, origin: datetime):
+    """(ação, segundos após o início em que deve sair), conforme o modo de chegada."""
+    if args.max_speed:
+        for action in actions:
+            yield action, 0.0
+    elif args.rate:
+        rng, due = random.Random(args.seed), 0.0
+        for action in actions:
+            due += rng.expovariate(args.rate)
+            yield action, due
+    else:
+        for action in actions:
+            yield action, (action.at - origin).total_seconds() / args.speedup
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lag: List[float] = []
+        self.events = 0
+
+    def summary(self, elapsed: float):
+        print(f"\n{'ação':<18} {'n':>7} {'erros':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8}")
+        for kind in sorted(set(self.latencies) | set(self.errors)):
+            values = self.latencies[kind]
+            p50, p95, p99 = _percentiles(values)
+            print(f"{kind:<18} {len(values):>7} {self.errors[kind]:>6} {p50:>8.1f} {p95:>8.1f} "
+                  f"{p99:>8.1f} {len(values) / elapsed:>8.1f}")
+        _, lag95, lag99 = _percentiles(self.lag)
+        print(f"\n{self.events} eventos enviados em {elapsed:.1f}s; "
+              f"atraso de chegada p95 {lag95:.0f} ms, p99 {lag99:.0f} ms")
+
+
+def _percentiles(values: List[float]):
+    if len(values) < 2:
+        value = values[0] * 1000 if values else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+async def replay(args) -> Stats:
+    if args.url:
+        transport, base_url = None, args.url.rstrip("/")
+    else:
+        from anyio import to_thread
+        import main as api
+        from config.settings import THREADPOOL_SIZE
+
+        to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+        transport, base_url = httpx.ASGITransport(app=api.app), "http://replay"
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits,
+                                 timeout=60) as http:
+        client = ReplayClient(http)
+        profiles = await client.load_users(args.users, local_tokens=not args.url,
+                                           concurrency=args.concurrency)
+
+        end = datetime.now()
+        origin = end - timedelta(hours=args.hours)
+        actions = traffic(args.seed, profiles, origin, end)
+        stats = Stats()
+        in_flight = asyncio.Semaphore(args.concurrency)
+        tasks = set()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        next_report = started + REPORT_EVERY_SECONDS
+        sent = 0
+
+        async def run(action: Action, due: float):
+            try:
+                request_started = loop.time()
+                stats.lag.append(max(0.0, request_started - due))
+                try:
+                    kind = await client.send(action)
+                except httpx.HTTPError as exc:
+                    kind = action.kind
+                    stats.errors[kind] += 1
+                    if stats.errors[kind] == 1:
+                        print(f"  {kind}: {exc}", flush=True)
+                    return
+                stats.latencies[kind].append(loop.time() - request_started)
+                if action.kind == UPLOAD:
+                    stats.events += len(action.events)
+            finally:
+                in_flight.release()
+
+        for action, offset in arrivals(actions, args, origin):
+            # lotes que voltariam depois de agora ainda não subiram
+            if action.at > end:
+                continue
+            if args.max_actions and sent >= args.max_actions:
+                break
+            due = started + offset
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if args.duration and loop.time() - started >= args.duration:
+                break
+            await in_flight.acquire()
+            task = asyncio.create_task(run(action, due))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            sent += 1
+
+            if loop.time() >= next_report:
+                next_report += REPORT_EVERY_SECONDS
+                done = sum(len(v) for v in stats.latencies.values())
+                print(f"{loop.time() - started:6.0f}s  {done} ações, {stats.events} eventos, "
+                      f"{sum(stats.errors.values())} erros, simulado até {action.at:%d/%m %H:%M}",
+                      flush=True)
+
+        await asyncio.gather(*tasks)
+        elapsed = loop.time() - started
+
+    if not args.url:
+        from config.database import async_engine
+        await async_engine.dispose()
+    stats.summary(elapsed)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay de carga com tráfego sintético")
+    parser.add_argument("--users", type=int, default=50,
+                        help="usuários bench{i} (os do bench_seed) que participam")
+    parser.add_argument("--hours", type=float, default=24, help="janela de tráfego, terminando agora")
+    parser.add_argument("--seed", type=int, default=1, help="a mesma do bench_seed")
+    parser.add_argument("--concurrency", type=int, default=32)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--speedup", type=float, default=600,
+                      help="segundos simulados por segundo real (padrão 600)")
+    mode.add_argument("--rate", type=float, help="chegadas de Poisson, ações por segundo")
+    mode.add_argument("--max-speed", action="store_true", help="sem espera entre chegadas")
+    parser.add_argument("--max-actions", type=int, help="para depois de N ações")
+    parser.add_argument("--duration", type=float, help="para depois de N segundos")
+    parser.add_argument("--url", help="servidor alvo (padrão: app em processo)")
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(replay(args))
+    return 1 if any(stats.errors.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
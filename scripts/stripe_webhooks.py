@@ -0,0 +1,102 @@
+# scripts/stripe_webhooks.py
+"""
+Ferramentas offline para o espelho local de assinaturas Stripe.
+
+    python -m scripts.stripe_webhooks replay scripts/fixtures/stripe/*.json [--customer cus_x] [--url http://...]
+        Assina cada fixture com STRIPE_WEBHOOK_SECRET (mesmo esquema do Stripe)
+        e envia para /api/payment/webhook. Sem --url usa o app em processo.
+
+    python -m scripts.stripe_webhooks sync
+        Backfill: percorre as assinaturas no Stripe e grava na tabela
+        subscriptions (rodar uma vez ao ativar o webhook).
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import sys
+import time
+from pathlib import Path
+
+from config.settings import STRIPE_WEBHOOK_SECRET
+
+WEBHOOK_PATH = "/api/payment/webhook"
+
+
+def sign_payload(payload: str, secret: str, timestamp: int = None) -> str:
+    """Gera o header Stripe-Signature (t=...,v1=HMAC-SHA256(secret, "t.payload"))."""
+    timestamp = timestamp or int(time.time())
+    signed = f"{timestamp}.{payload}".encode()
+    digest = hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def replay(paths, customer=None, url=None):
+    if not STRIPE_WEBHOOK_SECRET:
+        raise SystemExit("Defina STRIPE_WEBHOOK_SECRET")
+
+    if url:
+        import requests
+        post = lambda body, headers: requests.post(url.rstrip("/") + WEBHOOK_PATH, data=body, headers=headers)
+    else:
+        from fastapi.testclient import TestClient
+        from main import app
+        client = TestClient(app)
+        post = lambda body, headers: client.post(WEBHOOK_PATH, content=body, headers=headers)
+
+    for path in paths:
+        event = json.loads(Path(path).read_text(encoding="utf-8"))
+        if customer:
+            event["data"]["object"]["customer"] = customer
+        body = json.dumps(event)
+        headers = {
+            "Content-Type": "application/json",
+            "Stripe-Signature": sign_payload(body, STRIPE_WEBHOOK_SECRET),
+        }
+        response = post(body, headers)
+        print(f"{Path(path).name}: {response.status_code} {response.text}")
+
+
+def sync():
+    import stripe
+    from config.database import SessionLocal
+    from app.utils.subscriptions import upsert_subscription
+    import app.api.endpoints.auth_credentials  # noqa: F401 (configura stripe.api_key)
+
+    db = SessionLocal()
+    count = 0
+    try:
+        for sub in stripe.Subscription.list(status="all", limit=100).auto_paging_iter():
+            # "created" da própria assinatura: qualquer webhook posterior prevalece
+            upsert_subscription(db, sub, sub["created"])
+            count += 1
+            if count % 500 == 0:
+                db.commit()
+                print(f"{count} assinaturas sincronizadas...", flush=True)
+        db.commit()
+    finally:
+        db.close()
+    print(f"{count} assinaturas sincronizadas.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Webhooks/assinaturas Stripe")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_replay = sub.add_parser("replay", help="envia fixtures assinadas ao webhook")
+    p_replay.add_argument("paths", nargs="+")
+    p_replay.add_argument("--customer", help="sobrescreve o customer das fixtures")
+    p_replay.add_argument("--url", help="base URL da API (padrão: app em processo)")
+
+    sub.add_parser("sync", help="backfill da tabela subscriptions a partir do Stripe")
+
+    args = parser.parse_args(argv)
+    if args.command == "replay":
+        replay(args.paths, args.customer, args.url)
+    else:
+        sync()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
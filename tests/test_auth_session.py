@@ -0,0 +1,107 @@
+# tests/test_auth_session.py
+"""
+As dependências de autenticação devolvem a conexão ao pool logo depois de
+carregar o principal: a rota pode abrir uma segunda sessão (leitura) e duas
+conexões presas por requisição travam o pool saturado.
+
+Roda num SQLite em memória, sem servidor:
+    python -m unittest tests.test_auth_session
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "segredo-de-teste")
+
+import asyncio
+import unittest
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from config.database import Base
+from app.dependencies.auth import get_current_user, get_current_user_async, invalidate_principal
+from app.models.auth_models import User
+from app.models import (  # noqa: F401 (registra os mappers)
+    baby_model, daily_report_model, deletion_job_model, event_model, outbox_model,
+    request_profile_model, rollup_model, sleep_plan_model, sleep_session_model,
+    subscription_model,
+)
+from app.utils.magic import configure_jwt, jwt_for_user
+
+
+def _request(method: str = "GET") -> Request:
+    return Request({"type": "http", "method": method, "headers": []})
+
+
+class AuthSessionTest(unittest.TestCase):
+    def setUp(self):
+        configure_jwt()
+        self.engine = create_engine("sqlite://", poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.db = Session(self.engine)
+        user = User(email="sessao@example.com", password_hash="x")
+        self.db.add(user)
+        self.db.commit()
+        self.user_id = user.id
+        self.token = jwt_for_user(user_id=user.id, email=user.email, role=user.role)
+        invalidate_principal(self.user_id)
+
+    def tearDown(self):
+        invalidate_principal(self.user_id)
+        self.db.close()
+        self.engine.dispose()
+
+    def authenticate(self, token=None):
+        return get_current_user(_request(), Response(), token=token or self.token, db=self.db)
+
+    def test_lookup_releases_the_connection(self):
+        self.assertEqual(self.authenticate().id, self.user_id)
+        self.assertFalse(self.db.in_transaction())
+
+    def test_cached_principal_releases_the_connection(self):
+        self.authenticate()
+        self.db.execute(User.__table__.select())  # a rota já usou a sessão
+        self.assertTrue(self.db.in_transaction())
+        self.assertEqual(self.authenticate().id, self.user_id)
+        self.assertFalse(self.db.in_transaction())
+
+    def test_unknown_user_releases_the_connection(self):
+        token = jwt_for_user(user_id=self.user_id + 1, email="x@example.com", role="parent")
+        with self.assertRaises(HTTPException) as raised:
+            self.authenticate(token)
+        self.assertEqual(raised.exception.status_code, 401)
+        self.assertFalse(self.db.in_transaction())
+
+    def test_session_stays_usable_for_the_route(self):
+        self.authenticate()
+        user = self.db.get(User, self.user_id)
+        user.role = "admin"
+        self.db.commit()
+        self.assertEqual(self.db.get(User, self.user_id).role, "admin")
+
+    def test_async_lookup_releases_the_connection(self):
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with AsyncSession(engine) as db:
+                db.add(User(id=self.user_id, email="sessao@example.com", password_hash="x"))
+                await db.commit()
+                principal = await get_current_user_async(
+                    _request(), Response(), token=self.token, db=db
+                )
+                in_transaction = db.in_transaction()
+            await engine.dispose()
+            return principal, in_transaction
+
+        principal, in_transaction = asyncio.run(run())
+        self.assertEqual(principal.id, self.user_id)
+        self.assertFalse(in_transaction)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+# tests/test_report_parity.py
+"""
+Paridade de aggregate_daily_reports (SQL) com o loop em Python que o
+POST /report/generate usava antes: eventos do dia ordenados por horário,
+um sleep_end fecha a soneca aberta pelo último sleep_start.
+
+A única diferença intencional é a das sonecas que cruzam a meia-noite
+(user-008): o loop antigo, preso ao dia, as descartava; agora contam no dia
+em que terminam. A referência abaixo é o loop antigo alimentado com o
+último evento de sono da véspera antes dos eventos do dia.
+
+Roda num SQLite em memória, sem servidor:
+    python -m unittest tests.test_report_parity
+"""
+
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import random
+import unittest
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from config.database import Base
+from app.models.auth_models import User
+from app.models.baby_model import Baby
+from app.models.event_model import Event
+from app.models import (  # noqa: F401 (registra os mappers)
+    daily_report_model, deletion_job_model, outbox_model, request_profile_model,
+    rollup_model, sleep_plan_model, sleep_session_model, subscription_model,
+)
+from app.utils.report_generator import aggregate_daily_reports
+
+SLEEP_TYPES = ("sleep_start", "sleep_end")
+FIRST_DAY = date(2026, 3, 1)
+DAYS = 6
+
+
+def original_loop(events):
+    """O cálculo de report_routes.generate_daily_report antes do SQL."""
+    last_sleep = None
+    total_sleep_minutes = 0
+    longest_nap = 0
+
+    for event in sorted(events, key=lambda e: e.timestamp):
+        if event.type == "sleep_start":
+            last_sleep = event.timestamp
+        elif event.type == "sleep_end" and last_sleep:
+            duration = int((event.timestamp - last_sleep).total_seconds() / 60)
+            total_sleep_minutes += duration
+            longest_nap = max(longest_nap, duration)
+            last_sleep = None
+
+    total_feeds = sum(1 for e in events if e.type == "feed")
+    return {
+        "total_sleep_minutes": total_sleep_minutes,
+        "total_feeds": total_feeds,
+        "longest_nap_minutes": longest_nap,
+    }
+
+
+def reference(events, baby_id, day):
+    day_start = datetime.combine(day, datetime.min.time())
+    day_end = datetime.combine(day, datetime.max.time())
+    own = [e for e in events if e.baby_id == baby_id]
+    today = [e for e in own if day_start <= e.timestamp <= day_end]
+    before = [e for e in own if e.timestamp < day_start and e.type in SLEEP_TYPES]
+    carried = [max(before, key=lambda e: e.timestamp)] if before else []
+    summary = original_loop(carried + today)
+    # o evento carregado da véspera não é do dia: não conta mamadas
+    summary["total_feeds"] = sum(1 for e in today if e.type == "feed")
+    return summary
+
+
+class ReportParityTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://", poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.db = Session(self.engine)
+        user = User(email="paridade@example.com", password_hash="x")
+        self.db.add(user)
+        self.db.flush()
+        self.babies = [
+            Baby(user_id=user.id, name=f"B{n}", birth_date=date(2025, 12, 1), gender="F")
+            for n in range(3)
+        ]
+        self.db.add_all(self.babies)
+        self.db.flush()
+        self.user_id = user.id
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def add(self, baby, type_, timestamp):
+        event = Event(user_id=self.user_id, baby_id=baby.id, type=type_, timestamp=timestamp)
+        self.db.add(event)
+        return event
+
+    def assert_parity(self, start=FIRST_DAY, end=FIRST_DAY + timedelta(days=DAYS - 1)):
+        self.db.flush()
+        events = self.db.query(Event).all()
+        from_sql = aggregate_daily_reports(self.db, start, end)
+
+        expected_keys = {
+            (e.baby_id, e.timestamp.date()) for e in events if start <= e.timestamp.date() <= end
+        }
+        self.assertEqual(set(from_sql), expected_keys)
+        for (baby_id, day), summary in from_sql.items():
+            with self.subTest(baby_id=baby_id, day=day):
+                self.assertEqual(summary, reference(events, baby_id, day))
+        return from_sql
+
+    def test_nap_crossing_midnight_counts_on_the_day_it_ends(self):
+        baby = self.babies[0]
+        self.add(baby, "sleep_start", datetime(2026, 3, 1, 13, 0))
+        self.add(baby, "sleep_end", datetime(2026, 3, 1, 14, 30))
+        self.add(baby, "feed", datetime(2026, 3, 1, 15, 0))
+        self.add(baby, "sleep_start", datetime(2026, 3, 1, 23, 10))
+        self.add(baby, "sleep_end", datetime(2026, 3, 2, 1, 40, 30))
+        self.add(baby, "feed", datetime(2026, 3, 2, 1, 45))
+
+        result = self.assert_parity()
+        self.assertEqual(result[(baby.id, date(2026, 3, 1))]["total_sleep_minutes"], 90)
+        self.assertEqual(result[(baby.id, date(2026, 3, 2))]["total_sleep_minutes"], 150)
+        self.assertEqual(result[(baby.id, date(2026, 3, 2))]["longest_nap_minutes"], 150)
+
+    def test_day_starting_with_sleep_end(self):
+        baby = self.babies[1]
+        # véspera terminou acordado: o sleep_end que abre o dia é órfão
+        self.add(baby, "sleep_start", datetime(2026, 3, 1, 20, 0))
+        self.add(baby, "sleep_end", datetime(2026, 3, 1, 22, 0))
+        self.add(baby, "sleep_end", datetime(2026, 3, 2, 6, 0))
+        self.add(baby, "sleep_start", datetime(2026, 3, 2, 9, 0))
+        self.add(baby, "sleep_start", datetime(2026, 3, 2, 9, 20))
+        self.add(baby, "feed", datetime(2026, 3, 2, 9, 50))
+        self.add(baby, "sleep_end", datetime(2026, 3, 2, 10, 5))
+
+        result = self.assert_parity()
+        self.assertEqual(result[(baby.id, date(2026, 3, 2))], {
+            "total_sleep_minutes": 45, "total_feeds": 1, "longest_nap_minutes": 45,
+        })
+
+    def test_crossing_nap_before_the_range(self):
+        baby = self.babies[2]
+        self.add(baby, "sleep_start", datetime(2026, 3, 2, 22, 0))
+        self.add(baby, "sleep_end", datetime(2026, 3, 3, 2, 0))
+        result = self.assert_parity(start=date(2026, 3, 3), end=date(2026, 3, 3))
+        self.assertEqual(result[(baby.id, date(2026, 3, 3))]["total_sleep_minutes"], 240)
+
+    def test_random_streams(self):
+        rng = random.Random(9)
+        start = datetime.combine(FIRST_DAY, datetime.min.time())
+        for baby in self.babies:
+            # horários distintos: o loop antigo ordenava só por timestamp
+            seconds = rng.sample(range(DAYS * 24 * 3600), 120)
+            for offset in seconds:
+                type_ = rng.choice(("sleep_start", "sleep_end", "sleep_start", "sleep_end", "feed"))
+                self.add(baby, type_, start + timedelta(seconds=offset))
+        self.assert_parity()
+        self.assert_parity(start=FIRST_DAY + timedelta(days=2), end=FIRST_DAY + timedelta(days=3))
+
+
+if __name__ == "__main__":
+    unittest.main()